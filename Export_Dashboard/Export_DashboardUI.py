@@ -1,11 +1,16 @@
 import csv
 from tkinter import *
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
-from typing import Union
+from typing import Optional, Union
+
+import common_path  # noqa: F401 (repo root on sys.path for cozeva_common)
+from cozeva_common.driver_pool import BrowserWarmup, DriverPool
+
+# Selenium, the validation modules and PIL are imported on first use, so the
+# first window shows without waiting for them (benchmarks/bench_gui_startup.py).
 
 # ─── Configuration ────────────────────────────────────────────
-EXPORT_OPTIONS = ["Select", "Contact Export", "Sticket Export"]
+EXPORT_OPTIONS = ["Select", "Contact Export", "Sticket Export", "Contact Export + Sticket Export"]
 CSV_FILE_PATH = r"C:\Users\nsikder\PycharmProjects\Export Dashboard\Customer.csv"
 
 bg_color = "#7dab41"
@@ -15,6 +20,51 @@ BUTTON_FONT = ("Arial", 12, "bold")   # main big buttons
 LABEL_FONT = ("Arial", 11, "bold")    # labels for customer/export
 SMALL_BUTTON_FONT = ("Arial", 9, "bold")  # for CERT/PROD buttons
 
+LOGO_DELAY_MS = 50      # logo is loaded and resized once the window is on screen
+WARMUP_DELAY_MS = 300   # Chrome warm-up starts once the first window is up
+DEFAULT_WARMUP_ENV = "CERT"
+
+
+# ─── Browser warm-up ───────────────────────────────────────────
+def _log(message: str) -> None:
+    from Export_Functionality import log
+    log(message)
+
+
+def _prelaunch(env: str):
+    from Export_Functionality import prelaunch_export_browser
+    return prelaunch_export_browser(env)
+
+
+_warmup: Optional[BrowserWarmup] = None
+
+
+def browser_warmup() -> BrowserWarmup:
+    """Chrome started on the login page while the user fills in the form (see driver_pool.BrowserWarmup)."""
+    global _warmup
+    if _warmup is None:
+        _warmup = BrowserWarmup(_prelaunch, log=_log)
+    return _warmup
+
+
+_pool: Optional[DriverPool] = None
+
+
+def driver_pool() -> DriverPool:
+    """Logged-in browsers kept between runs, so a repeat validation skips Chrome and the login."""
+    global _pool
+    if _pool is None:
+        from Export_Functionality import shared_driver_pool
+        _pool = shared_driver_pool()
+    return _pool
+
+
+def close_browsers() -> None:
+    """Quit the warm-up browser and the pooled sessions (app closing)."""
+    browser_warmup().discard()
+    if _pool is not None:
+        _pool.close_all()
+
 
 # ─── Load Customer CSV ─────────────────────────────────────────
 def load_customers_from_csv(filename: str):
@@ -45,8 +95,14 @@ def apply_branding(window: Union[Tk, Toplevel]) -> None:
     except Exception:
         pass
 
-    # Cozeva logo bottom-right
+    # Cozeva logo bottom-right, after the window is drawn
+    window.after(LOGO_DELAY_MS, lambda: _place_logo(window))
+
+
+def _place_logo(window: Union[Tk, Toplevel]) -> None:
     try:
+        from PIL import Image, ImageTk
+
         logo_image = Image.open("cozeva.png")
         logo_image = logo_image.resize((40, 30), Image.Resampling.LANCZOS)
         logo_photo = ImageTk.PhotoImage(logo_image)
@@ -102,7 +158,7 @@ def start_ui(parent: Tk):
     )
 
     export_var = StringVar()
-    export_dropdown = ttk.Combobox(form_frame, textvariable=export_var, state="readonly", width=25)
+    export_dropdown = ttk.Combobox(form_frame, textvariable=export_var, state="readonly", width=32)
     export_dropdown["values"] = EXPORT_OPTIONS
     export_dropdown.current(0)
     export_dropdown.grid(row=1, column=1, padx=5, ipady=4, pady=10)
@@ -135,6 +191,7 @@ def start_ui(parent: Tk):
 
     def set_env(env: str):
         selected_env["value"] = env
+        browser_warmup().start(env)  # re-target the warm browser if needed
         # reset styles
         btn_cert.config(bg="white", fg=bg_color, relief="raised")
         btn_prod.config(bg="white", fg=bg_color, relief="raised")
@@ -230,7 +287,7 @@ def launch_main_window():
 
     def export_dashboard():
         # Import here to avoid circular imports on module load
-        from Export_Functionality import run_export_flow  # ensure filename matches
+        from progress_window import run_export_flow
 
         # Hide main window while we do the selection + Selenium work
         root.withdraw()
@@ -242,12 +299,13 @@ def launch_main_window():
             root.deiconify()
             return
 
-        # Run Selenium functionality with chosen values
-        run_export_flow(selected_customer, selected_export, selected_env, root)
+        # Run Selenium functionality with chosen values (on a pooled session or the warm browser)
+        run_export_flow(selected_customer, selected_export, selected_env, root,
+                        warmup=browser_warmup(), pool=driver_pool())
 
-        # When done, close the whole app
+        # When done, back to the main window; the browser stays logged in for the next run
         try:
-            root.destroy()
+            root.deiconify()
         except Exception:
             pass
 
@@ -284,7 +342,15 @@ def launch_main_window():
     )
     btn3.pack(pady=10)
 
+    def close():
+        close_browsers()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", close)
+    root.after(WARMUP_DELAY_MS, lambda: browser_warmup().start(DEFAULT_WARMUP_ENV))
+
     root.mainloop()
+    close_browsers()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,13 @@
 from __future__ import annotations
-import csv
-import html
 import os
+import threading
 import time
 from configparser import ConfigParser
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+from urllib.parse import urljoin
 from selenium import webdriver
 from selenium.common.exceptions import (
     TimeoutException,
@@ -17,254 +18,319 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from tkinter import Tk, Toplevel, Label, StringVar, messagebox
-from tkinter import ttk as tkttk
+
+import common_path  # noqa: F401 (repo root on sys.path for cozeva_common)
+from download_watcher import DownloadWatcher
+from cozeva_common.driver_pool import DriverPool, PooledSession, quit_browser
+from http_download import DownloadError, HttpExportDownload
+from cozeva_common.http_session import BrowserHttpSession
+from export_validation import CsvStreamValidator, CsvValidationReport
+from csv_dialect import CsvExportReader
+from cell_compare import MAX_LOGGED_MISMATCHES, ColumnComparator, CompareResult, normalize_cell
+from cozeva_common.run_log import RunLog, apply_logging_config
+from cozeva_common.report_writer import ReportWriter
+from run_history import RunHistory, RunMetrics
+from reconcile import ExportRowStore, HashJoinReconciler, patient_id_from_links, reconcile_csv_file, reconcile_rows
+from table_extract import extract_table, extract_tables
+from header_resolver import HeaderIndex, HeaderResolver
+from cozeva_common.browser_profile import (
+    PageLoadStats,
+    apply_profile_cdp,
+    apply_profile_options,
+    browser_profile,
+    timed_get,
+    warmup_enabled,
+)
+from cozeva_common.timing import Timeline, instrument_driver, render_waterfall
+from cozeva_common.session_cache import SessionCache, capture_session, restore_session, session_is_valid
+from dashboard_rows import (
+    MATCH_EARLY_SECONDS,
+    MATCH_LATE_SECONDS,
+    REQUESTED_FORMATS,
+    TERMINAL_FAILURES,
+    DashboardIndex,
+    DashboardRow,
+    ExportStatus,
+    ExportTicket,
+    parse_dashboard_rows,
+)
+from status_poller import (
+    AdaptiveBackoff,
+    ExportStatusPoller,
+    SharedDashboardPoller,
+    SharedPollUnavailable,
+)
+from cozeva_common.page_readiness import (
+    ReadinessStats,
+    estimated_saving,
+    install_readiness_hook,
+    quiet_ms,
+    readiness_mode,
+    wait_for_page_idle,
+)
+
+if TYPE_CHECKING:
+    from progress_window import ProgressWindow
 
 # ─── Configuration ─────────────────────────────────────────────
 CONFIG_FILE_PATH = Path(r"C:\Users\nsikder\Downloads\config.ini")
 DOWNLOAD_DIR = Path(r"C:\Users\nsikder\PycharmProjects\Export Dashboard\Exported Files")
 LOG_HTML_FILE = Path("validation_log.html")
 
-# ─── Global log store ─────────────────────────────────────────────
-log_entries: list[str] = []
-html_report_written: bool = False  # avoid overwriting report once written
+# ─── Export types ──────────────────────────────────────────────
+EXPORT_KINDS = {"Contact Export": "contact", "Sticket Export": "sticket"}
+EXPORT_TYPES_BY_KIND = {kind: export for export, kind in EXPORT_KINDS.items()}
+EXPORT_SEPARATOR = " + "  # "Contact Export + Sticket Export": both in one session
+DASHBOARD_MATCH_ATTEMPTS = 4  # dashboard reads (with a refresh in between) to find a triggered export's row
+
+
+def export_kind(selected_export: str) -> Optional[str]:
+    """"contact" / "sticket" for an export name, None if unknown."""
+    return EXPORT_KINDS.get((selected_export or "").strip())
+
+
+def split_exports(selected_export: str) -> list[str]:
+    """The exports of a (possibly combined) export selection, in trigger order."""
+    return [e.strip() for e in (selected_export or "").split(EXPORT_SEPARATOR.strip()) if e.strip()]
+
+# ─── Export column selection ─────────────────────────────────────
+# headers to always exclude (case-insensitive)
+EXCLUDE_HEADERS = {
+    "patient", "dob", "member id", "member phone #", "member uid", "searchable member id",
+    "member fname", "member lname", "gender"
+}
+
+# which headers to include per export type
+INCLUDE_HEADERS_BY_EXPORT = {
+    "contact": [
+        "Member CozevaID", "Measure Details", "Encounter Datetime", "Route",
+        "Encounter Details", "Encounter Note", "With Whom", "Submitter", "PCP",
+        "Practice", "Health Plan", "Campaign", "Data Source"
+    ],
+    "sticket": [
+        "Created", "Last Updated", "Created by", "Last Updated by",
+        "PCP", "Latest Note", "Health Plan"
+    ],
+}
+
+# other spellings of the included headers (e.g. the UI's column titles); matched exactly
+HEADER_ALIASES_BY_EXPORT = {
+    "contact": {"Encounter Datetime": ["Encounter Date"]},
+    "sticket": {},
+}
+HEADER_INDEX_CACHE = CONFIG_FILE_PATH.parent / "header_index_cache.json"  # resolved header positions, by header row hash
+
+# columns that must be filled in on every exported row
+MANDATORY_HEADERS_BY_EXPORT = {
+    "contact": ["Member CozevaID", "Encounter Datetime"],
+    "sticket": ["Created", "Created by"],
+}
+
+# key columns joining exported rows to UI rows (override: [export_dashboard] <type>_keys = A, B)
+RECONCILE_KEYS_BY_EXPORT = {
+    "contact": ["Member CozevaID", "Encounter Datetime"],
+    "sticket": ["Member CozevaID", "Created"],
+}
+
+SAMPLE_ROWS = 10  # rows shown in the HTML table / compared against the UI
+DOWNLOAD_IDLE_TIMEOUT = 60  # seconds without any download progress before giving up
+
+_header_resolvers: dict[str, HeaderResolver] = {}
+_header_resolvers_lock = threading.Lock()
+
+
+def header_resolver_for(selected_export: str) -> HeaderResolver:
+    """The (shared) header resolver of the export type named in `selected_export`."""
+    export_kind_norm = (selected_export or "").strip().lower()
+    kind = next((k for k in INCLUDE_HEADERS_BY_EXPORT if k in export_kind_norm), "")
+    with _header_resolvers_lock:
+        resolver = _header_resolvers.get(kind)
+        if resolver is None:
+            resolver = _header_resolvers[kind] = HeaderResolver(
+                kind,
+                INCLUDE_HEADERS_BY_EXPORT.get(kind, []),
+                aliases=HEADER_ALIASES_BY_EXPORT.get(kind),
+                exclude=EXCLUDE_HEADERS,
+                cache_path=HEADER_INDEX_CACHE,
+            )
+        return resolver
+
+# ─── Saved login sessions ──────────────────────────────────────
+_session_cache: Optional[SessionCache] = None
+_session_cache_lock = threading.Lock()
+
 
+def session_cache_for(config: ConfigParser) -> SessionCache:
+    """The process-wide session cache ([session_cache] in config.ini), created on first use."""
+    global _session_cache
+    with _session_cache_lock:
+        if _session_cache is None:
+            _session_cache = SessionCache.from_config(config)
+            if not _session_cache.enabled and config.getboolean("session_cache", "enabled", fallback=False):
+                log("Notice: session cache off (needs Windows DPAPI, or cryptography with "
+                    "COZEVA_SESSION_KEY or an OS keyring).")
+        return _session_cache
 
-def log(message: str) -> None:
-    """Append message to global log (timestamped) and also print to stdout."""
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    entry = f"[{ts}] {message}"
-    log_entries.append(entry)
-    print(entry)
 
-def extract_failed_logs(logs: list[str]) -> list[str]:
+# ─── Run context (log store + output locations) ──────────────────
+class RunContext:
     """
-    Extract failure-related log entries.
-    A failure is identified by the ❌ marker.
+    Log buffer and output locations of a single validation run.
+    Batch runs bind one context per worker thread (see bind_run) so that
+    concurrent jobs never share logs, reports or download folders.
     """
-    return [entry for entry in logs if "❌" in entry]
+
+    def __init__(self,
+                 report_path: Path = LOG_HTML_FILE,
+                 download_dir: Path = DOWNLOAD_DIR,
+                 label: str = "",
+                 customer: str = "",
+                 jsonl_path: Optional[Path] = None) -> None:
+        self.report_path = Path(report_path)
+        self.download_dir = Path(download_dir)
+        self.label = label
+        self.log = RunLog(customer=customer, label=label, jsonl_path=jsonl_path)
+        self.report: Optional[ReportWriter] = None  # open while the run appends to its HTML report
+        self.timeline = Timeline(label)  # stage / step / WebDriver spans, saved next to the report
+        self.metrics = RunMetrics()  # per-export timings, size and match rate for the run history
+        self.html_report_written = False  # avoid overwriting report once written
+
+    @property
+    def entries(self) -> list[str]:
+        """Buffered log lines ('[timestamp] message') of this run."""
+        return self.log.entries()
+
+
+_default_run = RunContext()
+_active_run = threading.local()
+
+
+def current_run() -> RunContext:
+    """Return the RunContext bound to this thread (or the default one)."""
+    return getattr(_active_run, "context", None) or _default_run
+
+
+@contextmanager
+def bind_run(context: RunContext):
+    """Bind `context` to the calling thread for the duration of the block."""
+    previous = getattr(_active_run, "context", None)
+    _active_run.context = context
+    try:
+        yield context
+    finally:
+        _active_run.context = previous
+
+
+def log(message: str, level: Optional[int] = None, stage: Optional[str] = None) -> None:
+    """
+    Record message in the current run's log. The level defaults to the one implied
+    by the message's marker (❌ error, ⚠️ warning, ✅ success); the console only shows
+    records at or above the configured [logging] console_level.
+    """
+    current_run().log.emit(message, level, stage)
+
+
+def set_stage(stage: str) -> None:
+    """
+    Tag the current run's following log records with `stage`; the records of the
+    stage just finished are appended to the report, if one is open.
+    """
+    run = current_run()
+    if run.report is not None and not run.report.finished:
+        run.report.flush_log(run.log)
+    run.log.set_stage(stage)
+    run.timeline.stage(stage)
+
+
+def timed(name: str):
+    """Context manager timing a sub-step of the current stage in the run's timeline."""
+    return current_run().timeline.span(name)
+
+
+def start_report(customer: str, export_type: str) -> ReportWriter:
+    """Begin the current run's HTML report (at its report_path); later sections are appended."""
+    run = current_run()
+    if run.report is not None:
+        run.report.close()
+    run.report = ReportWriter(run.report_path).begin({"Customer": customer, "Export": export_type})
+    return run.report
+
+
+def add_report_section(fragment: str) -> None:
+    """Append an HTML fragment to the current run's report, after the log so far."""
+    report = current_run().report
+    if report is not None and not report.finished:
+        report.flush_log(current_run().log)
+        report.add_section(fragment)
 
 
 def save_logs_to_html(customer: str,
                       export_type: str,
-                      filename: Path = LOG_HTML_FILE,
+                      filename: Optional[Path] = None,
                       sample_table_html: Optional[str] = None) -> None:
     """
-    Write log_entries to a styled HTML file.
-    Adds:
-    - Failed Cases Summary at the top (after divider)
-    - Download PDF + Print buttons
-    - Optional CSV sample table with match coloring
+    Finish the current run's HTML report (started with start_report, or here):
+    failed cases summary from the run log's failure index, the log embedded
+    compressed with a filterable viewer, Download PDF + Print buttons and the
+    optional sample table. `filename` writes a fresh report there instead.
     """
-    global html_report_written
+    run = current_run()
     try:
-        outpath = Path(filename)
-        failed_logs = extract_failed_logs(log_entries)
-
-        with outpath.open("w", encoding="utf-8") as f:
-            f.write("<!doctype html><html><head><meta charset='utf-8'>")
-            f.write("<title>Export Validation Log</title>")
-
-            f.write("""
-            <style>
-                :root{--brand:#2f6f17;--muted:#4a5568;--bg:#f6f7f9}
-                body{font-family:Segoe UI, Arial, sans-serif;background:var(--bg);padding:20px;margin:0}
-                .page-wrap{max-width:1100px;margin:20px auto;position:relative}
-                .card{background:#fff;border-radius:8px;padding:22px 22px 30px 22px;
-                      box-shadow:0 2px 6px rgba(0,0,0,0.08);position:relative}
-                h1{color:var(--brand);margin:0 0 10px 0}
-                h2{margin:0 0 8px 0}
-                .meta{color:#555;font-size:0.95rem;margin-bottom:12px}
-                .entry{font-family:Times New Roman;background:#f3f4f6;
-                       padding:8px;margin:6px 0;border-radius:6px}
-                table.sample{border-collapse:collapse;width:100%;margin-top:12px}
-                table.sample th, table.sample td{
-                    border:1px solid #e9ecef;padding:6px;text-align:left}
-                table.sample thead th{background:#f3f4f6}
-
-                .top-right-actions{
-                    position:absolute;top:12px;right:12px;display:flex;gap:8px;z-index:10}
-                .btn-download{
-                    padding:8px 12px;border-radius:6px;background:var(--brand);
-                    color:white;border:none;cursor:pointer;font-weight:600}
-                .btn-secondary{background:var(--muted)}
-
-                table.sample td[data-match="true"]{background:#90dba5!important}
-                table.sample td[data-match="false"]{background:#e88a8a!important}
-
-                @media print {.top-right-actions{display:none!important}}
-            </style>
-            </head><body>
-            """)
-
-            f.write("<div class='page-wrap'>")
-
-            # Buttons
-            f.write("""
-            <div class="top-right-actions">
-                <button id="download-pdf" class="btn-download">⬇️ Download PDF</button>
-                <button class="btn-download btn-secondary" onclick="window.print()">🖨️ Print</button>
-            </div>
-            """)
-
-            f.write("<div class='card' id='report-content'>")
-
-            # Header
-            f.write("<h1>Export Dashboard Validation Log</h1>")
-            f.write("<div class='meta'>")
-            f.write(f"<strong>Customer:</strong> {html.escape(customer)} &nbsp; | &nbsp; ")
-            f.write(f"<strong>Export:</strong> {html.escape(export_type)} &nbsp; | &nbsp; ")
-            f.write(f"<strong>Generated:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            f.write("</div><hr>")
-
-            # ================= FAILED CASES SECTION =================
-            if failed_logs:
-                f.write("""
-                <div style="margin:12px 0 18px 0;">
-                    <h2 style="color:#b91c1c;">❌ Failed Cases Summary</h2>
-                    <div style="
-                        background:#fff5f5;
-                        border:1px solid #f5c2c7;
-                        border-radius:6px;
-                        padding:10px;
-                        max-height:240px;
-                        overflow:auto;">
-                """)
-                for e in failed_logs:
-                    f.write(f"<div style='margin-bottom:6px;'>• {html.escape(e)}</div>")
-                f.write("</div></div>")
-            else:
-                f.write("""
-                <div style="margin:12px 0 18px 0;">
-                    <h2 style="color:#15803d;">✅ No Failed Cases Detected</h2>
-                </div>
-                """)
-
-            f.write("<hr>")
-
-            # ================= FULL LOG ENTRIES =================
-            for e in log_entries:
-                f.write(f"<div class='entry'>{html.escape(e)}</div>")
-
-            # ================= SAMPLE TABLE =================
-            if sample_table_html:
-                f.write(sample_table_html)
-
-            f.write("</div></div>")
-
-            # PDF JS
-            f.write("""
-            <script src="https://cdnjs.cloudflare.com/ajax/libs/html2pdf.js/0.9.3/html2pdf.bundle.min.js"></script>
-            <script>
-            document.getElementById('download-pdf').addEventListener('click', function(){
-                var btn=this;
-                btn.disabled=true;
-                var el=document.getElementById('report-content');
-                html2pdf().from(el).set({
-                    margin:0.35,
-                    filename:'export_report.pdf',
-                    html2canvas:{scale:2},
-                    jsPDF:{unit:'in',format:'a4',orientation:'portrait'}
-                }).save().then(()=>btn.disabled=false)
-                .catch(()=>{btn.disabled=false;window.print();});
-            });
-            </script>
-            """)
-
-            f.write("</body></html>")
-
-        html_report_written = True
+        if filename is not None:
+            run.report_path = Path(filename)
+            start_report(customer, export_type)
+        elif run.report is None or run.report.finished:
+            start_report(customer, export_type)
+        if sample_table_html:
+            add_report_section(sample_table_html)
+        run.timeline.close()
+        add_report_section(render_waterfall(run.timeline))
+        outpath = run.report.finish(run.log)
+        try:
+            run.timeline.save(run.report_path.with_suffix(".timing.json"))
+        except OSError as e:
+            log(f"⚠️ Could not save run timings: {e}")
+
+        run.html_report_written = True
         log(f"✅ Log saved to {outpath.resolve()} (HTML with failed summary)")
     except Exception as ex:
         log(f"❌ Failed to save HTML log: {ex}")
 
 
-# ─── Tkinter Progress UI ─────────────────────────────────────────────
-class ProgressWindow:
-    def __init__(self, master: Tk, total_steps: int) -> None:
-        # slightly wider/taller window to reduce wrap collisions
-        self.window = Toplevel(master)
-        self.window.title("Export Dashboard Validation Progress")
-        self.window.geometry("700x180")
-        self.window.configure(bg="#4f8611")
-        self.window.resizable(False, False)
+# ─── Progress (Tk window in progress_window.py) ──────────────────
+class ExportCancelled(Exception):
+    """Raised in the worker thread once the user pressed Cancel."""
 
-        self.step = 0
-        self.total_steps = max(1, total_steps)
 
-        self.status_var = StringVar(value="Starting validation...")
-        # status label with wraplength and centered justification so long text wraps
-        self.status_label = Label(
-            self.window,
-            textvariable=self.status_var,
-            bg="#4f8611",
-            fg="white",
-            font=("Arial", 13, "bold"),
-            wraplength=640,
-            justify="center",
-        )
-        self.status_label.pack(pady=(12, 6), fill="x", padx=10)
-
-        # progressbar with horizontal padding so labels don't touch it
-        self.progress = tkttk.Progressbar(self.window, orient="horizontal", length=560, mode="determinate")
-        self.progress.pack(pady=(2, 6), padx=20, fill="x")
-        self.progress["maximum"] = self.total_steps
-        self.progress["value"] = 0
-
-        # percent label placed below the progress bar to avoid overlap
-        self.percent_label = Label(
-            self.window,
-            text="0%",
-            bg="#4f8611",
-            fg="white",
-            font=("Arial", 11, "bold")
-        )
-        self.percent_label.pack(pady=(0, 6))
-
-        # Properly keep a reference to the label displaying the last message.
-        self.last_msg = StringVar(value="")
-        self.last_msg_label = Label(
-            self.window,
-            textvariable=self.last_msg,
-            bg="#4f8611",
-            fg="white",
-            font=("Arial", 10),
-            wraplength=640,
-            justify="center",
-        )
-        # add a little bottom padding to prevent crowding
-        self.last_msg_label.pack(pady=(0, 12), fill="x", padx=10)
+class ConsoleProgress:
+    """
+    Drop-in replacement for ProgressWindow when no Tk root is available
+    (batch and command-line runs). Steps are only logged.
+    """
 
-        self.window.update()
+    def __init__(self, total_steps: int) -> None:
+        self.step = 0
+        self.total_steps = max(1, total_steps)
 
     def update(self, step_description: str) -> None:
-        """Update progress bar and UI + append to logs."""
-        # advance step (if you prefer manual control later, we can add an increment param)
         self.step = min(self.step + 1, self.total_steps)
-        self.status_var.set(step_description)
-
         percent = int((self.step / self.total_steps) * 100)
-        self.progress["value"] = self.step
-        self.percent_label.config(text=f"{percent}%")
-
-        # update the persistent last_msg_label rather than destroying widgets
-        self.last_msg.set(step_description)
-        log(step_description)
-        self.window.update_idletasks()
-        time.sleep(0.35)
+        log(f"[{percent:3d}%] {step_description}")
 
     def complete(self) -> None:
-        """Mark complete, log, wait briefly and destroy window."""
-        self.status_var.set("✅ Validation completed!")
-        self.progress["value"] = self.total_steps
-        self.percent_label.config(text="100%")
         log("Validation completed")
-        self.window.update_idletasks()
-        time.sleep(0.8)
-        try:
-            self.window.destroy()
-        except Exception:
-            pass
+
+    def error(self, title: str, message: str) -> None:
+        log(f"❌ {title}: {message}")
+
+    def finish(self) -> None:
+        pass
+
+    def check_cancelled(self) -> None:
+        pass
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
 
 
 # ─── Core Selenium Classes ─────────────────────────────────────────────
@@ -275,96 +341,222 @@ class ConfParser:
         if not self.config_file_path.exists():
             raise FileNotFoundError(f"Config file not found: {self.config_file_path}")
         self.config.read(self.config_file_path)
+        apply_logging_config(self.config)
         log(f"Config Parser read data from: {self.config_file_path}")
 
 
 class ChromeDriverSetup(ConfParser):
-    def __init__(self, config_file_path: Path):
+    def __init__(self, config_file_path: Path,
+                 download_dir: Optional[Path] = None,
+                 user_data_dir: Optional[Path] = None):
         ConfParser.__init__(self, config_file_path)
+        self.download_dir = Path(download_dir) if download_dir is not None else current_run().download_dir
         self.options = webdriver.ChromeOptions()
-
-        # chrome_profile in config should typically contain something like --user-data-dir=...
-        try:
-            self.options.add_argument(self.config['path']['chrome_profile'])
-        except Exception:
-            pass
+        # [browser] profile = performance: headless, eager loads, throwaway profile
+        self.profile = browser_profile(self.config)
+        throwaway_dir = apply_profile_options(self.options, self.config)
+
+        if user_data_dir is not None:
+            # concurrent browsers cannot share one profile directory
+            self.options.add_argument(f"--user-data-dir={Path(user_data_dir).resolve()}")
+        elif throwaway_dir is not None:
+            self.options.add_argument(f"--user-data-dir={throwaway_dir}")
+        else:
+            # chrome_profile in config should typically contain something like --user-data-dir=...
+            try:
+                self.options.add_argument(self.config['path']['chrome_profile'])
+            except Exception:
+                pass
 
         prefs = {
-            "download.default_directory": str(DOWNLOAD_DIR.resolve()),
+            "download.default_directory": str(self.download_dir.resolve()),
             "download.prompt_for_download": False,
             "safebrowsing.enabled": True,
         }
         self.options.add_experimental_option("prefs", prefs)
 
         chrome_driver_path = self.config['path']['chrome_driver']
+        with timed("chrome_start"):
+            try:
+                service = Service(executable_path=chrome_driver_path)
+                self.driver = webdriver.Chrome(service=service, options=self.options)
+            except Exception:
+                # fallback older style if needed
+                self.driver = webdriver.Chrome(executable_path=chrome_driver_path, options=self.options)
+        instrument_driver(self.driver, lambda: current_run().timeline)
+        if self.profile == "performance":
+            if not apply_profile_cdp(self.driver, self.config):
+                log("Notice: CDP unavailable; images, fonts and third-party requests are not blocked.")
+            self.set_download_dir(self.download_dir)  # headless Chrome needs downloads allowed via CDP
+        self.page_loads = PageLoadStats(self.profile)
+        log(f"Chrome Driver Setup done ({self.profile} profile).")
+
+    def set_download_dir(self, download_dir: Path) -> None:
+        """Point Chrome's downloads at `download_dir` (used when a pooled browser starts a new job)."""
+        self.download_dir = Path(download_dir)
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        params = {"behavior": "allow", "downloadPath": str(self.download_dir.resolve())}
         try:
-            service = Service(executable_path=chrome_driver_path)
-            self.driver = webdriver.Chrome(service=service, options=self.options)
+            self.driver.execute_cdp_cmd("Browser.setDownloadBehavior", params)
         except Exception:
-            # fallback older style if needed
-            self.driver = webdriver.Chrome(executable_path=chrome_driver_path, options=self.options)
-        log("Chrome Driver Setup done.")
+            try:
+                self.driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+            except Exception as e:
+                log(f"⚠️ Could not change download directory to {self.download_dir}: {e}")
 
 
 class SupportiveFunctions:
     driver: webdriver.Chrome  # type: ignore
+    config: ConfigParser
+
+    # fixed pauses of the legacy "preloader" wait
+    PRELOADER_PRE_SLEEP = 0.8
+    PRELOADER_POST_SLEEP = 0.4
+
+    _readiness_hooked: bool = False
+    readiness_stats: Optional[ReadinessStats] = None
+    page_loads: Optional[PageLoadStats] = None
+
+    def open_page(self, url: str, label: Optional[str] = None) -> None:
+        """driver.get(url), timed per page so the [browser] profiles can be compared."""
+        load = timed_get(self.driver, url, label)
+        if self.page_loads is None:
+            self.page_loads = PageLoadStats()
+        self.page_loads.record(load)
+        log(f"DEBUG {self.page_loads.describe(load)}")
 
     def ajax_preloader_wait(self, timeout: int = 300) -> None:
-        """Wait for ajax preloader to disappear; tolerant to minor failures."""
+        """
+        Wait for the page to settle; tolerant to minor failures.
+        [wait] readiness_mode in config.ini picks the legacy "preloader" wait
+        (fixed sleeps around the preloader check) or "network_idle".
+        """
+        if readiness_mode(self.config) == "network_idle":
+            self._network_idle_wait(timeout)
+        else:
+            self._preloader_wait(timeout)
+
+    def _preloader_wait(self, timeout: int) -> None:
+        """Legacy wait: fixed pauses around the ajax_preloader invisibility check."""
         try:
-            time.sleep(0.8)
+            time.sleep(self.PRELOADER_PRE_SLEEP)
             WebDriverWait(self.driver, timeout).until(
                 EC.invisibility_of_element((By.XPATH, "//div[contains(@class,'ajax_preloader')]"))
             )
-            time.sleep(0.4)
+            time.sleep(self.PRELOADER_POST_SLEEP)
         except TimeoutException:
             log("Notice: ajax_preloader_wait timed out (element may persist).")
         except Exception as e:
             log(f"Notice: ajax_preloader_wait exception (may be safe): {e}")
 
+    def _network_idle_wait(self, timeout: int) -> None:
+        """Return as soon as no XHR/fetch is in flight and the ajax_preloader is hidden."""
+        if not self._readiness_hooked:
+            if not install_readiness_hook(self.driver):
+                log("Notice: CDP unavailable; readiness hook is injected per page instead.")
+            self._readiness_hooked = True
+        if self.readiness_stats is None:
+            self.readiness_stats = ReadinessStats()
 
-class CozevaLogin(ChromeDriverSetup, SupportiveFunctions):
-    def certlogin_cozeva(self, customer: str, progress: ProgressWindow) -> None:
-        """Perform login to CERT and select customer via UI interactions."""
+        quiet = quiet_ms(self.config)
         try:
-            progress.update("Logging into Cozeva (CERT)...")
-            self.driver.get(self.config.get("cert", "logout_url", fallback="about:blank"))
-            self.driver.get(self.config.get("cert", "login_url", fallback="about:blank"))
-            self.driver.maximize_window()
-
-            user = os.environ.get("CS2User")
-            pwd = os.environ.get("CS2Password")
-            if not all((user, pwd)):
-                raise RuntimeError("Environment variables CS2User / CS2Password not set.")
-
-            self.driver.find_element(By.ID, "edit-name").send_keys(user)
-            self.driver.find_element(By.ID, "edit-pass").send_keys(pwd)
-            self.driver.find_element(By.ID, "edit-submit").click()
+            result = wait_for_page_idle(self.driver, timeout, quiet)
+        except Exception as e:
+            log(f"Notice: network-idle wait failed ({e}); using preloader wait.")
+            self._preloader_wait(timeout)
+            return
 
-            WebDriverWait(self.driver, 120).until(EC.presence_of_element_located((By.ID, "reason_textbox")))
-            self.driver.find_element(By.XPATH, "//*[@id='select-customer']").click()
-            self.driver.find_element(By.XPATH, f"//*[contains(text(), '{str(customer)}')]").click()
+        if not result.idle:
+            log(f"Notice: ajax_preloader_wait timed out ({result.pending_requests} request(s) in flight, "
+                f"preloader visible: {result.preloader_visible}).")
+        saved = estimated_saving(result, self.PRELOADER_PRE_SLEEP, self.PRELOADER_POST_SLEEP, quiet)
+        self.readiness_stats.record(result, saved)
+        log(f"Page idle after {result.elapsed_s:.2f}s (saved ~{saved:.2f}s vs fixed sleeps).")
 
-            WebDriverWait(self.driver, 60).until(EC.presence_of_element_located((By.ID, "reason_textbox")))
-            reason_text = self.config.get("credentials", "export_reason", fallback="")
-            self.driver.find_element(By.ID, "reason_textbox").send_keys(reason_text)
-            self.driver.find_element(By.ID, "edit-submit").click()
-            time.sleep(5)
 
-            self.ajax_preloader_wait()
-            progress.update("Logged in successfully (CERT).")
+class CozevaLogin(ChromeDriverSetup, SupportiveFunctions):
+    landing_url: Optional[str] = None  # page reached after login; pooled sessions return here
+    login_page_ready: Optional[str] = None  # config section whose login page is already open (warm-up)
+    customer: Optional[str] = None  # customer of the current login
+    env: Optional[str] = None       # "CERT" / "PROD" of the current login
+
+    def login_cozeva(self, env: str, customer: str, progress: ProgressWindow) -> None:
+        """Resume the saved session for (env, customer, CS2User) if it is still valid, else log in and save it."""
+        set_stage("login")
+        env_upper = (env or "").upper()
+        if env_upper not in ("CERT", "PROD"):
+            raise RuntimeError(f"Unknown environment: {env!r}")
+        self.customer = customer
+        self.env = env_upper
+        user = os.environ.get("CS2User", "")
+        if self.resume_saved_session(env_upper, customer, progress, user):
+            return
+        if env_upper == "CERT":
+            self.certlogin_cozeva(customer, progress)
+        else:
+            self.prodlogin_cozeva(customer, progress)
+        if session_cache_for(self.config).save(capture_session(
+                self.driver, env_upper, customer, self.landing_url or self.driver.current_url, user)):
+            log(f"DEBUG saved the {env_upper} session for {customer}.")
+
+    def resume_saved_session(self, env: str, customer: str, progress: ProgressWindow, user: str = "") -> bool:
+        """Restore cookies/localStorage saved by an earlier login; False when a full login is needed."""
+        cache = session_cache_for(self.config)
+        state = cache.load(env, customer, user)
+        if state is None:
+            return False
+        started = time.perf_counter()
+        progress.update(f"Checking saved Cozeva session ({env})...")
+        with timed("session_check"):
+            valid = session_is_valid(state)
+        if not valid:
+            log(f"Notice: saved {env} session for {customer} has expired; logging in.")
+            cache.discard(env, customer, user)
+            return False
+        self.login_page_ready = None  # the restore navigates away from it
+        try:
+            with timed("session_restore"):
+                restore_session(self.driver, state)
+                self.ajax_preloader_wait()
+            on_login_page = bool(self.driver.find_elements(By.ID, "edit-pass")
+                                 or self.driver.find_elements(By.ID, "reason_textbox"))
         except Exception as e:
-            log(f"❌ Login Error (CERT): {e}")
-            messagebox.showerror("Login Error", str(e))
-            raise
+            log(f"Notice: could not restore the saved {env} session ({e}); logging in.")
+            return False
+        if on_login_page:
+            log(f"Notice: saved {env} session for {customer} was rejected; logging in.")
+            cache.discard(env, customer, user)
+            return False
+        self.landing_url = self.driver.current_url
+        log(f"✅ Resumed saved {env} session for {customer} in {time.perf_counter() - started:.1f}s "
+            f"(saved {state.age_s() / 60:.0f} min ago).")
+        progress.update(f"Logged in successfully ({env}, saved session).")
+        return True
+
+    def certlogin_cozeva(self, customer: str, progress: ProgressWindow) -> None:
+        """Perform login to CERT and select customer via UI interactions."""
+        self._full_login("cert", customer, progress)
 
     def prodlogin_cozeva(self, customer: str, progress: ProgressWindow) -> None:
         """Perform login to PROD and select customer via UI interactions."""
-        try:
-            progress.update("Logging into Cozeva (PROD)...")
-            self.driver.get(self.config.get("prod", "logout_url", fallback="about:blank"))
-            self.driver.get(self.config.get("prod", "login_url", fallback="about:blank"))
+        self._full_login("prod", customer, progress)
+
+    def open_login_page(self, section: str) -> None:
+        """Logout, then open the login page of `section` ("cert" / "prod")."""
+        self.open_page(self.config.get(section, "logout_url", fallback="about:blank"), "logout")
+        self.open_page(self.config.get(section, "login_url", fallback="about:blank"), "login")
+        if self.profile != "performance":  # headless windows are sized by --window-size
             self.driver.maximize_window()
+        self.login_page_ready = section
+
+    def _full_login(self, section: str, customer: str, progress: ProgressWindow) -> None:
+        """Logout, login with CS2User/CS2Password, pick the customer and submit the reason."""
+        env_label = section.upper()
+        try:
+            progress.update(f"Logging into Cozeva ({env_label})...")
+            if self.login_page_ready != section:
+                self.open_login_page(section)
+            self.login_page_ready = None
 
             user = os.environ.get("CS2User")
             pwd = os.environ.get("CS2Password")
@@ -383,38 +575,55 @@ class CozevaLogin(ChromeDriverSetup, SupportiveFunctions):
             reason_text = self.config.get("credentials", "export_reason", fallback="")
             self.driver.find_element(By.ID, "reason_textbox").send_keys(reason_text)
             self.driver.find_element(By.ID, "edit-submit").click()
-            time.sleep(5)
+            progress.sleep(5)
 
             self.ajax_preloader_wait()
-            progress.update("Logged in successfully (PROD).")
+            self.landing_url = self.driver.current_url
+            progress.update(f"Logged in successfully ({env_label}).")
         except Exception as e:
-            log(f"❌ Login Error (PROD): {e}")
-            messagebox.showerror("Login Error", str(e))
+            log(f"❌ Login Error ({env_label}): {e}")
+            if not isinstance(e, ExportCancelled):
+                progress.error("Login Error", str(e))
             raise
 
     def logout_cozeva(self, progress: ProgressWindow,
                       customer: Optional[str] = None,
-                      export_type: Optional[str] = None) -> None:
-        """Logout and close driver; ensure logs are saved (but don't overwrite report if already written)."""
-        global html_report_written
+                      export_type: Optional[str] = None,
+                      keep_session: bool = False) -> None:
+        """
+        Logout and close driver; ensure logs are saved (but don't overwrite report if already written).
+        With keep_session=True the browser stays logged in so a DriverPool can reuse it.
+        """
+        run = current_run()
+        set_stage("logout")
+        if self.readiness_stats is not None and self.readiness_stats.summary():
+            log(self.readiness_stats.summary())
+        if self.page_loads is not None and self.page_loads.summary():
+            log(self.page_loads.summary())
         try:
-            # Using cert logout_url here as before; adjust if needed per env.
-            self.driver.get(self.config.get("cert", "logout_url", fallback="about:blank"))
-            self.driver.quit()
+            if not keep_session:
+                if not session_cache_for(self.config).enabled:
+                    # Using cert logout_url here as before; adjust if needed per env.
+                    # (only skipped when [session_cache] was opted in: its saved session must stay valid)
+                    self.driver.get(self.config.get("cert", "logout_url", fallback="about:blank"))
+                self.driver.quit()
             progress.complete()
 
             # Only save HTML if not already written (e.g., from export_dashboard with table)
-            if not html_report_written:
+            if not run.html_report_written:
                 save_logs_to_html(customer or "Unknown", export_type or "Unknown")
-            log("Logged out.")
+            log("Session kept for reuse." if keep_session else "Logged out.")
         except Exception as e:
             log(f"❌ Logout Error: {e}")
-            if not html_report_written:
+            if not run.html_report_written:
                 save_logs_to_html(customer or "Unknown", export_type or "Unknown")
             raise
 
 
 class ContactExport(CozevaLogin):
+    triggered: Optional[dict[str, ExportTicket]] = None  # last ticket per export type in this session
+    export_rows: Optional[dict[Path, ExportRowStore]] = None  # reconciliation rows kept per parsed export file
+
     def _click_sidenav_if_present(self) -> None:
         # --- CHECK contact_log_tab ---
         try:
@@ -445,1005 +654,1279 @@ class ContactExport(CozevaLogin):
         except Exception as e:
             log(f"Warning: unexpected error while trying to click sidenav_slide_out: {e}")
 
-    def _capture_ui_rows_for_headers(self, header_names: list[str], max_rows: int = 10) -> list[list[str]]:
+    def _capture_ui_rows_for_headers(self, header_names: list[str],
+                                     resolver: HeaderResolver,
+                                     max_rows: Optional[int] = 10) -> tuple[list[list[str]], list[list[str]]]:
         """
         On the already-open sticket log page in the main window, capture up to `max_rows`
-        rows of data for the given header_names (by matching header text).
+        rows (None: every row in the DOM) of data for the given header_names
+        (columns located with the export type's header `resolver`).
 
         Assumes you have already switched to the correct window and refreshed the page.
-        Returns a list of rows, each row being list[str] aligned with header_names.
+        Returns (rows, links): each row being list[str] aligned with header_names, and
+        the raw per-cell link hrefs of each row.
         """
-        def _norm(s: str) -> str:
-            return (s or "").strip().lower()
-
-        # Find a table whose headers overlap with our header_names
-        tables = self.driver.find_elements(By.XPATH, "//table")
+        # one round trip for every table's headers and first rows, then pick the
+        # first table in which at least half of our header_names resolve
+        needed = max(1, len(header_names) // 2)
         target_table = None
-        target_header_texts: list[str] = []
-
-        for tbl in tables:
-            try:
-                ths = tbl.find_elements(By.XPATH, ".//th")
-                if not ths:
-                    continue
-                th_texts_raw = [th.text for th in ths]
-                th_texts_norm = [_norm(t) for t in th_texts_raw]
-
-                # count how many of our header_names appear in this table's headers
-                overlap = 0
-                for hn in header_names:
-                    hn_norm = _norm(hn)
-                    if any(hn_norm in t or t in hn_norm for t in th_texts_norm):
-                        overlap += 1
-
-                if overlap >= max(1, len(header_names) // 2):
-                    target_table = tbl
-                    target_header_texts = th_texts_raw
-                    break
-            except Exception:
+        ui_indices: list[int] = []
+        for table in extract_tables(self.driver, max_rows=max_rows, with_links=True):
+            if not table.headers:
                 continue
-
+            ui_indices = resolver.map_columns(header_names, table.headers)
+            if sum(1 for idx in ui_indices if idx >= 0) >= needed:
+                target_table = table
+                break
         if target_table is None:
             raise RuntimeError("Could not locate sticket log table for UI comparison.")
 
         log("Found candidate sticket log table for comparison.")
-
-        # Build a mapping from header text -> index for the UI table
-        ui_header_index_map: dict[str, int] = {}
-        norm_header_texts = [_norm(t) for t in target_header_texts]
-        for idx, t in enumerate(norm_header_texts):
-            ui_header_index_map[t] = idx
-
-        ui_indices: list[int] = []
-        for hn in header_names:
-            hn_norm = _norm(hn)
-            idx = None
-            if hn_norm in ui_header_index_map:
-                idx = ui_header_index_map[hn_norm]
-            else:
-                # fuzzy/substring match
-                for i, t in enumerate(norm_header_texts):
-                    if hn_norm in t or t in hn_norm:
-                        idx = i
-                        break
-
-            if idx is None:
-                ui_indices.append(-1)
+        self._log_header_index(resolver.resolve(target_table.headers), "sticket UI table")
+        for hn, idx in zip(header_names, ui_indices):
+            if idx < 0:
                 log(f"Notice: header '{hn}' not found in sticket UI table; will leave blank for comparison.")
-            else:
-                ui_indices.append(idx)
 
-        # Capture up to max_rows rows from tbody
+        # Align the captured tbody rows (at most max_rows) with header_names
         rows_ui: list[list[str]] = []
-        trs = target_table.find_elements(By.XPATH, ".//tbody/tr")
-        for tr in trs[:max_rows]:
-            tds = tr.find_elements(By.XPATH, "./td")
-            row_vals: list[str] = []
-            for idx in ui_indices:
-                if 0 <= idx < len(tds):
-                    row_vals.append((tds[idx].text or "").strip())
-                else:
-                    row_vals.append("")
-            rows_ui.append(row_vals)
+        for tds in target_table.rows:
+            rows_ui.append([tds[idx] if 0 <= idx < len(tds) else "" for idx in ui_indices])
 
         log(f"Captured {len(rows_ui)} rows from sticket UI for comparison.")
-        return rows_ui
+        return rows_ui, target_table.links
+
+    @staticmethod
+    def _log_header_index(index: HeaderIndex, where: str) -> None:
+        """Surface how `where`'s header row was resolved: reused, matched by words, ambiguous."""
+        if index.cached:
+            log(f"DEBUG header index for {where} reused ({index.key[:8]}).")
+        for name, header in index.fuzzy.items():
+            log(f"Notice: '{name}' matched {where} column '{header}' by name words (no exact header or alias).")
+        for name, headers in index.ambiguous.items():
+            chosen = index.position(name)
+            log(f"⚠️ '{name}' is ambiguous in {where}: {headers}; using column {chosen + 1}.")
+
+    @staticmethod
+    def _log_comparison(comparison: CompareResult, csv_rows: list[list[str]], ui_rows: list[list[str]],
+                        label: str) -> None:
+        """Log the mismatching cells (up to MAX_LOGGED_MISMATCHES) and per-column results."""
+        mismatches = comparison.mismatches()
+        for i, j in mismatches[:MAX_LOGGED_MISMATCHES]:
+            csv_val = csv_rows[i][j] if j < len(csv_rows[i]) else ""
+            ui_val = ui_rows[i][j] if i < len(ui_rows) and j < len(ui_rows[i]) else ""
+            log(f"❌ {label} Row {i + 1}, column '{comparison.columns[j]}' mismatch: CSV='{csv_val}' vs UI='{ui_val}'")
+        if len(mismatches) > MAX_LOGGED_MISMATCHES:
+            log(f"Notice: {len(mismatches) - MAX_LOGGED_MISMATCHES} more {label.lower()} mismatching cell(s) not listed.")
+        for line in comparison.summary_lines(label):
+            log(line)
+
+    def _reconcile_columns(self, selected_export: str,
+                           header_names: list[str]) -> Optional[tuple[str, list[str], list[str]]]:
+        """(kind, key columns, joined columns) of the export type, or None when it has no keys."""
+        export_kind_norm = (selected_export or "").strip().lower()
+        kind = next((k for k in RECONCILE_KEYS_BY_EXPORT if k in export_kind_norm), None)
+        if kind is None:
+            return None
+        keys = [k.strip() for k in self.config.get("export_dashboard", f"{kind}_keys", fallback="").split(",")
+                if k.strip()] or RECONCILE_KEYS_BY_EXPORT[kind]
+
+        # join on header_names plus any key column the report doesn't show
+        shown = {h.strip().lower() for h in header_names}
+        return kind, keys, header_names + [k for k in keys if k.strip().lower() not in shown]
+
+    def _keep_export_rows(self, file_path: Path, store: Optional[ExportRowStore]) -> None:
+        # export_rows is created before any worker starts; workers only add their own file
+        if store is None or self.export_rows is None:
+            return
+        self.export_rows[file_path] = store
+
+    def _reconcile_with_ui(self, file_path: Path, selected_export: str, header_names: list[str],
+                           rows_sample: list[list[str]], ui_rows: list[list[str]],
+                           ui_links: list[list[str]]) -> list[list[str]]:
+        """
+        Hash-join the whole export with every captured UI row on the export type's key
+        columns and log matched / missing-in-UI / missing-in-CSV / mismatched counts.
+        The export rows come from the parsing pass (the file is only read again when
+        they were not kept, e.g. past MAX_KEPT_ROWS). Returns the UI rows lined up with
+        rows_sample by key, or `ui_rows` unchanged (positional comparison) when the
+        keys can't be read from the UI.
+        """
+        store = self.export_rows.pop(file_path, None) if self.export_rows else None
+        plan = self._reconcile_columns(selected_export, header_names)
+        if plan is None:
+            return ui_rows
+        kind, keys, columns = plan
+        ui_full: list[list[str]] = []
+        for i, row in enumerate(ui_rows):
+            row = list(row) + [""] * (len(columns) - len(row))
+            for j, name in enumerate(columns):
+                # the UI shows the member as a patient_detail link, not as the CozevaID text
+                if name.strip().lower() == "member cozevaid" and not row[j]:
+                    row[j] = patient_id_from_links(ui_links[i] if i < len(ui_links) else [])
+            ui_full.append(row)
+
+        reconciler = HashJoinReconciler(columns, keys, ui_full)
+        if not reconciler.usable:
+            log(f"Notice: key columns {keys} not readable in the UI; comparing rows by position.")
+            return ui_rows
+
+        if store is not None and store.complete and store.columns == columns:
+            result, sample_matches = reconcile_rows(reconciler, store.rows, sample_rows=len(rows_sample))
+        else:
+            log("Notice: export rows not kept while parsing; reading the file again for reconciliation.")
+            result, sample_matches = reconcile_csv_file(reconciler, file_path, sample_rows=len(rows_sample),
+                                                        kind=kind)
+        for line in result.summary_lines():
+            log(line)
+        blank = [""] * len(header_names)
+        return [ui_full[idx][:len(header_names)] if idx is not None else blank for idx in sample_matches]
+
+    def _poll_export_status(self, progress: ProgressWindow, key: str) -> DashboardRow:
+        """Poll the open Export Dashboard until the export in row `key` reaches 100% or a terminal state."""
+        return self._poll_export_statuses(progress, [key])[key]
+
+    def _poll_export_statuses(self, progress: ProgressWindow, keys: list[str],
+                              on_finished: Optional[Callable[[str, DashboardRow], None]] = None
+                              ) -> dict[str, DashboardRow]:
+        """
+        Poll the open Export Dashboard until the exports in the rows with `keys`
+        (DashboardRow.key) all reach 100% or a terminal state; on_finished(key, row)
+        runs as each one finishes. Returns the finished rows.
+        [export_dashboard] status_poll = http (default) queries status_url (default: the
+        dashboard page) with the browser's cookies over a pooled HTTP session and backs off
+        adaptively; it falls back to refreshing the page when HTTP doesn't work.
+        With shared_poll = true (default) the HTTP polling is done by the process-wide
+        SharedDashboardPoller of (env, customer, user), one fetch per cycle for all jobs; this
+        session polls alone for whatever it can't serve.
+        """
+        section = "export_dashboard"
+        mode = self.config.get(section, "status_poll", fallback="http").strip().lower()
+        backoff = AdaptiveBackoff(
+            min_s=self.config.getfloat(section, "poll_min_s", fallback=AdaptiveBackoff().min_s),
+            max_s=self.config.getfloat(section, "poll_max_s", fallback=AdaptiveBackoff().max_s),
+        )
+        http: Optional[BrowserHttpSession] = None
+        if mode == "http":
+            try:
+                http = BrowserHttpSession.from_driver(self.driver)
+            except Exception as e:
+                log(f"Notice: could not build HTTP session from browser cookies: {e}")
+        status_url = self.config.get(section, "status_url", fallback=self.driver.current_url)
+
+        def on_status(key: str, status: ExportStatus) -> None:
+            prefix = f"Export {key}: " if len(keys) > 1 else ""
+            log(prefix + "Status values (raw): " + status.raw)
+            log(f"{prefix}Current status: '{status.status}', Percent: {status.percent}%")
+            progress.update("Validating Export dashboard percentage status...")
+            metrics = current_run().metrics.for_row(key)
+            if metrics is not None:
+                metrics.record_status(status.status, status.percent, status.finished)
+
+        done: dict[str, DashboardRow] = {}
+        if http is not None and self.config.getboolean(section, "shared_poll", fallback=True):
+            shared = shared_dashboard_poller(self.env or "", self.customer or "", os.environ.get("CS2User", ""),
+                                             status_url, backoff)
+            try:
+                return shared.wait_for_rows(http, keys, on_status=on_status, on_finished=on_finished,
+                                            check_cancelled=progress.check_cancelled)
+            except SharedPollUnavailable as e:
+                log(f"Notice: {e}; polling the dashboard from this session.")
+                done = e.finished
+                try:
+                    http = BrowserHttpSession.from_driver(self.driver)  # the shared poller closed the other
+                except Exception:
+                    http = None
 
-    def contact_export(self, progress: ProgressWindow) -> None:
-        progress.update("Running Contact Export...")
-        DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        def dom_fetch() -> list[DashboardRow]:
+            # the page is fresh on the very first poll; afterwards reload it
+            if poller.polls > 1:
+                self.driver.refresh()
+                self.ajax_preloader_wait()
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.XPATH, "//*[@class='status-info']"))
+            )
+            return self._read_dashboard().rows
 
-        # Click sidenav only if the toggle is present
-        self._click_sidenav_if_present()
+        poller = ExportStatusPoller(dom_fetch, http=http, status_url=status_url, backoff=backoff,
+                                    sleep=progress.sleep, log=log)
+        try:
+            rest = poller.wait_for_rows([k for k in keys if k not in done], on_status=on_status,
+                                        on_finished=on_finished)
+            return {key: done.get(key) or rest[key] for key in keys}
+        finally:
+            if http is not None:
+                http.close()
 
-        # Make sure any loaders are gone
-        self.ajax_preloader_wait()
+    def _download_export(self, progress: ProgressWindow, row: DashboardRow) -> Path:
+        """
+        Click the download link of the dashboard `row` and wait for *this* download to finish
+        (Chrome's .crdownload renamed to .csv and its size stable).
+        """
+        watcher = DownloadWatcher(self.download_dir).start()
+        try:
+            # try to click download link (several fallbacks)
+            clicked = False
+            try:
+                dl = self.driver.find_element(By.XPATH, self._download_link_xpath(row))
+                try:
+                    dl.click()
+                    clicked = True
+                    log("Clicked download link (normal click).")
+                except Exception as e_click_dl:
+                    log(f"Normal click on download link failed: {e_click_dl} - trying JS click")
+                    try:
+                        self.driver.execute_script("arguments[0].click();", dl)
+                        clicked = True
+                        log("Clicked download link via JS.")
+                    except Exception as e_js_dl:
+                        log(f"JS click also failed for download link: {e_js_dl}")
+            except Exception as e_find_dl:
+                log(f"❌ Could not find download link element: {e_find_dl}")
+
+            if not clicked:
+                log("❌ Could not click download link (all fallbacks). Continuing to watch for file but this may fail.")
+
+            result = watcher.wait(idle_timeout=DOWNLOAD_IDLE_TIMEOUT, check_cancelled=progress.check_cancelled)
+        finally:
+            watcher.stop()
 
-        # Now safely wait until the tab is actually clickable
+        if result is None:
+            log("❌ CSV file not found or download incomplete.")
+            raise Exception("CSV file not found or download incomplete.")
+
+        log(f"✅ CSV downloaded: {result.path}")
+        log(f"Download took {result.duration_s:.2f}s for {result.size_bytes / (1024 * 1024):.2f} MB "
+            f"({result.throughput_mb_s:.2f} MB/s, detected via {result.mode}).")
+        return result.path
+
+    @staticmethod
+    def _download_link_xpath(row: DashboardRow) -> str:
+        return row.xpath + "//a[contains(@href, 'unified_file_download')]"
+
+    def _download_href(self, row: DashboardRow) -> str:
+        """Absolute URL of the `row`'s download link (DownloadError when there is none)."""
+        if row.download_href:
+            return urljoin(self.driver.current_url, row.download_href)
         try:
-            contact_tab = WebDriverWait(self.driver, 15).until(
-                EC.element_to_be_clickable((By.XPATH, "//a[@id='contact_log_tab']"))
-            )
-            contact_tab.click()
+            dl = self.driver.find_element(By.XPATH, self._download_link_xpath(row))
+            href = dl.get_attribute("href")
         except Exception as e:
-            log(f"❌ Could not click contact_log_tab: {e}")
-            raise
-
-        self.ajax_preloader_wait()
-        self.driver.find_element(By.XPATH, "//*[@data-target='datatable_bulk_filter_0_contact_log']").click()
-        self.driver.find_element(By.XPATH, "//a[contains(text(), 'Export all to CSV')]").click()
-        self.driver.find_element(By.XPATH, "//a[normalize-space(text())='YES']").click()
-        progress.update("Contact export triggered.")
+            raise DownloadError(f"could not read download link: {e}") from e
+        if not href:
+            raise DownloadError("download link has no href")
+        return href
 
-    def sticket_export(self, progress: ProgressWindow) -> None:
-        progress.update("Running Sticket Export...")
-        DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    def _download_export_http(self, progress: ProgressWindow, selected_export: str, row: DashboardRow
+                              ) -> tuple[Path, list[str], list[list[str]], CsvValidationReport]:
+        """
+        Stream the export link's href with the browser's cookies and validate the rows
+        while they arrive (no second read from disk). Raises DownloadError when the
+        transfer can't be started, so the caller can fall back to the browser download.
+        """
+        href = self._download_href(row)
+        return self._stream_export(BrowserHttpSession.from_driver(self.driver), href, progress, selected_export)
 
+    def _stream_export(self, http: BrowserHttpSession, href: str, progress: ProgressWindow, selected_export: str,
+                       download_dir: Optional[Path] = None, set_stages: bool = True
+                       ) -> tuple[Path, list[str], list[list[str]], CsvValidationReport]:
+        """
+        The transfer + validation of _download_export_http (closes `http`). Makes no
+        WebDriver call, so it can run on a worker thread (with set_stages=False).
+        """
+        download = HttpExportDownload(http, href, download_dir or self.download_dir,
+                                      check_cancelled=progress.check_cancelled)
+        try:
+            download.open()
+            log(f"Streaming export over HTTP (time to first byte {download.ttfb_s:.2f}s).")
+            if set_stages:
+                set_stage("validate")
+            progress.update("Validating Exported file and columns...")
+            header_names, rows_sample, validator, store = self._parse_export_csv(download.iter_lines(),
+                                                                                 selected_export)
+        finally:
+            download.close()
+            http.close()
+
+        result = download.result
+        self._keep_export_rows(result.path, store)
+        log(f"✅ CSV downloaded: {result.path}")
+        log(f"Download took {result.duration_s:.2f}s for {result.size_bytes / (1024 * 1024):.2f} MB "
+            f"({result.throughput_mb_s:.2f} MB/s, TTFB {result.ttfb_s:.2f}s, "
+            f"{result.resumes} resume(s)); sha256 {result.sha256}.")
+        return result.path, header_names, rows_sample, self._finish_export_validation(validator, result.size_bytes,
+                                                                                      rows_sample)
+
+    def _read_export_csv(self, file_path: Path,
+                         selected_export: str) -> tuple[list[str], list[list[str]], CsvValidationReport]:
+        """
+        Read the downloaded export in one streaming pass: select columns by header name,
+        keep the first SAMPLE_ROWS rows for the HTML table and validate every row
+        (field count vs header, repeated header rows, empty mandatory columns).
+        Row data is NOT logged. Returns (header_names, rows_sample, validation report).
+        """
+        with file_path.open("r", encoding="utf-8", newline="") as f:
+            header_names, rows_sample, validator, store = self._parse_export_csv(f, selected_export)
+        self._keep_export_rows(file_path, store)
+        return header_names, rows_sample, self._finish_export_validation(validator, file_path.stat().st_size,
+                                                                         rows_sample)
+
+    @staticmethod
+    def _finish_export_validation(validator: CsvStreamValidator, bytes_read: int,
+                                  rows_sample: list[list[str]]) -> CsvValidationReport:
+        report = validator.finish(bytes_read=bytes_read)
+        log(f"Captured {len(rows_sample)} sample rows from CSV (filtered columns).")
+        for line in report.summary_lines():
+            log(line)
+        return report
+
+    def _parse_export_csv(self, lines: Iterable[str], selected_export: str
+                          ) -> tuple[list[str], list[list[str]], CsvStreamValidator, Optional[ExportRowStore]]:
+        """
+        Parse export lines (a file or a download stream); see _read_export_csv.
+        Also keeps every row's reconciliation columns (None for export types without keys).
+        """
+        rows_sample: list[list[str]] = []
+        header_names: list[str] = []
+
+        # header + dialect (sniffed once per export type, then reused)
+        export_kind_norm = (selected_export or "").strip().lower()
+        kind = next((k for k in INCLUDE_HEADERS_BY_EXPORT if k in export_kind_norm), "")
+        reader = CsvExportReader(lines, kind, log=log)
+        raw_headers = reader.header
+        if not reader.sniffed:
+            log(f"DEBUG reusing the {kind} export dialect (delimiter {reader.delimiter!r}).")
+
+        # Resolve the included headers (excluded ones never match); cached per header row
+        mandatory_list: list[str] = next(
+            (m for k, m in MANDATORY_HEADERS_BY_EXPORT.items() if k in export_kind_norm), [])
+        resolver = header_resolver_for(selected_export)
+        if not resolver.canonical:
+            # No explicit includes provided for this export — capture all headers except excluded ones
+            log(f"Notice: no include-list found for '{selected_export}'. Capturing all non-excluded headers.")
+        header_index = resolver.resolve(raw_headers or [])
+        self._log_header_index(header_index, "CSV headers")
+        for want_name in header_index.missing:
+            log(f"Notice: desired header '{want_name}' not found in CSV headers.")
+        filtered_indices = header_index.present
+
+        # Build final header names for HTML (keep original header text)
+        header_names = [
+            raw_headers[i] if raw_headers and i < len(raw_headers) else f"Col {i}"
+            for i in filtered_indices
+        ]
+
+        # validates every row; also detects repeated header rows on the selected columns
+        validator = CsvStreamValidator(raw_headers or [], mandatory_list,
+                                       header_check_indices=filtered_indices)
+
+        # keep only the selected columns plus those the validator reads; excluded
+        # (PHI) columns are dropped from each record as it is read
+        extra = [i for i in validator.needed_indices if i not in filtered_indices]
+        projected = filtered_indices + extra
+
+        # reconciliation key columns the report doesn't show ("" when not in the export)
+        store: Optional[ExportRowStore] = None
+        key_pos: list[int] = []
+        plan = self._reconcile_columns(selected_export, header_names)
+        if plan is not None:
+            columns = plan[2]
+            by_name: dict[str, int] = {}
+            for i, h in enumerate(raw_headers or []):
+                by_name.setdefault(h.strip().lower(), i)
+            for name in columns[len(header_names):]:
+                idx = by_name.get(name.strip().lower(), -1)
+                if idx >= 0 and idx not in projected:
+                    projected.append(idx)
+                key_pos.append(projected.index(idx) if idx >= 0 else -1)
+            store = ExportRowStore(columns)
+
+        validator.use_projection(projected)
+        n_shown = len(filtered_indices)
+
+        for n_fields, values in reader.batches(projected):
+            # validate column-wise; repeated header rows are dropped
+            kept = validator.feed_batch(values, n_fields)
+            if store is not None:
+                store.extend(tuple(v[:n_shown]) + tuple(v[p] if p >= 0 else "" for p in key_pos) for v in kept)
+
+            # keep the first rows for the HTML table (values for filtered_indices only)
+            if len(rows_sample) < SAMPLE_ROWS:
+                rows_sample.extend(list(v[:n_shown]) for v in kept[:SAMPLE_ROWS - len(rows_sample)])
+
+        return header_names, rows_sample, validator, store
+
+    def _open_log_tab(self, kind: str) -> None:
+        """Show the "contact" / "sticket" log tab (opening the side navigation if needed)."""
         # Click sidenav only if the toggle is present
-        self._click_sidenav_if_present()
+        with timed("sidenav"):
+            self._click_sidenav_if_present()
 
+        # Make sure any loaders are gone
         self.ajax_preloader_wait()
 
+        # Now safely wait until the tab is actually clickable
         try:
-            sticket_tab = WebDriverWait(self.driver, 15).until(
-                EC.element_to_be_clickable((By.XPATH, "//a[@id='sticket_log_tab']"))
+            tab = WebDriverWait(self.driver, 15).until(
+                EC.element_to_be_clickable((By.XPATH, f"//a[@id='{kind}_log_tab']"))
             )
-            sticket_tab.click()
+            tab.click()
         except Exception as e:
-            log(f"❌ Could not click sticket_log_tab: {e}")
+            log(f"❌ Could not click {kind}_log_tab: {e}")
             raise
 
         self.ajax_preloader_wait()
-        self.driver.find_element(By.XPATH, "//*[@data-target='datatable_bulk_filter_0_sticket_log']").click()
+
+    def _trigger_export(self, kind: str, progress: ProgressWindow, customer: Optional[str] = None) -> ExportTicket:
+        """Request "Export all to CSV" on the `kind` log tab; returns the ticket to find it on the dashboard."""
+        set_stage("trigger")
+        progress.update(f"Running {kind.capitalize()} Export...")
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self._open_log_tab(kind)
+        self.driver.find_element(By.XPATH, f"//*[@data-target='datatable_bulk_filter_0_{kind}_log']").click()
         self.driver.find_element(By.XPATH, "//a[contains(text(), 'Export all to CSV')]").click()
+        ticket = ExportTicket(customer or self.customer or "", EXPORT_TYPES_BY_KIND[kind], time.time(),
+                              user=os.environ.get("CS2User", ""))
         self.driver.find_element(By.XPATH, "//a[normalize-space(text())='YES']").click()
-        progress.update("Sticket export triggered.")
-
-    def export_dashboard(self, selected_customer: str, selected_export: str, progress: ProgressWindow) -> None:
-        """
-        Open export dashboard (in new window), poll status until completion, download and validate CSV,
-        capture up to 10 rows of specified columns (selected by header name), exclude certain columns by header name,
-        and insert an HTML table into the HTML log. Row data is NOT logged to console; it only appears in the HTML table.
+        self.triggered = {**(self.triggered or {}), ticket.export_type: ticket}
+        current_run().metrics.export(ticket.export_type).triggered_at = ticket.triggered_at
+        progress.update(f"{kind.capitalize()} export triggered.")
+        return ticket
+
+    def contact_export(self, progress: ProgressWindow) -> ExportTicket:
+        return self._trigger_export("contact", progress)
+
+    def sticket_export(self, progress: ProgressWindow) -> ExportTicket:
+        return self._trigger_export("sticket", progress)
+
+    def trigger_export(self, selected_export: str, progress: ProgressWindow,
+                       customer: Optional[str] = None) -> ExportTicket:
+        """contact_export / sticket_export by export name."""
+        kind = export_kind(selected_export)
+        if kind is None:
+            log(f"Unknown export option selected: {selected_export}")
+            raise ValueError(f"Unknown export option: {selected_export}")
+        return self._trigger_export(kind, progress, customer)
 
-        For Sticket exports, compares those rows against the already-open Sticket log UI page
-        and colors cells green (match) or red (mismatch) in the HTML.
-        """
-        global html_report_written
+    # ─── Export Dashboard steps ──────────────────────────────────
+    def _open_export_dashboard(self, progress: ProgressWindow) -> Optional[str]:
+        """Open the Export Dashboard (usually in a new window) and switch to it; returns the original window."""
         progress.update("Opening Export Dashboard...")
-        original_windows = []
-        original_window = None
-
-        try:
-            # open side nav
-            self.driver.find_element(By.XPATH, "//*[@data-target='sidenav_slide_out']").click()
-            time.sleep(0.8)
+        # open side nav
+        self.driver.find_element(By.XPATH, "//*[@data-target='sidenav_slide_out']").click()
+        time.sleep(0.8)
 
-            original_windows = list(self.driver.window_handles)
-            original_window = self.driver.current_window_handle
+        original_windows = list(self.driver.window_handles)
+        original_window = self.driver.current_window_handle
 
-            # click data_validate (may open new window/tab)
-            try:
-                self.driver.find_element(By.XPATH, "//a[@id='data_validate']").click()
-            except Exception as e_click:
-                log(f"Warning: normal click for data_validate failed: {e_click}; trying JS click")
-                try:
-                    el = self.driver.find_element(By.XPATH, "//a[@id='data_validate']")
-                    self.driver.execute_script("arguments[0].click();", el)
-                except Exception as e_js:
-                    log(f"❌ Could not click data_validate link: {e_js}")
-                    raise
-
-            # wait for new window and switch
+        # click data_validate (may open new window/tab)
+        try:
+            self.driver.find_element(By.XPATH, "//a[@id='data_validate']").click()
+        except Exception as e_click:
+            log(f"Warning: normal click for data_validate failed: {e_click}; trying JS click")
             try:
-                WebDriverWait(self.driver, 20).until(EC.new_window_is_opened(original_windows))
-            except Exception:
-                log("Notice: no new window detected after clicking data_validate — continuing in current window.")
-            else:
-                new_handles = [h for h in self.driver.window_handles if h not in original_windows]
-                if new_handles:
-                    new_window = new_handles[-1]
-                    log(f"Switching to new window: {new_window}")
-                    self.driver.switch_to.window(new_window)
-                else:
-                    last_handle = self.driver.window_handles[-1]
-                    log(f"No diff handles found; switching to last handle: {last_handle}")
-                    self.driver.switch_to.window(last_handle)
-
-            self.ajax_preloader_wait()
-            progress.update("Validating Export Dashboard data...")
+                el = self.driver.find_element(By.XPATH, "//a[@id='data_validate']")
+                self.driver.execute_script("arguments[0].click();", el)
+            except Exception as e_js:
+                log(f"❌ Could not click data_validate link: {e_js}")
+                raise
 
-            # read first table values defensively (customer column)
-            cell = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, "//tr[@role='row' and contains(@class,'odd')][1]/td[4]"))
-            )
-            value = (cell.text or "").strip()
-            progress.update("Validating Export Customer name...")
-            if value.lower() == selected_customer.strip().lower():
-                log(f"✅ Match found! Customer '{value}' matches selected '{selected_customer}'.")
+        # wait for new window and switch
+        try:
+            WebDriverWait(self.driver, 20).until(EC.new_window_is_opened(original_windows))
+        except Exception:
+            log("Notice: no new window detected after clicking data_validate — continuing in current window.")
+        else:
+            new_handles = [h for h in self.driver.window_handles if h not in original_windows]
+            if new_handles:
+                new_window = new_handles[-1]
+                log(f"Switching to new window: {new_window}")
+                self.driver.switch_to.window(new_window)
             else:
-                log(f"❌ Mismatch! Table shows '{value}' but selected '{selected_customer}'.")
-
-            # read export type text from dashboard (may differ from selected_export)
-            export_text_el = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH,
-                                                "(//td[contains(@class, 'export-dashboard-row') "
-                                                "and contains(@class, 'export-dashboard-row_pt')])[3]"))
-            )
-            export_type = (export_text_el.text or "").strip()
-            log("Export type is: " + export_type)
+                last_handle = self.driver.window_handles[-1]
+                log(f"No diff handles found; switching to last handle: {last_handle}")
+                self.driver.switch_to.window(last_handle)
 
-            # poll status until percent == 100 or terminal state
-            download_flag = False
-            while not download_flag:
-                status_el = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, "//*[@class='status-info']"))
-                )
-                status_value = status_el.text or ""
-                log("Status values (raw): " + status_value.replace("\n", " | "))
-                status_values = status_value.split("\n", maxsplit=2)
-
-                if len(status_values) < 3:
-                    log("❌ Unexpected status text format, retrying after wait...")
-                    time.sleep(4)
-                    self.driver.refresh()
-                    self.ajax_preloader_wait()
+        self.ajax_preloader_wait()
+        progress.update("Validating Export Dashboard data...")
+        return original_window
+
+    def _read_dashboard(self) -> DashboardIndex:
+        """Every export row of the open dashboard page, from one page-source read."""
+        formats = [f for f in [self.config.get("export_dashboard", "requested_format", fallback="")] if f]
+        return DashboardIndex(parse_dashboard_rows(self.driver.page_source, "text/html", source="dom",
+                                                   requested_formats=formats or REQUESTED_FORMATS))
+
+    def _ticket_for(self, selected_customer: str, selected_export: str) -> ExportTicket:
+        """The ticket of the last `selected_export` triggered in this session."""
+        ticket = (self.triggered or {}).get(selected_export)
+        if ticket is None:
+            log(f"Notice: no trigger time recorded for {selected_export}; matching rows requested from now on.")
+            ticket = ExportTicket(selected_customer, selected_export, time.time(), user=os.environ.get("CS2User", ""))
+        return ticket
+
+    def _locate_exports(self, tickets: list[ExportTicket], progress: ProgressWindow) -> dict[str, DashboardRow]:
+        """
+        Find the dashboard row of each ticket (in trigger order) by customer, export type,
+        request time and user, whatever its position; sets ticket.row_key. New rows can
+        take a moment to appear, so the page is re-read a few times.
+        """
+        progress.update("Validating Export Customer name...")
+        early_s = self.config.getfloat("export_dashboard", "match_early_s", fallback=MATCH_EARLY_SECONDS)
+        late_s = self.config.getfloat("export_dashboard", "match_late_s", fallback=MATCH_LATE_SECONDS)
+        found: dict[str, DashboardRow] = {}
+        for attempt in range(1, DASHBOARD_MATCH_ATTEMPTS + 1):
+            index = self._read_dashboard()
+            notes = []
+            for ticket in tickets:
+                if ticket.row_key in found:
                     continue
+                row, note = index.correlate(ticket, claimed=found, early_s=early_s, late_s=late_s,
+                                            allow_clock_offset=attempt == DASHBOARD_MATCH_ATTEMPTS)
+                if row is None:
+                    notes.append(note)
+                    continue
+                ticket.row_key = row.key
+                found[row.key] = row
+                metrics = current_run().metrics.export(ticket.export_type)
+                metrics.export_id, metrics.row_key = row.export_id, row.key
+                log(f"✅ Match found! {ticket.describe()} is dashboard {row.describe()}.")
+                if note:
+                    log(f"Notice: {note}.")
+                log("Export type is: " + row.export_type)
+            if len(found) == len(tickets):
+                return found
+            log(f"Notice: dashboard read {attempt}/{DASHBOARD_MATCH_ATTEMPTS}: {'; '.join(notes)}.")
+            if attempt < DASHBOARD_MATCH_ATTEMPTS:
+                progress.sleep(2)
+                self._reload_dashboard()
+        missing = [t.describe() for t in tickets if t.row_key not in found]
+        log(f"❌ Mismatch! No Export Dashboard row found for: {', '.join(missing)}")
+        raise Exception(f"No Export Dashboard row found for: {', '.join(missing)}")
+
+    @staticmethod
+    def _require_success(status: ExportStatus, label: str = "Export") -> None:
+        if status.status in TERMINAL_FAILURES:
+            log(f"❌ {label} ended in terminal state: {status.status}")
+            raise Exception(f"{label} ended in terminal state: {status.status}")
+        if status.status != "Success":
+            log(f"❌ Unexpected end status '{status.status}' when percent==100")
+            raise Exception(f"Unexpected end status '{status.status}'")
+
+    def _reload_dashboard(self) -> None:
+        self.driver.refresh()
+        self.ajax_preloader_wait()
 
-                status_str = status_values[1].strip()
-                percent_str = status_values[2].strip().strip("%")
-                try:
-                    percent = int(percent_str)
-                except Exception:
-                    percent = 0
-
-                log(f"Current status: '{status_str}', Percent: {percent}%")
-                progress.update("Validating Export dashboard percentage status...")
-
-                if status_str in ("Deleted", "Unsuccessful"):
-                    log(f"❌ Export ended in terminal state: {status_str}")
-                    raise Exception(f"Export ended in terminal state: {status_str}")
-
-                if percent < 100:
-                    log(f"Progress {percent}% - waiting and refreshing...")
-                    time.sleep(6)
+    def _download_in_browser(self, progress: ProgressWindow, row: DashboardRow) -> Path:
+        if row.status is not None and row.status.source == "http":
+            # the page was not refreshed while polling over HTTP; load the finished row
+            self._reload_dashboard()
+        return self._download_export(progress, row)
+
+    def _download_and_read(self, progress: ProgressWindow, selected_export: str, row: DashboardRow
+                           ) -> tuple[Path, list[str], list[list[str]], CsvValidationReport]:
+        """Download the export in the dashboard `row` ([export_dashboard] download_mode) and validate it."""
+        download_mode = self.config.get("export_dashboard", "download_mode", fallback="browser")
+        if download_mode.strip().lower() == "http":
+            try:
+                return self._download_export_http(progress, selected_export, row)
+            except DownloadError as e:
+                log(f"Notice: HTTP download failed ({e}); falling back to browser download.")
+
+        file_path = self._download_in_browser(progress, row)
+        set_stage("validate")
+        progress.update("Validating Exported file and columns...")
+        return (file_path, *self._read_export_csv(file_path, selected_export))
+
+    def _compare_with_ui(self, original_window: Optional[str], file_path: Path, selected_export: str,
+                         header_names: list[str], rows_sample: list[list[str]],
+                         log_tab: Optional[str] = None) -> Optional[list[list[bool]]]:
+        """
+        Compare the sample rows with the contact / sticket log in `original_window`
+        (reopening the `log_tab` tab after its refresh, if given); returns the match matrix.
+        """
+        # ---------- COMPARE AGAINST CONTACT LOG UI (only for contact exports) ----------
+        ui_match_matrix = None
+        '''try:
+            export_kind_norm = (selected_export or "").strip().lower()
+            if "contact" in export_kind_norm:
+                ui_rows: list[list[str]] = []
+
+                # locate contact log rows (tbody)
+                contact_tbody = self.driver.find_element(By.XPATH, "//*[@id='contact_log']//tbody")
+                contact_logs = contact_tbody.find_elements(By.TAG_NAME, "tr")
+
+                # switch back to original window if available and refresh page
+                if original_window and original_window in self.driver.window_handles:
+                    self.driver.switch_to.window(original_window)
+                    log(f"Switched back to original window {original_window} for UI comparison.")
                     self.driver.refresh()
                     self.ajax_preloader_wait()
-                    continue
-
-                # percent == 100
-                download_flag = True
-                if status_str == "Success":
-                    log("✅ Export reported success; attempting download...")
+                else:
+                    log("Original window handle not available for UI comparison.")
 
-                    # try to click download link (several fallbacks)
-                    clicked = False
+                # collect up to 10 rows
+                collected = 0
+                for row in contact_logs:
                     try:
-                        dl = self.driver.find_element(By.XPATH, "(//a[contains(@href, 'unified_file_download')])[1]")
-                        try:
-                            dl.click()
-                            clicked = True
-                            log("Clicked download link (normal click).")
-                        except Exception as e_click_dl:
-                            log(f"Normal click on download link failed: {e_click_dl} - trying JS click")
-                            try:
-                                self.driver.execute_script("arguments[0].click();", dl)
-                                clicked = True
-                                log("Clicked download link via JS.")
-                            except Exception as e_js_dl:
-                                log(f"JS click also failed for download link: {e_js_dl}")
-                    except Exception as e_find_dl:
-                        log(f"❌ Could not find download link element: {e_find_dl}")
-
-                    if not clicked:
-                        log("❌ Could not click download link (all fallbacks). Continuing to poll for file but this may fail.")
-
-                    # wait briefly for download to start
-                    time.sleep(6)
-
-                    # detect latest CSV (ignore .crdownload). extend timeout if needed
-                    timeout_seconds = 60
-                    file_path: Optional[Path] = None
-                    for _ in range(timeout_seconds):
-                        try:
-                            files = list(DOWNLOAD_DIR.glob("*.csv"))
-                            if files:
-                                candidate = max(files, key=lambda p: p.stat().st_ctime)
-                                crdownload_path = candidate.with_suffix(candidate.suffix + ".crdownload")
-                                if not crdownload_path.exists():
-                                    file_path = candidate
-                                    break
-                        except Exception as e_glob:
-                            log(f"Warning while scanning downloads: {e_glob}")
-                        time.sleep(1)
-
-                    if not file_path:
-                        log("❌ CSV file not found or download incomplete.")
-                        raise Exception("CSV file not found or download incomplete.")
-
-                    log(f"✅ CSV downloaded: {file_path}")
-
-                    # ------------------ READ CSV robustly and select columns by header name ------------------
-                    progress.update("Validating Exported file and columns...")
-                    rows_sample: list[list[str]] = []
-                    header_names: list[str] = []
-
-                    # headers to always exclude (case-insensitive)
-                    EXCLUDE_HEADERS = {
-                        "patient", "dob", "member id", "member phone #", "member uid", "searchable member id",
-                        "member fname", "member lname", "gender"
-                    }
-
-                    # --------- DEFINE which headers to include per export type ----------
-                    INCLUDE_HEADERS_BY_EXPORT = {
-                        "contact": [
-                            "Member CozevaID", "Measure Details", "Encounter Datetime", "Route",
-                            "Encounter Details", "Encounter Note", "With Whom", "Submitter", "PCP",
-                            "Practice", "Health Plan", "Campaign", "Data Source"
-                        ],
-                        "sticket": [
-                            "Created", "Last Updated", "Created by", "Last Updated by",
-                            "PCP", "Latest Note", "Health Plan"
-                        ],
-                    }
-                    # -------------------------------------------------------------------
-
-                    with file_path.open("r", encoding="utf-8", newline="") as f:
-                        sample = f.read(8192)
-                        f.seek(0)
-
-                        # sniff dialect
+                        # patient cz id (anchor within row)
                         try:
-                            dialect = csv.Sniffer().sniff(sample)
-                            has_header = csv.Sniffer().has_header(sample)
+                            pat_anchor = row.find_element(By.XPATH,
+                                                          ".//a[contains(@href,'patient_detail')]")
+                            patient_link = pat_anchor.get_attribute("href") or ""
+                            patient_cz_id = patient_link.split("/patient_detail/")[1].split("?")[
+                                0] if "/patient_detail/" in patient_link else ""
                         except Exception:
-                            dialect = csv.excel
-                            has_header = True
-
-                        detected_delim = getattr(dialect, "delimiter", ",")
-
-                        reader = csv.reader(f, dialect)
-
-                        # parse header row
-                        headers = next(reader, None)
-                        raw_headers = headers
-                        if isinstance(raw_headers, list) and len(raw_headers) == 1 and isinstance(raw_headers[0], str):
-                            single = raw_headers[0]
-                            if detected_delim and detected_delim in single:
-                                raw_headers = [h.strip() for h in single.split(detected_delim)]
-                            else:
-                                for d in [',', '|', ';', '\t']:
-                                    if d in single:
-                                        raw_headers = [h.strip() for h in single.split(d)]
-                                        detected_delim = d
-                                        log(f"Fallback-split header using delimiter {repr(d)}")
-                                        break
-
-                        # strip BOM
-                        if raw_headers and isinstance(raw_headers, list) and len(raw_headers) > 0 and isinstance(
-                                raw_headers[0], str) and raw_headers[0].startswith("\ufeff"):
-                            raw_headers[0] = raw_headers[0].lstrip("\ufeff")
-
-                        # Prepare normalized header list and map
-                        def _norm(h: str) -> str:
-                            return (h or "").strip().lower()
+                            patient_cz_id = ""
 
-                        raw_lower = [_norm(h) for h in (raw_headers or [])]
-                        header_index_map = {h: i for i, h in enumerate(raw_lower)}
-
-                        # Decide which include-list to use based on SELECTED export in UI
-                        export_kind_norm = _norm(selected_export)
+                        # measure details (scoped to row)
+                        try:
+                            measure_details_ui = row.find_element(By.XPATH,
+                                                                  ".//*[contains(@class,'restructure')]").text.strip()
+                        except Exception:
+                            measure_details_ui = ""
 
-                        chosen_include_list = None
-                        for key, hdr_list in INCLUDE_HEADERS_BY_EXPORT.items():
-                            if key in export_kind_norm:
-                                chosen_include_list = hdr_list
-                                break
+                        # gather tds once for indexed access
+                        tds = row.find_elements(By.TAG_NAME, "td")
 
-                        if not chosen_include_list:
-                            # No explicit includes provided for this export — capture all headers except excluded ones
-                            log(f"Notice: no include-list found for '{selected_export}'. Capturing all non-excluded headers.")
-                            selected_indices = [i for i, h in enumerate(raw_lower) if h not in EXCLUDE_HEADERS]
-                        else:
-                            # Build selected indices from chosen header names (case-insensitive)
-                            selected_indices = []
-                            for want_name in chosen_include_list:
-                                want_norm = _norm(want_name)
-                                if want_norm in header_index_map:
-                                    selected_indices.append(header_index_map[want_norm])
-                                else:
-                                    # fuzzy/substring match as a best-effort
-                                    matched = False
-                                    for i, h in enumerate(raw_lower):
-                                        if want_norm in h or h in want_norm:
-                                            selected_indices.append(i)
-                                            matched = True
-                                            break
-                                    if not matched:
-                                        log(f"Notice: desired header '{want_name}' not found in CSV headers.")
-
-                            # deduplicate while preserving order
-                            seen = set()
-                            selected_indices = [x for x in selected_indices if not (x in seen or seen.add(x))]
-
-                        # Filter out any indices that map to excluded headers
-                        filtered_indices = [idx for idx in selected_indices if
-                                            idx < len(raw_lower) and raw_lower[idx] not in EXCLUDE_HEADERS]
-
-                        # Build final header names for HTML (keep original header text)
-                        header_names = [
-                            raw_headers[i] if raw_headers and i < len(raw_headers) else f"Col {i}"
-                            for i in filtered_indices
-                        ]
-
-                        # helper to detect repeated header rows on selected columns
-                        def is_header_row(check_row_list: list[str]) -> bool:
-                            if not raw_headers or not isinstance(check_row_list, list):
-                                return False
-                            left = [(raw_headers[i].strip().lower() if i < len(raw_headers) else "").strip()
-                                    for i in filtered_indices]
-                            right = [(check_row_list[i].strip().lower() if i < len(check_row_list) else "").strip()
-                                     for i in filtered_indices]
-                            return left == right
-
-                        # collect up to 10 data rows (excluding repeated headers)
-                        collected = 0
-                        for row in reader:
-                            # try to split malformed single-field rows
-                            if isinstance(row, list) and len(row) == 1 and isinstance(row[0], str):
-                                single = row[0]
-                                if detected_delim and detected_delim in single:
-                                    row = [c.strip() for c in single.split(detected_delim)]
-                                else:
-                                    splitted = None
-                                    for d in [',', '|', ';', '\t']:
-                                        if d in single:
-                                            splitted = [c.strip() for c in single.split(d)]
-                                            detected_delim = d
-                                            log(f"Fallback-split data row using delimiter {repr(d)}")
-                                            break
-                                    if splitted is not None:
-                                        row = splitted
-                                    else:
-                                        row = [single]
-
-                            # skip repeated header rows that match on filtered_indices
+                        def td_text(idx: int) -> str:
                             try:
-                                if is_header_row(row):
-                                    continue
+                                return tds[idx].text.strip()
                             except Exception:
-                                pass
+                                return ""
 
-                            # collect values for filtered_indices (but DO NOT log them to console)
-                            vals = [row[i] if i < len(row) else "" for i in filtered_indices]
-
-                            # add to rows_sample (only used for HTML table)
-                            rows_sample.append(vals)
-                            collected += 1
-                            if collected >= 10:
-                                break
+                        # measure note: prefer scoped note element, fallback to td text
+                        try:
+                            measure_note_ui = tds[5].find_element(By.XPATH,
+                                                                  ".//*[contains(@class,'note') and contains(@class,'restructure')]").text.strip()
+                        except Exception:
+                            measure_note_ui = td_text(5)
 
-                    log(f"Captured {len(rows_sample)} sample rows from CSV (filtered columns).")
+                        dos_ui = td_text(7).split()[0] if td_text(7) else ""
+                        enc_date_ui = td_text(8).split()[0] if td_text(8) else ""
 
-                    # ---------- COMPARE AGAINST CONTACT LOG UI (only for contact exports) ----------
+                        try:
+                            enc_note_ui = tds[10].find_element(By.XPATH,
+                                                               ".//*[contains(@class,'note') and contains(@class,'restructure')]").text.strip()
+                        except Exception:
+                            enc_note_ui = td_text(10)
+
+                        contact_by_ui = td_text(12)
+                        submitter_ui = td_text(13)
+                        pcp_ui = td_text(14)
+                        practice_ui = td_text(15)
+                        campaign_ui = td_text(17)
+
+                        ui_rows.append([
+                            patient_cz_id, measure_details_ui, measure_note_ui, dos_ui,
+                            enc_date_ui, enc_note_ui, contact_by_ui, submitter_ui,
+                            pcp_ui, practice_ui, campaign_ui
+                        ])
+
+                        collected += 1
+                        if collected >= 10:
+                            break
+                    except Exception as row_ex:
+                        # log per-row problems but continue with next row
+                        log(f"Notice: failed to parse a contact log row: {row_ex}")
+                        continue
+
+                # build match matrix comparing csv sample rows to ui_rows
+                ui_match_matrix = []
+                for i, csv_row in enumerate(rows_sample):
+                    ui_row = ui_rows[i] if i < len(ui_rows) else [""] * len(header_names)
+                    row_matches: list[bool] = []
+                    for j, csv_val in enumerate(csv_row):
+                        ui_val = ui_row[j] if j < len(ui_row) else ""
+                        csv_text = (str(csv_val) or "").strip()
+                        csv_text = csv_text.replace(" ", "")
+                        ui_text = (str(ui_val) or "").strip()
+                        ui_text = ui_text.replace(" ", "")
+                        is_match = ui_text.lower() in csv_text.lower()
+
+                        row_matches.append(is_match)
+                        if is_match:
+                            log(f"✅ Row {i + 1}, column '{header_names[j]}' matches: '{csv_text}'")
+                        else:
+                            log(f"❌ Row {i + 1}, column '{header_names[j]}' mismatch: CSV='{csv_text}' vs UI='{ui_text}'")
+                    ui_match_matrix.append(row_matches)
+            else:
+                log("Non-Contact export type; skipping UI comparison for this run.")
+        except Exception as cmp_ex:
+            log(f"⚠️ UI comparison for Contact export failed: {cmp_ex}")
+            ui_match_matrix = None'''
+
+        # ---------- COMPARE AGAINST CONTACT LOG UI (only for contact exports) ----------
+        set_stage("compare")
+        ui_match_matrix = None
+        try:
+            export_kind_norm = (selected_export or "").strip().lower()
+            if "contact" in export_kind_norm:
+                if not header_names:
+                    log("Notice: header_names empty — skipping contact UI comparison.")
                     ui_match_matrix = None
-                    '''try:
-                        export_kind_norm = (selected_export or "").strip().lower()
-                        if "contact" in export_kind_norm:
-                            ui_rows: list[list[str]] = []
-
-                            # locate contact log rows (tbody)
-                            contact_tbody = self.driver.find_element(By.XPATH, "//*[@id='contact_log']//tbody")
-                            contact_logs = contact_tbody.find_elements(By.TAG_NAME, "tr")
-
-                            # switch back to original window if available and refresh page
-                            if original_window and original_window in self.driver.window_handles:
-                                self.driver.switch_to.window(original_window)
-                                log(f"Switched back to original window {original_window} for UI comparison.")
-                                self.driver.refresh()
-                                self.ajax_preloader_wait()
-                            else:
-                                log("Original window handle not available for UI comparison.")
-
-                            # collect up to 10 rows
-                            collected = 0
-                            for row in contact_logs:
+                elif not rows_sample:
+                    log("Notice: no rows_sample captured — skipping contact UI comparison.")
+                    ui_match_matrix = None
+                else:
+                    # switch back to original window if available
+                    if original_window and original_window in self.driver.window_handles:
+                        try:
+                            self.driver.switch_to.window(original_window)
+                            log(f"Switched back to original window {original_window} for UI comparison.")
+                            self.driver.refresh()
+                            self.ajax_preloader_wait()
+                            if log_tab:
+                                self._open_log_tab(log_tab)
+                        except Exception as sw_ex:
+                            log(f"Warning: failed to switch/refresh original window for contact comparison: {sw_ex}")
+                    else:
+                        log("Original window handle not available for UI comparison. Proceeding in current window.")
+
+                    # Find contact table (prefer id, else fallback); headers + rows in one round trip
+                    contact_table = None
+                    try:
+                        contact_table = extract_table(self.driver,
+                                                      self.driver.find_element(By.ID, "contact_log"),
+                                                      with_links=True)
+                    except Exception:
+                        try:
+                            tables = extract_tables(self.driver, with_links=True)
+                            for tbl in tables:
                                 try:
-                                    # patient cz id (anchor within row)
-                                    try:
-                                        pat_anchor = row.find_element(By.XPATH,
-                                                                      ".//a[contains(@href,'patient_detail')]")
-                                        patient_link = pat_anchor.get_attribute("href") or ""
-                                        patient_cz_id = patient_link.split("/patient_detail/")[1].split("?")[
-                                            0] if "/patient_detail/" in patient_link else ""
-                                    except Exception:
-                                        patient_cz_id = ""
-
-                                    # measure details (scoped to row)
-                                    try:
-                                        measure_details_ui = row.find_element(By.XPATH,
-                                                                              ".//*[contains(@class,'restructure')]").text.strip()
-                                    except Exception:
-                                        measure_details_ui = ""
-
-                                    # gather tds once for indexed access
-                                    tds = row.find_elements(By.TAG_NAME, "td")
-
-                                    def td_text(idx: int) -> str:
-                                        try:
-                                            return tds[idx].text.strip()
-                                        except Exception:
-                                            return ""
-
-                                    # measure note: prefer scoped note element, fallback to td text
-                                    try:
-                                        measure_note_ui = tds[5].find_element(By.XPATH,
-                                                                              ".//*[contains(@class,'note') and contains(@class,'restructure')]").text.strip()
-                                    except Exception:
-                                        measure_note_ui = td_text(5)
-
-                                    dos_ui = td_text(7).split()[0] if td_text(7) else ""
-                                    enc_date_ui = td_text(8).split()[0] if td_text(8) else ""
-
-                                    try:
-                                        enc_note_ui = tds[10].find_element(By.XPATH,
-                                                                           ".//*[contains(@class,'note') and contains(@class,'restructure')]").text.strip()
-                                    except Exception:
-                                        enc_note_ui = td_text(10)
-
-                                    contact_by_ui = td_text(12)
-                                    submitter_ui = td_text(13)
-                                    pcp_ui = td_text(14)
-                                    practice_ui = td_text(15)
-                                    campaign_ui = td_text(17)
-
-                                    ui_rows.append([
-                                        patient_cz_id, measure_details_ui, measure_note_ui, dos_ui,
-                                        enc_date_ui, enc_note_ui, contact_by_ui, submitter_ui,
-                                        pcp_ui, practice_ui, campaign_ui
-                                    ])
-
-                                    collected += 1
-                                    if collected >= 10:
+                                    th_norms = [normalize_cell(t) for t in tbl.headers if t]
+                                    heuristics = ["measure", "encounter", "submitter", "pcp", "practice",
+                                                  "campaign", "member"]
+                                    overlap = sum(1 for h in heuristics if any(h in tn for tn in th_norms))
+                                    if overlap >= 2:
+                                        contact_table = tbl
                                         break
-                                except Exception as row_ex:
-                                    # log per-row problems but continue with next row
-                                    log(f"Notice: failed to parse a contact log row: {row_ex}")
+                                except Exception:
                                     continue
+                        except Exception as e_tbl:
+                            log(f"Notice: failed to enumerate tables for contact log fallback: {e_tbl}")
+
+                    if contact_table is None:
+                        log("⚠️ Could not find contact_log table in UI — skipping contact comparison.")
+                        ui_match_matrix = None
+                    else:
+                        # map each CSV column to its UI column (aliases, e.g. Encounter Datetime
+                        # -> Encounter Date); resolved once per UI header row
+                        resolver = header_resolver_for(selected_export)
+                        csv_to_ui_idx = resolver.map_columns(header_names, contact_table.headers)
+                        self._log_header_index(resolver.resolve(contact_table.headers), "contact UI table")
+                        for h, ui_idx in zip(header_names, csv_to_ui_idx):
+                            if ui_idx < 0:
+                                log(f"Notice: CSV header '{h}' not found in UI headers; "
+                                    "that column will be blank for comparison.")
+
+                        # UI tbody rows (raw), captured with the headers
+                        ui_rows_raw = contact_table.rows
+
+                        # align UI rows into CSV header order
+                        ui_rows_aligned = []
+                        for raw in ui_rows_raw:
+                            aligned = []
+                            for idx in csv_to_ui_idx:
+                                if 0 <= idx < len(raw):
+                                    aligned.append(raw[idx])
+                                else:
+                                    aligned.append("")
+                            ui_rows_aligned.append(aligned)
 
-                            # build match matrix comparing csv sample rows to ui_rows
-                            ui_match_matrix = []
-                            for i, csv_row in enumerate(rows_sample):
-                                ui_row = ui_rows[i] if i < len(ui_rows) else [""] * len(header_names)
-                                row_matches: list[bool] = []
-                                for j, csv_val in enumerate(csv_row):
-                                    ui_val = ui_row[j] if j < len(ui_row) else ""
-                                    csv_text = (str(csv_val) or "").strip()
-                                    csv_text = csv_text.replace(" ", "")
-                                    ui_text = (str(ui_val) or "").strip()
-                                    ui_text = ui_text.replace(" ", "")
-                                    is_match = ui_text.lower() in csv_text.lower()
-
-                                    row_matches.append(is_match)
-                                    if is_match:
-                                        log(f"✅ Row {i + 1}, column '{header_names[j]}' matches: '{csv_text}'")
-                                    else:
-                                        log(f"❌ Row {i + 1}, column '{header_names[j]}' mismatch: CSV='{csv_text}' vs UI='{ui_text}'")
-                                ui_match_matrix.append(row_matches)
-                        else:
-                            log("Non-Contact export type; skipping UI comparison for this run.")
-                    except Exception as cmp_ex:
-                        log(f"⚠️ UI comparison for Contact export failed: {cmp_ex}")
-                        ui_match_matrix = None'''
+                        # join the full export to the UI rows by key; line the UI rows up with the sample
+                        try:
+                            ui_rows_aligned = self._reconcile_with_ui(file_path, selected_export, header_names,
+                                                                      rows_sample, ui_rows_aligned,
+                                                                      contact_table.links)
+                        except Exception as rec_ex:
+                            log(f"⚠️ Key-based reconciliation failed; comparing rows by position: {rec_ex}")
+
+                        # pad to length of rows_sample
+                        while len(ui_rows_aligned) < len(rows_sample):
+                            ui_rows_aligned.append([""] * len(header_names))
+
+                        # compare column by column; log only the mismatching cells
+                        comparison = ColumnComparator(header_names).compare(rows_sample, ui_rows_aligned)
+                        ui_match_matrix = comparison.row_matrix()
+                        self._log_comparison(comparison, rows_sample, ui_rows_aligned, "Contact")
+            else:
+                log("Non-contact export type; skipping UI comparison for this run.")
+                ui_match_matrix = None
+        except Exception as cmp_ex:
+            log(f"⚠️ UI comparison for contact export failed: {cmp_ex}")
 
-                    # ---------- COMPARE AGAINST CONTACT LOG UI (only for contact exports) ----------
-                    ui_match_matrix = None
+        # ---------- COMPARE AGAINST STICKET LOG UI (only for sticket exports) ----------
+        try:
+            ui_match_matrix_sticket = None  # local to sticket comparison
+            export_kind_norm = (selected_export or "").strip().lower()
+            if "sticket" in export_kind_norm:
+                if not header_names:
+                    log("Notice: header_names empty — skipping sticket UI comparison.")
+                    ui_match_matrix_sticket = None
+                elif not rows_sample:
+                    log("Notice: no rows_sample captured — skipping sticket UI comparison.")
+                    ui_match_matrix_sticket = None
+                else:
+                    # try to switch back to original window where sticket log is expected
+                    if original_window and original_window in self.driver.window_handles:
+                        try:
+                            self.driver.switch_to.window(original_window)
+                            log(f"Switched back to original window {original_window} for sticket UI comparison.")
+                            self.driver.refresh()
+                            self.ajax_preloader_wait()
+                            if log_tab:
+                                self._open_log_tab(log_tab)
+                        except Exception as sw_ex:
+                            log(f"Warning: failed to switch/refresh original window for sticket comparison: {sw_ex}")
+                    else:
+                        log("Original window handle not available for sticket UI comparison. Proceeding in current window.")
+
+                    # attempt to capture UI rows aligned to header_names
                     try:
-                        export_kind_norm = (selected_export or "").strip().lower()
-                        if "contact" in export_kind_norm:
-                            if not header_names:
-                                log("Notice: header_names empty — skipping contact UI comparison.")
-                                ui_match_matrix = None
-                            elif not rows_sample:
-                                log("Notice: no rows_sample captured — skipping contact UI comparison.")
-                                ui_match_matrix = None
-                            else:
-                                import re
-
-                                def normalize(s: str) -> str:
-                                    if s is None:
-                                        return ""
-                                    s = str(s)
-                                    s = s.strip().lower()
-                                    s = re.sub(r"\s+", " ", s)
-                                    s = re.sub(r"[\"'`.,;:()\\[\\]{}<>/\\\\\-]", "", s)
-                                    return s
-
-                                # switch back to original window if available
-                                if original_window and original_window in self.driver.window_handles:
-                                    try:
-                                        self.driver.switch_to.window(original_window)
-                                        log(f"Switched back to original window {original_window} for UI comparison.")
-                                        self.driver.refresh()
-                                        self.ajax_preloader_wait()
-                                    except Exception as sw_ex:
-                                        log(f"Warning: failed to switch/refresh original window for contact comparison: {sw_ex}")
-                                else:
-                                    log("Original window handle not available for UI comparison. Proceeding in current window.")
+                        ui_rows, ui_links = self._capture_ui_rows_for_headers(
+                            header_names, header_resolver_for(selected_export), max_rows=None)
+                        log(f"Captured {len(ui_rows)} UI rows for sticket comparison.")
+                    except Exception as cap_ex:
+                        log(f"⚠️ Could not capture UI rows for sticket comparison: {cap_ex}")
+                        ui_rows, ui_links = [], []
+
+                    # join the full export to the UI rows by key; line the UI rows up with the sample
+                    if ui_rows:
+                        try:
+                            ui_rows = self._reconcile_with_ui(file_path, selected_export, header_names,
+                                                              rows_sample, ui_rows, ui_links)
+                        except Exception as rec_ex:
+                            log(f"⚠️ Key-based reconciliation failed; comparing rows by position: {rec_ex}")
+
+                    # pad ui_rows so it has at least len(rows_sample) rows
+                    while len(ui_rows) < len(rows_sample):
+                        ui_rows.append([""] * len(header_names))
+
+                    # compare column by column; log only the mismatching cells
+                    comparison = ColumnComparator(header_names).compare(rows_sample, ui_rows)
+                    ui_match_matrix_sticket = comparison.row_matrix()
+                    self._log_comparison(comparison, rows_sample, ui_rows, "Sticket")
+            else:
+                log("Non-sticket export type; skipping sticket UI comparison for this run.")
+                ui_match_matrix_sticket = None
+
+            # --- Merge / preserve logic: do NOT overwrite an existing ui_match_matrix produced by Contact block ---
+            # If the shared ui_match_matrix is empty/None, use the sticket result; otherwise keep existing.
+            if ui_match_matrix is None:
+                ui_match_matrix = ui_match_matrix_sticket
+                if ui_match_matrix is not None:
+                    log("Using sticket ui_match_matrix as the report match matrix.")
+            else:
+                log("An existing ui_match_matrix is present (likely from Contact comparison); keeping it and not overwriting with sticket results.")
+        except Exception as cmp_ex:
+            log(f"⚠️ UI comparison for sticket export failed: {cmp_ex}")
+            # do not clobber an existing ui_match_matrix here — leave it as-is
+        # ------------------------------------------------------------------------------
+        return ui_match_matrix
+
+    @staticmethod
+    def _record_download(selected_export: str, report: CsvValidationReport) -> None:
+        """Note the finished download of `selected_export` in the current run's metrics."""
+        current_run().metrics.export(selected_export).record_download(report.bytes_read, report.rows)
+
+    def _report_export(self, file_path: Path, header_names: list[str], rows_sample: list[list[str]],
+                       ui_match_matrix: Optional[list[list[bool]]],
+                       title: str = "CSV Sample Rows (filtered)") -> None:
+        # ---- DELETE CSV FILE AFTER PROCESSING ----
+        try:
+            file_path.unlink()  # delete the CSV
+            log(f"🗑️ Deleted processed file: {file_path}")
+        except Exception as delete_ex:
+            log(f"⚠️ Could not delete CSV file: {delete_ex}")
 
-                                # Find contact table (prefer id, else fallback)
-                                contact_table = None
-                                try:
-                                    contact_table = self.driver.find_element(By.ID, "contact_log")
-                                except Exception:
-                                    try:
-                                        tables = self.driver.find_elements(By.XPATH, "//table")
-                                        for tbl in tables:
-                                            try:
-                                                ths = tbl.find_elements(By.XPATH, ".//th")
-                                                th_texts = [(t.text or "").strip() for t in ths]
-                                                th_norms = [normalize(t) for t in th_texts if t]
-                                                heuristics = ["measure", "encounter", "submitter", "pcp", "practice",
-                                                              "campaign", "member"]
-                                                overlap = sum(1 for h in heuristics if any(h in tn for tn in th_norms))
-                                                if overlap >= 2:
-                                                    contact_table = tbl
-                                                    break
-                                            except Exception:
-                                                continue
-                                    except Exception as e_tbl:
-                                        log(f"Notice: failed to enumerate tables for contact log fallback: {e_tbl}")
-
-                                if contact_table is None:
-                                    log("⚠️ Could not find contact_log table in UI — skipping contact comparison.")
-                                    ui_match_matrix = None
-                                else:
-                                    # read UI headers
-                                    ui_ths = contact_table.find_elements(By.XPATH, ".//th")
-                                    ui_header_texts = [(t.text or "").strip() for t in ui_ths]
-                                    ui_header_norms = [normalize(t) for t in ui_header_texts]
-
-                                    # build mapping: for each CSV header (by index) find UI column index or -1
-                                    MANUAL_HEADER_MAP = {
-                                        "Measure Details": "measure details",
-                                        "Encounter Datetime": "encounter date",
-                                        "Route": "route",
-                                        "Encounter Details": "encounter details",
-                                        "Encounter Note": "encounter note",
-                                        "With Whom": "with whom",
-                                        "Submitter": "submitter",
-                                        "PCP": "pcp",
-                                        "Practice": "practice",
-                                        "Health Plan": "health plan",
-                                        "Campaign": "campaign",
-                                        "Data Source": "data source"
-                                        # add more here...
-                                    }
-
-                                    csv_to_ui_idx = []
-
-                                    for h in header_names:
-                                        ui_col_name = MANUAL_HEADER_MAP.get(h, None)
-
-                                        if ui_col_name is None:
-                                            csv_to_ui_idx.append(-1)
-                                            log(f"Notice: CSV header '{h}' not found in manual UI mapping; "
-                                                "that column will be blank for comparison.")
-                                            continue
-
-                                        # Get UI index from UI header list
-                                        try:
-                                            ui_idx = ui_header_norms.index(ui_col_name)
-                                        except ValueError:
-                                            ui_idx = -1
-                                            log(f"Notice: UI column '{ui_col_name}' (mapped from '{h}') "
-                                                "does not exist in actual UI headers.")
-
-                                        csv_to_ui_idx.append(ui_idx)
-
-                                    # capture UI tbody rows (raw)
-                                    ui_rows_raw = []
-                                    try:
-                                        trs = contact_table.find_elements(By.XPATH, ".//tbody/tr")
-                                        for tr in trs[: len(rows_sample)]:
-                                            try:
-                                                tds = tr.find_elements(By.TAG_NAME, "td")
-                                                row_texts = [(td.text or "").strip() for td in tds]
-                                                ui_rows_raw.append(row_texts)
-                                            except Exception as row_ex:
-                                                log(f"Notice: failed to read a contact row: {row_ex}")
-                                                ui_rows_raw.append([])
-                                    except Exception as cap_ex:
-                                        log(f"⚠️ Failed to capture rows from contact table: {cap_ex}")
-                                        ui_rows_raw = []
-
-                                    # align UI rows into CSV header order
-                                    ui_rows_aligned = []
-                                    for raw in ui_rows_raw:
-                                        aligned = []
-                                        for idx in csv_to_ui_idx:
-                                            if 0 <= idx < len(raw):
-                                                aligned.append(raw[idx])
-                                            else:
-                                                aligned.append("")
-                                        ui_rows_aligned.append(aligned)
-
-                                    # pad to length of rows_sample
-                                    while len(ui_rows_aligned) < len(rows_sample):
-                                        ui_rows_aligned.append([""] * len(header_names))
-
-                                    # build guaranteed-shaped boolean match matrix
-                                    ui_match_matrix = []
-                                    total_cells = 0
-                                    total_matches = 0
-                                    for i, csv_row in enumerate(rows_sample):
-                                        ui_row = ui_rows_aligned[i] if i < len(ui_rows_aligned) else [""] * len(
-                                            header_names)
-                                        row_matches = []
-                                        for j in range(len(header_names)):
-                                            csv_val = csv_row[j] if j < len(csv_row) else ""
-                                            ui_val = ui_row[j] if j < len(ui_row) else ""
-                                            csv_norm = normalize(csv_val)
-                                            ui_norm = normalize(ui_val)
-
-                                            try:
-                                                if ui_norm == "" and csv_norm == "":
-                                                    is_match = True
-                                                elif ui_norm == "":
-                                                    is_match = False
-                                                else:
-                                                    is_match = (ui_norm in csv_norm) or (csv_norm in ui_norm)
-                                            except Exception as m_ex:
-                                                log(f"Notice: exception during matching row {i + 1} col {j + 1}: {m_ex}")
-                                                is_match = False
-
-                                            is_match = bool(is_match)
-                                            row_matches.append(is_match)
-                                            total_cells += 1
-                                            if is_match:
-                                                total_matches += 1
-                                                log(f"✅ Row {i + 1}, column '{header_names[j]}' matches (contact): CSV='{csv_val}' UI='{ui_val}'")
-                                            else:
-                                                log(f"❌ Row {i + 1}, column '{header_names[j]}' mismatch (contact): CSV='{csv_val}' vs UI='{ui_val}'")
-                                        ui_match_matrix.append(row_matches)
-
-                                    total_mismatches = total_cells - total_matches
-                                    log(f"Contact comparison summary: rows={len(rows_sample)}, cols={len(header_names)}, matches={total_matches}, mismatches={total_mismatches}")
-
-                                    # DEBUG: log matrix shape and sample row
-                                    try:
-                                        log(f"DEBUG: ui_match_matrix shape = ({len(ui_match_matrix)}, {len(ui_match_matrix[0]) if ui_match_matrix else 0})")
-                                        log(f"DEBUG: sample ui_rows_aligned[0] = {ui_rows_aligned[0] if ui_rows_aligned else '[]'}")
-                                    except Exception:
-                                        pass
-                        else:
-                            log("Non-contact export type; skipping UI comparison for this run.")
-                            ui_match_matrix = None
-                    except Exception as cmp_ex:
-                        log(f"⚠️ UI comparison for contact export failed: {cmp_ex}")
+        table_html = build_sample_table_html(header_names, rows_sample, ui_match_matrix, title)
 
-                    # ---------- COMPARE AGAINST STICKET LOG UI (only for sticket exports) ----------
-                    try:
-                        ui_match_matrix_sticket = None  # local to sticket comparison
-                        export_kind_norm = (selected_export or "").strip().lower()
-                        if "sticket" in export_kind_norm:
-                            if not header_names:
-                                log("Notice: header_names empty — skipping sticket UI comparison.")
-                                ui_match_matrix_sticket = None
-                            elif not rows_sample:
-                                log("Notice: no rows_sample captured — skipping sticket UI comparison.")
-                                ui_match_matrix_sticket = None
-                            else:
-                                import re
-
-                                def normalize(s: str) -> str:
-                                    if s is None:
-                                        return ""
-                                    s = str(s).strip().lower()
-                                    s = re.sub(r"\s+", " ", s)
-                                    s = re.sub(r"[\"'`.,;:()\\[\\]{}<>/\\\\-]", "", s)
-                                    return s
-
-                                # try to switch back to original window where sticket log is expected
-                                if original_window and original_window in self.driver.window_handles:
-                                    try:
-                                        self.driver.switch_to.window(original_window)
-                                        log(f"Switched back to original window {original_window} for sticket UI comparison.")
-                                        self.driver.refresh()
-                                        self.ajax_preloader_wait()
-                                    except Exception as sw_ex:
-                                        log(f"Warning: failed to switch/refresh original window for sticket comparison: {sw_ex}")
-                                else:
-                                    log("Original window handle not available for sticket UI comparison. Proceeding in current window.")
+        # append the filtered table; the report is finished at logout
+        set_stage("report")
+        if not current_run().html_report_written:
+            add_report_section(table_html)
+            log("✅ Inserted filtered CSV sample table into HTML report.")
 
-                                # attempt to capture UI rows aligned to header_names
-                                try:
-                                    ui_rows = self._capture_ui_rows_for_headers(header_names, max_rows=len(rows_sample))
-                                    log(f"Captured {len(ui_rows)} UI rows for sticket comparison.")
-                                except Exception as cap_ex:
-                                    log(f"⚠️ Could not capture UI rows for sticket comparison: {cap_ex}")
-                                    ui_rows = []
-
-                                # pad ui_rows so it has at least len(rows_sample) rows
-                                while len(ui_rows) < len(rows_sample):
-                                    ui_rows.append([""] * len(header_names))
-
-                                # build guaranteed-shaped match matrix (bools)
-                                ui_match_matrix_local = []
-                                total_cells = 0
-                                total_matches = 0
-                                for i, csv_row in enumerate(rows_sample):
-                                    ui_row = ui_rows[i] if i < len(ui_rows) else [""] * len(header_names)
-                                    row_matches: list[bool] = []
-                                    for j in range(len(header_names)):
-                                        csv_val = csv_row[j] if j < len(csv_row) else ""
-                                        ui_val = ui_row[j] if j < len(ui_row) else ""
-
-                                        csv_text_norm = normalize(csv_val)
-                                        ui_text_norm = normalize(ui_val)
-
-                                        is_match = False
-                                        try:
-                                            if ui_text_norm == "" and csv_text_norm == "":
-                                                is_match = True
-                                            elif ui_text_norm == "":
-                                                is_match = False
-                                            else:
-                                                is_match = (ui_text_norm in csv_text_norm) or (
-                                                            csv_text_norm in ui_text_norm)
-                                        except Exception as m_ex:
-                                            log(f"Notice: exception during sticket matching row {i + 1} col {j + 1}: {m_ex}")
-                                            is_match = False
-
-                                        is_match = bool(is_match)
-                                        row_matches.append(is_match)
-                                        total_cells += 1
-                                        if is_match:
-                                            total_matches += 1
-                                            log(f"✅ Sticket Row {i + 1}, column '{header_names[j]}' matches: CSV='{csv_val}' UI='{ui_val}'")
-                                        else:
-                                            log(f"❌ Sticket Row {i + 1}, column '{header_names[j]}' mismatch: CSV='{csv_val}' vs UI='{ui_val}'")
-                                    ui_match_matrix_local.append(row_matches)
-
-                                total_mismatches = total_cells - total_matches
-                                log(f"Sticket comparison summary: rows={len(rows_sample)}, cols={len(header_names)}, matches={total_matches}, mismatches={total_mismatches}")
-
-                                ui_match_matrix_sticket = ui_match_matrix_local
-                        else:
-                            log("Non-sticket export type; skipping sticket UI comparison for this run.")
-                            ui_match_matrix_sticket = None
-
-                        # --- Merge / preserve logic: do NOT overwrite an existing ui_match_matrix produced by Contact block ---
-                        # If the shared ui_match_matrix is empty/None, use the sticket result; otherwise keep existing.
-                        if ui_match_matrix is None:
-                            ui_match_matrix = ui_match_matrix_sticket
-                            if ui_match_matrix is not None:
-                                log("Using sticket ui_match_matrix as the report match matrix.")
-                        else:
-                            log("An existing ui_match_matrix is present (likely from Contact comparison); keeping it and not overwriting with sticket results.")
-                    except Exception as cmp_ex:
-                        log(f"⚠️ UI comparison for sticket export failed: {cmp_ex}")
-                        # do not clobber an existing ui_match_matrix here — leave it as-is
-                    # ------------------------------------------------------------------------------
+    def export_dashboard(self, selected_customer: str, selected_export: str, progress: ProgressWindow,
+                         ticket: Optional[ExportTicket] = None) -> None:
+        """
+        Open export dashboard (in new window), poll status until completion, download and validate CSV,
+        capture up to 10 rows of specified columns (selected by header name), exclude certain columns by header name,
+        and insert an HTML table into the HTML log. Row data is NOT logged to console; it only appears in the HTML table.
 
-                    # ---- DELETE CSV FILE AFTER PROCESSING ----
-                    try:
-                        file_path.unlink()  # delete the CSV
-                        log(f"🗑️ Deleted processed file: {file_path}")
-                    except Exception as delete_ex:
-                        log(f"⚠️ Could not delete CSV file: {delete_ex}")
-
-                    def build_sample_table_html(header_names_, data_rows_, match_matrix_=None):
-                        import html as _html
-                        parts = [
-                            "<div style='margin-top:12px;'>",
-                            "<h2 style='margin:6px 0 8px 0;font-size:1.05rem;color:#1f5f0f;'>CSV Sample Rows (filtered)</h2>",
-                            "<div style='overflow:auto;max-width:100%'>",
-                            "<table class='sample' role='table'>",
-                            "<thead><tr>",
-                        ]
-                        for h in header_names_:
-                            parts.append(f"<th>{_html.escape(str(h))}</th>")
-                        parts.append("</tr></thead><tbody>")
-                        if data_rows_:
-                            for i, r in enumerate(data_rows_):
-                                parts.append("<tr>")
-                                for j, c in enumerate(r):
-                                    style_attr = ""
-                                    data_match_attr = ""
-                                    if match_matrix_ is not None and i < len(match_matrix_) and j < len(
-                                            match_matrix_[i]):
-                                        m = match_matrix_[i][j]
-                                        # force to strict True/False
-                                        if m is True:
-                                            style_attr = " style='background:#e6ffed;'"  # green
-                                            data_match_attr = " data-match='true'"
-                                        elif m is False:
-                                            style_attr = " style='background:#ffecec;'"  # red
-                                            data_match_attr = " data-match='false'"
-                                        else:
-                                            # if not strict bool, treat falsy as mismatch
-                                            if bool(m):
-                                                style_attr = " style='background:#e6ffed;'"
-                                                data_match_attr = " data-match='true'"
-                                            else:
-                                                style_attr = " style='background:#ffecec;'"
-                                                data_match_attr = " data-match='false'"
-
-                                    parts.append(
-                                        f"<td{style_attr}{data_match_attr}>{_html.escape(str(c))}</td>"
-                                    )
-                                parts.append("</tr>")
-                        else:
-                            parts.append("<tr><td colspan='100%'>No sample rows captured.</td></tr>")
-                        parts.append("</tbody></table></div></div>")
-                        return "\n".join(parts)
+        The export's row is found by customer, type and trigger time (`ticket`, default: the
+        last `selected_export` triggered in this session), not by its position on the dashboard.
+
+        For Sticket exports, compares those rows against the already-open Sticket log UI page
+        and colors cells green (match) or red (mismatch) in the HTML.
+        """
+        ticket = ticket or self._ticket_for(selected_customer, selected_export)
+        set_stage("dashboard")
+        self.export_rows = {}
+        try:
+            original_window = self._open_export_dashboard(progress)
+            self._locate_exports([ticket], progress)
 
-                    table_html = build_sample_table_html(header_names, rows_sample, ui_match_matrix)
+            # poll status until percent == 100 or terminal state
+            set_stage("status_poll")
+            row = self._poll_export_status(progress, ticket.row_key)
+            self._require_success(row.status)
+            log("✅ Export reported success; attempting download...")
 
-                    # save HTML (once) with the filtered table
-                    if not html_report_written:
-                        save_logs_to_html(selected_customer, selected_export, filename=LOG_HTML_FILE,
-                                          sample_table_html=table_html)
-                        log("✅ Inserted filtered CSV sample table into HTML report.")
-                else:
-                    log(f"❌ Unexpected end status '{status_str}' when percent==100")
-                    raise Exception(f"Unexpected end status '{status_str}'")
+            # ------------------ DOWNLOAD + READ + VALIDATE CSV (single streaming pass) ------------------
+            set_stage("download")
+            file_path, header_names, rows_sample, report = self._download_and_read(progress, selected_export, row)
+            self._record_download(selected_export, report)
+
+            ui_match_matrix = self._compare_with_ui(original_window, file_path, selected_export,
+                                                    header_names, rows_sample)
+            current_run().metrics.export(selected_export).record_match_matrix(ui_match_matrix)
+            self._report_export(file_path, header_names, rows_sample, ui_match_matrix)
 
         except Exception as ex:
             log(f"❌ export_dashboard failed: {ex}")
             raise
+        finally:
+            self.export_rows = None  # rows kept for a join that didn't run
 
+    def export_dashboard_many(self, selected_customer: str, selected_exports: list[str],
+                              progress: ProgressWindow, tickets: Optional[list[ExportTicket]] = None) -> None:
+        """
+        export_dashboard for exports triggered back-to-back in this session (`tickets`,
+        in trigger order; default: the last trigger of each of `selected_exports`).
+        One status poll per cycle tracks all of their rows; each export is downloaded
+        as soon as its row finishes and validated on a worker thread while the others
+        are still running (with download_mode = http the transfer runs there too).
+        The UI comparisons need the browser and run one after the other at the end.
+        """
+        run = current_run()
+        tickets = tickets or [self._ticket_for(selected_customer, export) for export in selected_exports]
+        set_stage("dashboard")
+        http_mode = (self.config.get("export_dashboard", "download_mode", fallback="browser")
+                     .strip().lower() == "http")
+        pending: dict[str, Future] = {}
+        self.export_rows = {}
+        workers = ThreadPoolExecutor(max_workers=len(tickets), thread_name_prefix="export-validate")
+
+        def in_run(name: str, export: str, fn, *args):
+            with bind_run(run):
+                with timed(name):
+                    result = fn(*args)
+                self._record_download(export, result[3])
+                return result
+
+        def read_download(file_path: Path, export: str):
+            return (file_path, *self._read_export_csv(file_path, export))
+
+        def start_download(key: str, row: DashboardRow) -> None:
+            export = export_of[key]
+            self._require_success(row.status, export)
+            log(f"✅ {export} reported success; starting its download...")
+            if http_mode:
+                try:
+                    href = self._download_href(row)
+                except DownloadError as e:
+                    log(f"Notice: HTTP download of {export} unavailable ({e}); falling back to browser download.")
+                else:
+                    # cookies are read here; the worker never touches the driver
+                    http = BrowserHttpSession.from_driver(self.driver)
+                    pending[key] = workers.submit(
+                        in_run, f"{export} download", export, self._stream_export, http, href, progress, export,
+                        self.download_dir / export_kind(export), False)  # file names may repeat across types
+                    return
+            # the click and Chrome's download need the browser; the read does not
+            file_path = self._download_in_browser(progress, row)
+            pending[key] = workers.submit(in_run, f"{export} validate", export, read_download, file_path, export)
+
+        try:
+            original_window = self._open_export_dashboard(progress)
+            rows = self._locate_exports(tickets, progress)
+            export_of = {t.row_key: t.export_type for t in tickets}
+
+            set_stage("status_poll")
+            self._poll_export_statuses(progress, [t.row_key for t in tickets], on_finished=start_download)
+
+            # whatever is still transferring or validating
+            set_stage("download")
+            results = {}
+            for ticket in tickets:
+                key, export = ticket.row_key, ticket.export_type
+                try:
+                    results[key] = pending[key].result()
+                except DownloadError as e:
+                    log(f"Notice: HTTP download of {export} failed ({e}); falling back to browser download.")
+                    self._reload_dashboard()
+                    results[key] = read_download(self._download_export(progress, rows[key]), export)
+                    self._record_download(export, results[key][3])
+
+            for ticket in tickets:
+                export = ticket.export_type
+                file_path, header_names, rows_sample, _ = results[ticket.row_key]
+                ui_match_matrix = self._compare_with_ui(original_window, file_path, export, header_names,
+                                                        rows_sample, log_tab=export_kind(export))
+                current_run().metrics.export(export).record_match_matrix(ui_match_matrix)
+                self._report_export(file_path, header_names, rows_sample, ui_match_matrix,
+                                    title=f"{export}: CSV Sample Rows (filtered)")
+
+        except Exception as ex:
+            log(f"❌ export_dashboard failed: {ex}")
+            raise
         finally:
-            try:
-                if original_window and original_window in self.driver.window_handles:
-                    # nothing extra needed here
-                    pass
-            except Exception as sw_ex:
-                log(f"Notice: failed to access original window in finally: {sw_ex}")
+            workers.shutdown(wait=True, cancel_futures=True)
+            self.export_rows = None  # rows kept for a join that didn't run
+
+
+# ─── Report table ──────────────────────────────────────────────
+def build_sample_table_html(header_names_, data_rows_, match_matrix_=None,
+                            title: str = "CSV Sample Rows (filtered)") -> str:
+    import html as _html
+    parts = [
+        "<div style='margin-top:12px;'>",
+        f"<h2 style='margin:6px 0 8px 0;font-size:1.05rem;color:#1f5f0f;'>{_html.escape(title)}</h2>",
+        "<div style='overflow:auto;max-width:100%'>",
+        "<table class='sample' role='table'>",
+        "<thead><tr>",
+    ]
+    for h in header_names_:
+        parts.append(f"<th>{_html.escape(str(h))}</th>")
+    parts.append("</tr></thead><tbody>")
+    if data_rows_:
+        for i, r in enumerate(data_rows_):
+            parts.append("<tr>")
+            for j, c in enumerate(r):
+                style_attr = ""
+                data_match_attr = ""
+                if match_matrix_ is not None and i < len(match_matrix_) and j < len(
+                        match_matrix_[i]):
+                    m = match_matrix_[i][j]
+                    # force to strict True/False
+                    if m is True:
+                        style_attr = " style='background:#e6ffed;'"  # green
+                        data_match_attr = " data-match='true'"
+                    elif m is False:
+                        style_attr = " style='background:#ffecec;'"  # red
+                        data_match_attr = " data-match='false'"
+                    else:
+                        # if not strict bool, treat falsy as mismatch
+                        if bool(m):
+                            style_attr = " style='background:#e6ffed;'"
+                            data_match_attr = " data-match='true'"
+                        else:
+                            style_attr = " style='background:#ffecec;'"
+                            data_match_attr = " data-match='false'"
+
+                parts.append(
+                    f"<td{style_attr}{data_match_attr}>{_html.escape(str(c))}</td>"
+                )
+            parts.append("</tr>")
+    else:
+        parts.append("<tr><td colspan='100%'>No sample rows captured.</td></tr>")
+    parts.append("</tbody></table></div></div>")
+    return "\n".join(parts)
 
 
 # ─── Export flow (called from UI) ─────────────────────────────────
-def run_export_flow(selected_customer: str, selected_export: str, selected_env: str, master: Tk) -> None:
+EXPORT_FLOW_STEPS = 10  # progress steps per export
+
+
+def export_flow_steps(selected_export: str) -> int:
+    return EXPORT_FLOW_STEPS * max(1, len(split_exports(selected_export)))
+
+_shared_pool: Optional[DriverPool] = None
+_shared_pool_lock = threading.Lock()
+_shared_pollers: dict[tuple[str, str, str, str], SharedDashboardPoller] = {}
+_shared_pollers_lock = threading.Lock()
+
+
+def open_export_session(env: str, customer: str, progress,
+                        user_data_dir: Optional[Path] = None,
+                        client: Optional[ContactExport] = None) -> ContactExport:
     """
-    Run the whole Selenium + validation flow for the given customer/export/env,
-    using `master` as the Tk root for ProgressWindow and messageboxes.
+    DriverPool factory: start Chrome and log in for (env, customer). A `client`
+    from prelaunch_export_browser is logged in instead of starting Chrome.
     """
-    global html_report_written
+    if client is None:
+        client = ContactExport(CONFIG_FILE_PATH, user_data_dir=user_data_dir)
+    else:
+        log("Using the pre-launched browser (Chrome start skipped).")
+    try:
+        client.login_cozeva(env, customer, progress)
+    except Exception:
+        try:
+            client.driver.quit()
+        except Exception:
+            pass
+        raise
+    return client
 
+
+def prelaunch_export_browser(env: str) -> Optional[ContactExport]:
+    """
+    BrowserWarmup factory: start Chrome and open the login page of `env` before
+    the customer is chosen. None when [browser] warmup is off.
+    """
+    config = ConfigParser()
+    config.read(CONFIG_FILE_PATH)
+    if not warmup_enabled(config):
+        return None
+    client = ContactExport(CONFIG_FILE_PATH)
     try:
-        total_steps = 10
-        progress = ProgressWindow(master, total_steps)
+        client.open_login_page(env.lower())
+    except Exception:
+        try:
+            client.driver.quit()
+        except Exception:
+            pass
+        raise
+    return client
 
-        c1 = ContactExport(CONFIG_FILE_PATH)
 
-        env_upper = (selected_env or "").upper()
-        if env_upper == "CERT":
-            c1.certlogin_cozeva(selected_customer, progress)
-        elif env_upper == "PROD":
-            c1.prodlogin_cozeva(selected_customer, progress)
-        else:
-            raise RuntimeError(f"Unknown environment: {selected_env!r}")
+def shared_driver_pool() -> DriverPool:
+    """Process-wide pool of warm export sessions, created on first use."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool(open_export_session, log=log)
+        return _shared_pool
+
+
+def shared_dashboard_poller(env: str, customer: str, user: str, status_url: str,
+                            backoff: Optional[AdaptiveBackoff] = None) -> SharedDashboardPoller:
+    """
+    Process-wide dashboard poller of (env, customer, user, status_url), created on
+    first use; its jobs' sessions are logged in to the same customer.
+    """
+    key = (env.upper(), customer.strip().lower(), user.strip().lower(), status_url)
+    with _shared_pollers_lock:
+        poller = _shared_pollers.get(key)
+        if poller is None:
+            poller = _shared_pollers[key] = SharedDashboardPoller(status_url, backoff=backoff, log=log,
+                                                                  name=env.lower() or "dashboard")
+        return poller
+
+
+def dashboard_poll_summary() -> str:
+    """Fetches made by the shared dashboard pollers so far (for batch summaries)."""
+    with _shared_pollers_lock:
+        pollers = list(_shared_pollers.items())
+    return ", ".join(f"{env} {customer} {status_url}: {poller.fetches} fetch(es)"
+                     for (env, customer, _, status_url), poller in pollers)
+
+
+def record_run_history(run: RunContext, customer: str, selected_export: str, env: str,
+                       started_at: float, error: Optional[str]) -> None:
+    """Store the finished `run` in the run history ([run_history] in config.ini); a failure is only logged."""
+    try:
+        config = ConfigParser()
+        config.read(CONFIG_FILE_PATH)
+        run.timeline.close()
+        RunHistory.from_config(config, base_dir=CONFIG_FILE_PATH.parent).record_run(
+            started_at=started_at, env=env, customer=customer, selection=selected_export, label=run.label,
+            ok=error is None, error=error,
+            stages={name: ms / 1000 for name, ms in run.timeline.stage_totals().items()},
+            metrics=run.metrics, report_path=str(run.report_path))
+    except Exception as e:
+        log(f"⚠️ Could not record the run in the run history: {e}")
 
-        if selected_export == "Contact Export":
-            c1.contact_export(progress)
-        elif selected_export == "Sticket Export":
-            c1.sticket_export(progress)
+
+def execute_export_job(selected_customer: str,
+                       selected_export: str,
+                       selected_env: str,
+                       progress,
+                       download_dir: Optional[Path] = None,
+                       user_data_dir: Optional[Path] = None,
+                       pool: Optional[DriverPool] = None,
+                       client: Optional[ContactExport] = None) -> None:
+    """
+    Run the whole Selenium + validation flow for one customer/export/env
+    (`selected_export` may combine exports, e.g. "Contact Export + Sticket Export").
+    `progress` is a ProgressWindow or ConsoleProgress. With a `pool`, a warm
+    logged-in browser is checked out (and returned afterwards) instead of
+    starting Chrome and logging in; a `client` from prelaunch_export_browser
+    (Chrome already on the login page) skips the Chrome start when there is
+    no warm session (with a pool, it is quit if one was reused). Raises on
+    failure; the HTML report is written to the current run's report_path either way,
+    and the run is added to the run history (run_history.py).
+    """
+    run = current_run()
+    started_at = time.time()
+    error: Optional[str] = "run did not finish"  # e.g. interrupted
+    start_report(selected_customer, selected_export)
+    session: Optional[PooledSession] = None
+    owned: Optional[ContactExport] = None  # a browser of this job only (no pool): quit on failure
+    try:
+        if pool is not None:
+            session = pool.checkout(selected_env, selected_customer, progress, user_data_dir, client)
+            c1 = session.client
+            if client is not None and c1 is not client:
+                quit_browser(client)  # a warm session was reused; the pre-launched browser is not needed
+            c1.set_download_dir(download_dir if download_dir is not None else run.download_dir)
         else:
-            messagebox.showwarning("Warning", f"Unknown export option: {selected_export}", parent=master)
-            log(f"Unknown export option selected: {selected_export}")
+            if client is not None:
+                log("Using the pre-launched browser (Chrome start skipped).")
+                c1 = owned = client
+                c1.set_download_dir(download_dir if download_dir is not None else run.download_dir)
+            else:
+                c1 = owned = ContactExport(CONFIG_FILE_PATH, download_dir=download_dir, user_data_dir=user_data_dir)
+            c1.login_cozeva(selected_env, selected_customer, progress)
 
-        c1.export_dashboard(selected_customer, selected_export, progress)
-        c1.logout_cozeva(progress, customer=selected_customer, export_type=selected_export)
+        exports = split_exports(selected_export)
+        unknown = [e for e in exports if export_kind(e) is None]
+        if unknown or not exports:
+            log(f"Unknown export option selected: {selected_export}")
+            raise ValueError(f"Unknown export option: {selected_export}")
 
-        messagebox.showinfo("Success", "Validation completed successfully!", parent=master)
+        # several exports: trigger them back-to-back, then track their dashboard rows together
+        tickets = [c1.trigger_export(export, progress, selected_customer) for export in exports]
+        if len(exports) > 1:
+            c1.export_dashboard_many(selected_customer, exports, progress, tickets)
+        else:
+            c1.export_dashboard(selected_customer, selected_export, progress, tickets[0])
+        c1.logout_cozeva(progress, customer=selected_customer, export_type=selected_export,
+                         keep_session=session is not None)
+        owned = None  # logout quit it
+        if session is not None:
+            pool.release(session)
+            session = None
+        error = None
 
     except Exception as e:
+        error = str(e) or type(e).__name__
         log(f"❌ {e}")
+        if session is not None:
+            pool.release(session, healthy=False)
         try:
-            if not html_report_written:
+            if not run.html_report_written:
                 save_logs_to_html(
                     selected_customer if selected_customer else "Unknown",
                     selected_export if selected_export else "Unknown"
                 )
         except Exception as ex:
             log(f"❌ Failed to write log after exception: {ex}")
-        messagebox.showerror("Error", str(e), parent=master)
+        raise
+    finally:
+        quit_browser(owned)
+        record_run_history(run, selected_customer, selected_export, selected_env, started_at, error)
 
 
-# Optional: standalone main for testing this file directly
+# Optional: standalone main for testing this file directly (headless runs: export_cli.py)
 def main() -> None:
+    from tkinter import Tk
+    from Export_DashboardUI import browser_warmup, start_ui  # lazy import to avoid circular issues
+    from progress_window import run_export_flow
+
     root = Tk()
     root.withdraw()
 
-    from Export_DashboardUI import start_ui  # lazy import to avoid circular issues
-
     selected_customer, selected_export, selected_env = start_ui(root)
     if not selected_customer or not selected_export or not selected_env:
         log("No selection made. Exiting.")
+        browser_warmup().discard()
         root.destroy()
         return
 
-    run_export_flow(selected_customer, selected_export, selected_env, root)
+    run_export_flow(selected_customer, selected_export, selected_env, root, warmup=browser_warmup())
+    browser_warmup().discard()
 
     try:
         root.destroy()
@@ -0,0 +1,204 @@
+from __future__ import annotations
+import argparse
+import csv
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional
+
+import common_path  # noqa: F401 (repo root on sys.path for cozeva_common)
+from cozeva_common.driver_pool import DriverPool
+from Export_Functionality import (
+    EXPORT_SEPARATOR,
+    ConsoleProgress,
+    RunContext,
+    bind_run,
+    dashboard_poll_summary,
+    execute_export_job,
+    export_flow_steps,
+    log,
+    open_export_session,
+)
+
+# ─── Configuration ─────────────────────────────────────────────
+CUSTOMER_CSV_PATH = Path("Customer.csv")
+BATCH_OUTPUT_DIR = Path("batch_runs")
+DEFAULT_WORKERS = 4
+EXPORT_TYPES = {"contact": "Contact Export", "sticket": "Sticket Export"}
+SKIP_CUSTOMERS = {"Customer Not in List"}
+
+
+@dataclass(frozen=True)
+class ExportJob:
+    customer: str
+    export_type: str  # "Contact Export" / "Sticket Export" / "Contact Export + Sticket Export"
+    env: str          # "CERT" / "PROD"
+
+    @property
+    def slug(self) -> str:
+        raw = f"{self.customer}_{self.export_type}_{self.env}"
+        return re.sub(r"[^A-Za-z0-9]+", "_", raw).strip("_")
+
+
+@dataclass
+class JobResult:
+    job: ExportJob
+    ok: bool
+    elapsed_s: float
+    report_path: str
+    download_dir: str
+    error: Optional[str] = None
+
+
+def load_jobs_from_csv(csv_path: Path, export_types: list[str], env: str) -> list[ExportJob]:
+    """Build one job per (customer in Customer.csv, export type)."""
+    jobs: list[ExportJob] = []
+    with Path(csv_path).open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            customer = (row.get("Customer Name") or "").strip()
+            if not customer or customer in SKIP_CUSTOMERS:
+                continue
+            for export_type in export_types:
+                jobs.append(ExportJob(customer, export_type, env.upper()))
+    return jobs
+
+
+def _run_job(job: ExportJob, output_dir: Path, pool: Optional[DriverPool]) -> JobResult:
+    """Run one job in the calling worker thread with its own log, report and download folder."""
+    job_dir = output_dir / job.slug
+    context = RunContext(
+        report_path=job_dir / "validation_log.html",
+        download_dir=job_dir / "downloads",
+        label=job.slug,
+        customer=job.customer,
+        jsonl_path=job_dir / "log.jsonl",
+    )
+    context.download_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    error: Optional[str] = None
+
+    with bind_run(context):
+        log(f"Batch job started: {job.customer} / {job.export_type} / {job.env}")
+        try:
+            execute_export_job(
+                job.customer, job.export_type, job.env,
+                ConsoleProgress(export_flow_steps(job.export_type)),
+                download_dir=context.download_dir,
+                user_data_dir=job_dir / "chrome_profile",
+                pool=pool,
+            )
+        except Exception as e:
+            error = str(e)
+
+    result = JobResult(
+        job=job,
+        ok=error is None,
+        elapsed_s=round(time.perf_counter() - started, 2),
+        report_path=str(context.report_path),
+        download_dir=str(context.download_dir),
+        error=error,
+    )
+    context.log.close()
+    (job_dir / "log.txt").write_text("\n".join(context.entries), encoding="utf-8")
+    return result
+
+
+def group_jobs(jobs: list[ExportJob]) -> list[list[ExportJob]]:
+    """Jobs grouped by (env, customer), in first-seen order; a group shares one logged-in browser."""
+    groups: dict[tuple[str, str], list[ExportJob]] = {}
+    for job in jobs:
+        groups.setdefault((job.env, job.customer), []).append(job)
+    return list(groups.values())
+
+
+def _run_group(group: list[ExportJob], output_dir: Path, pool: Optional[DriverPool]) -> list[JobResult]:
+    """The jobs of one (env, customer) one after the other on this worker, so they reuse its session."""
+    return [_run_job(job, output_dir, pool) for job in group]
+
+
+def run_export_batch(jobs: list[ExportJob],
+                     workers: int = DEFAULT_WORKERS,
+                     output_dir: Path = BATCH_OUTPUT_DIR,
+                     reuse_sessions: bool = True) -> list[JobResult]:
+    """
+    Run `jobs` on `workers` concurrent browser sessions.
+    The jobs of one (env, customer) run one after the other on the same worker;
+    with reuse_sessions their logged-in browser is kept in a DriverPool, so only
+    the first of them starts Chrome and logs in. The pool holds at most
+    `workers` browsers in all (checked out or idle).
+    Writes one folder per job plus batch_summary.json under `output_dir`.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    groups = group_jobs(jobs)
+    workers = max(1, min(workers, len(groups) or 1))
+    started = time.perf_counter()
+    log(f"Starting batch of {len(jobs)} job(s) for {len(groups)} customer(s) on {workers} browser session(s).")
+
+    driver_pool = DriverPool(open_export_session, max_sessions=workers, log=log) if reuse_sessions else None
+    results: list[JobResult] = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export-job") as executor:
+            futures = [executor.submit(_run_group, group, output_dir, driver_pool) for group in groups]
+            for fut in as_completed(futures):
+                for result in fut.result():
+                    results.append(result)
+                    marker = "✅" if result.ok else "❌"
+                    log(f"{marker} {result.job.slug} finished in {result.elapsed_s}s"
+                        + (f": {result.error}" if result.error else ""))
+    finally:
+        if driver_pool is not None:
+            log(f"Driver pool: {driver_pool.hits} reuse(s), {driver_pool.misses} new browser(s).")
+            driver_pool.close_all()
+        if dashboard_poll_summary():
+            log(f"Shared dashboard polling: {dashboard_poll_summary()}.")
+
+    total = round(time.perf_counter() - started, 2)
+    passed = sum(1 for r in results if r.ok)
+    summary = {
+        "jobs": len(results),
+        "passed": passed,
+        "failed": len(results) - passed,
+        "workers": workers,
+        "wall_time_s": total,
+        "results": [dict(asdict(r), job=asdict(r.job)) for r in results],
+    }
+    (output_dir / "batch_summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    log(f"Batch finished: {passed}/{len(results)} passed in {total}s (summary: {output_dir / 'batch_summary.json'})")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run export validations for many customers in parallel.")
+    parser.add_argument("--customers-csv", type=Path, default=CUSTOMER_CSV_PATH)
+    parser.add_argument("--customer", action="append",
+                        help="Limit the batch to these customers (repeatable). Default: all in the CSV.")
+    parser.add_argument("--type", dest="types", action="append", choices=sorted(EXPORT_TYPES),
+                        help="Export type(s) to run (repeatable). Default: contact and sticket.")
+    parser.add_argument("--env", default="CERT", choices=["CERT", "PROD"])
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--output-dir", type=Path, default=BATCH_OUTPUT_DIR)
+    parser.add_argument("--no-reuse", action="store_true",
+                        help="Start a fresh browser and login for every job.")
+    parser.add_argument("--same-session", action="store_true",
+                        help="Run a customer's export types as one job: one login, polled together.")
+    args = parser.parse_args()
+
+    export_types = [EXPORT_TYPES[t] for t in (args.types or sorted(EXPORT_TYPES))]
+    if args.same_session:
+        export_types = [EXPORT_SEPARATOR.join(export_types)]
+    jobs = load_jobs_from_csv(args.customers_csv, export_types, args.env)
+    if args.customer:
+        wanted = {c.strip().lower() for c in args.customer}
+        jobs = [j for j in jobs if j.customer.lower() in wanted]
+
+    results = run_export_batch(jobs, workers=args.workers, output_dir=args.output_dir,
+                               reuse_sessions=not args.no_reuse)
+    raise SystemExit(0 if all(r.ok for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Per-page load time with the [browser] performance profile on and off.
+
+    python benchmarks/bench_browser_profile.py --config C:\\path\\config.ini [--repeat 5] [URL ...]
+
+Starts Chrome once per profile (default: the config's chrome_profile, windowed,
+"normal" page loads; performance: headless, "eager", images/fonts/third-party
+requests blocked, throwaway profile) and loads every URL `--repeat` times.
+Without URLs the [cert] login_url is used. Prints the median driver.get() time
+per page and profile; the flows themselves log the same numbers per run
+("Page loads [... profile]" at logout).
+"""
+from __future__ import annotations
+import argparse
+import statistics
+import sys
+from configparser import ConfigParser
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium import webdriver  # noqa: E402
+from selenium.webdriver.chrome.service import Service  # noqa: E402
+
+import common_path  # noqa: E402,F401 (repo root on sys.path for cozeva_common)
+from cozeva_common.browser_profile import (  # noqa: E402
+    PageLoadStats,
+    apply_profile_cdp,
+    apply_profile_options,
+    page_label,
+    timed_get,
+)
+
+
+def start_chrome(config: ConfigParser, profile: str) -> webdriver.Chrome:
+    config.set("browser", "profile", profile)
+    options = webdriver.ChromeOptions()
+    throwaway_dir = apply_profile_options(options, config)
+    if throwaway_dir is not None:
+        options.add_argument(f"--user-data-dir={throwaway_dir}")
+    elif config.has_option("path", "chrome_profile"):
+        options.add_argument(config.get("path", "chrome_profile"))
+    service = Service(executable_path=config.get("path", "chrome_driver"))
+    driver = webdriver.Chrome(service=service, options=options)
+    apply_profile_cdp(driver, config)
+    return driver
+
+
+def measure(config: ConfigParser, profile: str, urls: list[str], repeat: int) -> PageLoadStats:
+    stats = PageLoadStats(profile)
+    driver = start_chrome(config, profile)
+    try:
+        for url in urls:
+            driver.get(url)  # warm-up: DNS, TLS, HTTP cache
+            for _ in range(repeat):
+                stats.record(timed_get(driver, url))
+    finally:
+        driver.quit()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", type=Path, required=True)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("urls", nargs="*")
+    args = parser.parse_args()
+
+    config = ConfigParser(interpolation=None)
+    config.read(args.config)
+    if not config.has_section("browser"):
+        config.add_section("browser")
+    urls = args.urls or [config.get("cert", "login_url")]
+
+    results = {profile: measure(config, profile, urls, args.repeat) for profile in ("default", "performance")}
+
+    print(f"{'page':40} {'default':>10} {'performance':>12} {'speedup':>8}")
+    for url in urls:
+        label = page_label(url)
+        medians = [statistics.median(p.wall_s for p in results[profile].loads if p.label == label)
+                   for profile in ("default", "performance")]
+        print(f"{label[:40]:40} {medians[0]:>9.2f}s {medians[1]:>11.2f}s {medians[0] / medians[1]:>7.1f}x")
+    for stats in results.values():
+        print(stats.summary())
+
+
+if __name__ == "__main__":
+    main()
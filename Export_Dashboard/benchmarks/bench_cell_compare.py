@@ -0,0 +1,95 @@
+"""
+Benchmark for cell_compare: export-vs-UI comparison of a 100k x 13 matrix.
+
+    python benchmarks/bench_cell_compare.py [--rows 100000] [--mismatch-rate 0.02]
+
+Compares the columnar engine with the per-cell regex loop it replaced.
+"""
+from __future__ import annotations
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cell_compare import ColumnComparator  # noqa: E402
+
+COLUMNS = [
+    "Member CozevaID", "Measure Details", "Encounter Datetime", "Route",
+    "Encounter Details", "Encounter Note", "With Whom", "Submitter", "PCP",
+    "Practice", "Health Plan", "Campaign", "Data Source",
+]
+
+
+def make_rows(n: int, mismatch_rate: float, seed: int = 7) -> tuple[list[list[str]], list[list[str]]]:
+    rnd = random.Random(seed)
+    measures = [f"Measure {m}: Breast Cancer Screening (BCS)" for m in range(40)]
+    people = [f"Dr. Person {p}, MD" for p in range(300)]
+    practices = [f"Practice #{p} - North" for p in range(120)]
+    csv_rows, ui_rows = [], []
+    for i in range(n):
+        day = 1 + i % 28
+        row = [
+            f"{1000000 + i}", rnd.choice(measures), f"2024-03-{day:02d} 10:{i % 60:02d}:00",
+            rnd.choice(["Phone", "Fax", "Portal"]), "Outreach call", f"Left voicemail #{i % 500}",
+            rnd.choice(["Patient", "Caregiver"]), rnd.choice(people), rnd.choice(people),
+            rnd.choice(practices), rnd.choice(["HP A", "HP B", "HP C"]), f"Campaign {i % 12}", "Cozeva",
+        ]
+        ui = list(row)
+        ui[2] = f"03/{day:02d}/2024"
+        if rnd.random() < mismatch_rate:
+            ui[rnd.randrange(len(ui))] = "something else"
+        csv_rows.append(row)
+        ui_rows.append(ui)
+    return csv_rows, ui_rows
+
+
+def legacy_compare(csv_rows: list[list[str]], ui_rows: list[list[str]]) -> int:
+    """The per-cell loop used before (without its per-cell log lines)."""
+    def normalize(s: str) -> str:
+        s = str(s).strip().lower()
+        s = re.sub(r"\s+", " ", s)
+        s = re.sub(r"[\"'`.,;:()\\[\\]{}<>/\\\\-]", "", s)
+        return s
+
+    matches = 0
+    for csv_row, ui_row in zip(csv_rows, ui_rows):
+        for csv_val, ui_val in zip(csv_row, ui_row):
+            a, b = normalize(csv_val), normalize(ui_val)
+            if (not a and not b) or (b and (b in a or a in b)):
+                matches += 1
+    return matches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--mismatch-rate", type=float, default=0.02)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    csv_rows, ui_rows = make_rows(args.rows, args.mismatch_rate)
+    comparator = ColumnComparator(COLUMNS)
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        result = comparator.compare(csv_rows, ui_rows)
+        best = min(best, time.perf_counter() - started)
+    cells = result.total_cells
+    print(f"columnar: {args.rows} x {len(COLUMNS)} = {cells:,} cells in {best:.3f}s "
+          f"({cells / best / 1e6:.1f} M cells/s), mismatches={cells - result.total_matches}")
+
+    started = time.perf_counter()
+    legacy_matches = legacy_compare(csv_rows, ui_rows)
+    legacy = time.perf_counter() - started
+    print(f"legacy per-cell loop: {legacy:.3f}s ({legacy / best:.1f}x slower), "
+          f"mismatches={cells - legacy_matches}")
+    print("PASS" if best < 1.0 else "FAIL", "- target: under 1s for the columnar engine")
+
+
+if __name__ == "__main__":
+    main()
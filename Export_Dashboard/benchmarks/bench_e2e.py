@@ -0,0 +1,260 @@
+"""
+End-to-end benchmark: the real export and user-search flows, headless, against
+the local fake Cozeva (fake_cozeva.py). Needs Chrome and chromedriver.
+
+    python benchmarks/bench_e2e.py [--runs 3] [--exports contact,sticket] [--user-search]
+                                   [--chromedriver PATH] [--profile performance|default]
+                                   [--download-mode http|browser] [--readiness preloader|network_idle]
+                                   [--latency-ms 80] [--ajax-ms 400] [--export-seconds 8] [--rows 20000]
+
+Each run writes its normal report (+ .timing.json) under --workdir; the table
+printed at the end is the median wall time per stage over the successful runs,
+taken from the runs' timelines. User search runs in a child process (its modules share
+names with the export app's).
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+EXPORT_DIR = BENCH_DIR.parent
+USER_SEARCH_DIR = EXPORT_DIR.parent / "User_search"
+sys.path.insert(0, str(BENCH_DIR))
+
+from fake_cozeva import CUSTOMERS, FakeCozeva, FakeSettings  # noqa: E402
+
+CUSTOMER = CUSTOMERS[0]
+USERNAMES = ["bench.user1", "bench.user2"]
+EXPORTS = {"contact": "Contact Export", "sticket": "Sticket Export"}
+
+
+def write_config(path: Path, base_url: str, args: argparse.Namespace) -> Path:
+    """config.ini for both apps, pointed at the fake server."""
+    path.write_text(f"""
+[path]
+chrome_driver = {args.chromedriver}
+
+[browser]
+profile = {args.profile}
+
+[logging]
+console_level = WARNING
+
+[wait]
+readiness_mode = {args.readiness}
+
+[session_cache]
+enabled = {"true" if args.session_cache else "false"}
+dir = {path.parent / "session_cache"}
+
+[credentials]
+export_reason = benchmark
+user_search_reason = benchmark
+
+[cert]
+login_url = {base_url}/user/login
+logout_url = {base_url}/user/logout
+
+[export_dashboard]
+status_poll = http
+download_mode = {args.download_mode}
+poll_min_s = 0.5
+poll_max_s = 5
+
+[run_history]
+path = {path.parent / "run_history.sqlite"}
+
+[user_list]
+list_url = {base_url}/user_list
+
+[batch_list]
+batch_url = {base_url}/batch_list
+
+[delete_data]
+supporttool_url = {base_url}/support_tool
+
+[UserListLocator]
+xpath_userlist_filter = //a[@id='userlist_filter']
+xpath_customername = //input[@id='customer_name']
+
+[BatchListLocator]
+xpath_batch_menu = //a[@id='batch_menu']
+xpath_batch_share = //a[@id='batch_share']
+xpath_batch_search = //input[@id='batch_search']
+
+[SupportToolLocator]
+xpath_deletetest_data = //a[@id='deletetest_data']
+xpath_masq_checkbox = //input[@id='masq_checkbox']
+xpath_deletedata_user = //input[@id='deletedata_user']
+""", encoding="utf-8")
+    return path
+
+
+def _stage_times(timeline, wall_s: float) -> dict[str, float]:
+    """Seconds per stage, plus Chrome startup (a step before the first stage) and the total."""
+    out = {name: ms / 1000 for name, ms in timeline.stage_totals().items()}
+    chrome = sum(max(s.dur_ms, 0.0) for s in timeline.spans if s.name == "chrome_start")
+    out = {"chrome_start": chrome / 1000, **out}
+    out["total"] = wall_s
+    return out
+
+
+# ─── Export flow (in process) ──────────────────────────────────
+def run_exports(config: Path, workdir: Path, kinds: list[str], runs: int) -> dict[str, list[dict]]:
+    sys.path.insert(0, str(EXPORT_DIR))
+    os.environ.setdefault("CS2User", "bench")
+    os.environ.setdefault("CS2Password", "bench")
+    import Export_Functionality as ef
+
+    ef.CONFIG_FILE_PATH = config
+    results: dict[str, list[dict]] = {EXPORTS[k]: [] for k in kinds}
+    for n in range(runs):
+        for kind in kinds:
+            selected = EXPORTS[kind]
+            run = ef.RunContext(report_path=workdir / f"{kind}_{n + 1}.html",
+                                download_dir=workdir / "downloads" / f"{kind}_{n + 1}",
+                                label=f"bench {kind} {n + 1}", customer=CUSTOMER)
+            started = time.perf_counter()
+            error = None
+            with ef.bind_run(run):
+                try:
+                    ef.execute_export_job(CUSTOMER, selected, "CERT", ef.ConsoleProgress(ef.EXPORT_FLOW_STEPS))
+                except Exception as e:
+                    error = e
+                finally:
+                    run.log.close()
+            times = _stage_times(run.timeline, time.perf_counter() - started)
+            if error is None:
+                results[selected].append(times)
+            status = f"FAILED ({error})" if error else "ok"
+            print(f"{selected} run {n + 1}: {times['total']:.1f}s {status}", flush=True)
+    return results
+
+
+# ─── User search (child process) ───────────────────────────────
+class _QuietProgress:
+    """ProgressWindow stand-in without Tk (the flows only call update/complete)."""
+
+    def update(self, message: str) -> None:
+        pass
+
+    def complete(self) -> None:
+        pass
+
+
+def user_search_worker(config: Path, runs: int) -> None:
+    """Runs in the child process (cwd = workdir); prints one JSON line of stage times per run."""
+    sys.path.insert(0, str(USER_SEARCH_DIR))
+    os.environ.setdefault("CS2User", "bench")
+    os.environ.setdefault("CS2Password", "bench")
+    import user_validation_runner as uvr
+
+    uvr.CONFIG_FILE_PATH = config
+    for _ in range(runs):
+        uvr.start_run_log(CUSTOMER)
+        progress = _QuietProgress()
+        started = time.perf_counter()
+        error = ""
+        try:
+            uvr.set_stage("login")
+            runner = uvr.open_user_search_session("CERT", CUSTOMER, progress)
+            search = uvr.user_search(runner.driver, runner.config)
+            search.readiness_stats = runner.readiness_stats
+            search.page_loads = runner.page_loads
+            for area, action in (
+                ("User List", lambda: search.users_list(CUSTOMER, progress, USERNAMES)),
+                ("Batch Share", lambda: search.batch_share(CUSTOMER, progress, USERNAMES[0])),
+                ("Delete Testing Data", lambda: search.deletetestingdata_search(CUSTOMER, progress, USERNAMES)),
+            ):
+                uvr.set_stage(area)
+                action()
+            runner.logout(progress, CUSTOMER)
+        except Exception as e:
+            error = str(e)
+        times = _stage_times(uvr._timeline, time.perf_counter() - started)
+        print(json.dumps({"times": times, "error": error}), flush=True)
+
+
+def run_user_search(config: Path, workdir: Path, runs: int) -> list[dict]:
+    proc = subprocess.run([sys.executable, __file__, "--user-search-worker", str(config), "--runs", str(runs)],
+                          cwd=workdir, capture_output=True, text=True)
+    results = []
+    for line in proc.stdout.splitlines():
+        if line.startswith("{"):
+            payload = json.loads(line)
+            if not payload["error"]:
+                results.append(payload["times"])
+            status = f"FAILED ({payload['error']})" if payload["error"] else "ok"
+            print(f"User Search run: {payload['times']['total']:.1f}s {status}")
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:], file=sys.stderr)
+    return results
+
+
+def print_table(flow: str, runs: list[dict]) -> None:
+    if not runs:
+        return
+    stages = list(dict.fromkeys(name for r in runs for name in r if name != "total")) + ["total"]
+    print(f"\n{flow} ({len(runs)} runs)")
+    print(f"  {'stage':24} {'median':>8} {'min':>8} {'max':>8}")
+    for stage in stages:
+        values = [r.get(stage, 0.0) for r in runs]
+        print(f"  {stage:24} {statistics.median(values):>7.2f}s {min(values):>7.2f}s {max(values):>7.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--exports", default="contact,sticket", help="comma list of contact, sticket (or none)")
+    parser.add_argument("--user-search", action="store_true")
+    parser.add_argument("--chromedriver", default=os.environ.get("CHROMEDRIVER", "chromedriver"))
+    parser.add_argument("--profile", default="performance", choices=["performance", "default"])
+    parser.add_argument("--download-mode", default="http", choices=["http", "browser"])
+    parser.add_argument("--readiness", default="network_idle", choices=["preloader", "network_idle"])
+    parser.add_argument("--session-cache", action="store_true", help="resume saved sessions after the 1st login")
+    parser.add_argument("--latency-ms", type=float, default=FakeSettings.latency_ms)
+    parser.add_argument("--ajax-ms", type=float, default=FakeSettings.ajax_ms)
+    parser.add_argument("--export-seconds", type=float, default=FakeSettings.export_seconds)
+    parser.add_argument("--rows", type=int, default=FakeSettings.rows)
+    parser.add_argument("--workdir", type=Path, default=None)
+    parser.add_argument("--user-search-worker", type=Path, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.user_search_worker is not None:
+        user_search_worker(args.user_search_worker, args.runs)
+        return
+
+    if args.session_cache and not os.environ.get("COZEVA_SESSION_KEY") and sys.platform != "win32":
+        from cryptography.fernet import Fernet
+        os.environ["COZEVA_SESSION_KEY"] = Fernet.generate_key().decode("ascii")  # throwaway, this run only
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="cozeva_e2e_"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    fake = FakeCozeva(FakeSettings(latency_ms=args.latency_ms, ajax_ms=args.ajax_ms,
+                                   export_seconds=args.export_seconds, rows=args.rows)).start()
+    config = write_config(workdir / "config.ini", fake.base_url, args)
+    print(f"fake Cozeva on {fake.base_url}; reports in {workdir}")
+    try:
+        kinds = [k.strip() for k in args.exports.split(",") if k.strip() in EXPORTS]
+        export_results = run_exports(config, workdir, kinds, args.runs) if kinds else {}
+        user_results = run_user_search(config, workdir, args.runs) if args.user_search else []
+    finally:
+        fake.stop()
+
+    print(f"\nprofile={args.profile} download={args.download_mode} readiness={args.readiness} "
+          f"latency={args.latency_ms:.0f}ms ajax={args.ajax_ms:.0f}ms export={args.export_seconds:.0f}s "
+          f"rows={args.rows:,}")
+    for flow, runs in export_results.items():
+        print_table(flow, runs)
+    print_table("User Search", user_results)
+
+
+if __name__ == "__main__":
+    main()
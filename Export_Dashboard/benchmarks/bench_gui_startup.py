@@ -0,0 +1,96 @@
+"""
+Time from process start to the first window of each GUI, and which heavy
+modules were already imported by then. Needs a display (on Linux without one:
+xvfb-run python benchmarks/bench_gui_startup.py).
+
+    python benchmarks/bench_gui_startup.py [--repeat 5] [--budget-ms 200] [SCRIPT ...]
+
+Each run is a fresh interpreter (cold imports) started in the script's folder.
+The probe replaces Tk.mainloop: the window is drawn once (update()), the time
+is taken and the process exits, so neither the logo load nor the browser
+warm-up (both scheduled after the first frame) is started.
+Without SCRIPT, both Export_DashboardUI.py and "User_search/User search.py" are measured.
+"""
+from __future__ import annotations
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+EXPORT_DIR = BENCH_DIR.parent
+DEFAULT_SCRIPTS = [EXPORT_DIR / "Export_DashboardUI.py", EXPORT_DIR.parent / "User_search" / "User search.py"]
+HEAVY_MODULES = ("selenium", "openpyxl", "PIL", "urllib3")
+DEFAULT_BUDGET_MS = 200.0
+
+
+def probe(script: Path) -> None:
+    """Runs in the child process: start `script` and report its first frame."""
+    import os
+    import runpy
+    import tkinter
+
+    def first_frame(self, n: int = 0) -> None:
+        self.update()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        heavy = sorted({m.split(".")[0] for m in sys.modules if m.split(".")[0] in HEAVY_MODULES})
+        print(json.dumps({"first_window_ms": elapsed_ms, "heavy_modules": heavy}), flush=True)
+        os._exit(0)
+
+    tkinter.Misc.mainloop = first_frame
+    sys.path.insert(0, str(script.parent))
+    started = time.perf_counter()
+    runpy.run_path(str(script), run_name="__main__")
+    print(json.dumps({"error": "mainloop was never reached"}), flush=True)
+
+
+def measure(script: Path, repeat: int) -> list[dict]:
+    runs = []
+    for _ in range(repeat):
+        launched = time.perf_counter()
+        proc = subprocess.run([sys.executable, __file__, "--probe", str(script)],
+                              cwd=script.parent, capture_output=True, text=True, timeout=60)
+        wall_ms = (time.perf_counter() - launched) * 1000
+        lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+        if not lines:
+            raise RuntimeError(f"{script.name}: no result\n{proc.stderr[-1500:]}")
+        result = json.loads(lines[-1])
+        if "error" in result:
+            raise RuntimeError(f"{script.name}: {result['error']}")
+        result["process_ms"] = wall_ms  # includes interpreter startup
+        runs.append(result)
+    return runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="exit 1 if a median first-window time is above this")
+    parser.add_argument("--probe", type=Path, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("scripts", nargs="*", type=Path)
+    args = parser.parse_args()
+
+    if args.probe is not None:
+        probe(args.probe.resolve())
+        return
+
+    over_budget = False
+    print(f"{'GUI':28} {'first window':>13} {'process':>9}  heavy modules loaded by then")
+    for script in [s.resolve() for s in args.scripts] or DEFAULT_SCRIPTS:
+        runs = measure(script, args.repeat)
+        first = statistics.median(r["first_window_ms"] for r in runs)
+        process = statistics.median(r["process_ms"] for r in runs)
+        heavy = sorted({m for r in runs for m in r["heavy_modules"]})
+        over_budget |= first > args.budget_ms
+        print(f"{script.name[:28]:28} {first:>11.0f}ms {process:>7.0f}ms  {', '.join(heavy) or '-'}")
+    print(f"(median of {args.repeat}; first window = GUI script start to first frame, budget "
+          f"{args.budget_ms:.0f}ms; process = whole child run incl. interpreter start)")
+    raise SystemExit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
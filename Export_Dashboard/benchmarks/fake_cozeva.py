@@ -0,0 +1,530 @@
+"""
+Local stand-in for Cozeva CERT/PROD: just enough pages and endpoints, with the
+DOM ids/classes/XPaths the export and user-search scripts use, to run their real
+flows against it (see bench_e2e.py).
+
+    python benchmarks/fake_cozeva.py [--port 8765] [--latency-ms 80] [--ajax-ms 400]
+                                     [--export-seconds 8] [--rows 20000]
+
+Covered: login form (edit-name / edit-pass / edit-submit), customer selection
+(select-customer, reason_textbox), registries page with sidenav, contact and
+sticket log tabs with their datatables, bulk "Export all to CSV" + YES, the
+export dashboard (status-info progress, unified_file_download CSV with Range
+support) and the user-search pages with autocomplete dropdowns (User List,
+Batch Share, Support Tool / Delete Testing Data). Analytics, Support Ticket,
+Case Management and Secure Messaging are not modelled.
+
+Latency: every response waits --latency-ms (+- --jitter-ms); pages show the
+ajax_preloader for --ajax-ms after load and after each filter/tab action;
+exports climb to 100% over --export-seconds.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import hashlib
+import html
+import io
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+CUSTOMERS = ["Acme Health Partners", "Blue River Medical Group", "Cozeva Demo Customer"]
+USER_NAMES = ["Aritra Mukherjee", "Avijit CozevaQA", "Dana Whitfield", "Lee Ortega", "Priya Raman"]
+
+PHI_HEADERS = ["Patient", "DOB", "Member ID", "Member Phone #", "Member UID", "Searchable Member ID",
+               "Member FName", "Member LName", "Gender"]
+CONTACT_HEADERS = (["Member CozevaID"] + PHI_HEADERS
+                   + ["Measure Details", "Encounter Datetime", "Route", "Encounter Details", "Encounter Note",
+                      "With Whom", "Submitter", "PCP", "Practice", "Health Plan", "Campaign", "Data Source"])
+STICKET_HEADERS = (["Member CozevaID"] + PHI_HEADERS
+                   + ["Created", "Last Updated", "Created by", "Last Updated by", "PCP", "Latest Note",
+                      "Health Plan", "Status"])
+# the UI tables show the member as a patient_detail link and some columns under other names
+CONTACT_UI_HEADERS = ["Patient", "Measure Details", "Encounter Date", "Route", "Encounter Details",
+                      "Encounter Note", "With Whom", "Submitter", "PCP", "Practice", "Health Plan", "Campaign",
+                      "Data Source"]
+STICKET_UI_HEADERS = ["Patient", "Created", "Last Updated", "Created by", "Last Updated by", "PCP",
+                      "Latest Note", "Health Plan"]
+UI_ROWS = 25
+
+
+@dataclass
+class FakeSettings:
+    latency_ms: float = 80.0
+    jitter_ms: float = 20.0
+    ajax_ms: float = 400.0
+    export_seconds: float = 8.0
+    rows: int = 20000
+
+
+@dataclass
+class _Export:
+    id: int
+    kind: str            # "contact" | "sticket"
+    customer: str
+    started: float
+    rows: int
+
+
+@dataclass
+class _Session:
+    user: str
+    customer: str = ""
+    exports: list[_Export] = field(default_factory=list)
+
+
+# ─── Data (deterministic; the UI tables show the first rows of the export) ───
+def contact_row(i: int) -> dict[str, str]:
+    row = {h: f"{h.lower().replace(' ', '_')}-{i}" for h in PHI_HEADERS}
+    row.update({
+        "Member CozevaID": str(1000000 + i),
+        "Measure Details": f"Measure {i % 40}",
+        "Encounter Datetime": f"03/{1 + i % 28:02d}/2024 10:{i % 60:02d}",
+        "Route": ("Phone", "Portal", "Mail")[i % 3],
+        "Encounter Details": "Outreach call",
+        "Encounter Note": f"Left voicemail #{i % 500}",
+        "With Whom": "Patient",
+        "Submitter": f"Dr Person {i % 300}",
+        "PCP": f"Dr Person {(i * 7) % 300}",
+        "Practice": f"Practice {i % 120} North",
+        "Health Plan": ("HP A", "HP B")[i % 2],
+        "Campaign": f"Campaign {i % 12}",
+        "Data Source": "Cozeva",
+    })
+    return row
+
+
+def sticket_row(i: int) -> dict[str, str]:
+    row = {h: f"{h.lower().replace(' ', '_')}-{i}" for h in PHI_HEADERS}
+    row.update({
+        "Member CozevaID": str(2000000 + i),
+        "Created": f"02/{1 + i % 28:02d}/2024 09:{i % 60:02d}",
+        "Last Updated": f"03/{1 + i % 28:02d}/2024 11:{i % 60:02d}",
+        "Created by": f"Agent {i % 17}",
+        "Last Updated by": f"Agent {(i + 3) % 17}",
+        "PCP": f"Dr Person {(i * 7) % 300}",
+        "Latest Note": f"Called, left message {i}" if i % 10 else f"Follow up\non {i}",
+        "Health Plan": ("HP A", "HP B")[i % 2],
+        "Status": ("Open", "Closed")[i % 2],
+    })
+    return row
+
+
+def export_csv(kind: str, rows: int) -> bytes:
+    headers, make = (CONTACT_HEADERS, contact_row) if kind == "contact" else (STICKET_HEADERS, sticket_row)
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\r\n")
+    writer.writerow(headers)
+    for i in range(rows):
+        row = make(i)
+        writer.writerow([row[h] for h in headers])
+    return out.getvalue().encode("utf-8")
+
+
+def _ui_table(kind: str) -> str:
+    if kind == "contact":
+        headers, make, ui = CONTACT_UI_HEADERS, contact_row, {"Encounter Date": "Encounter Datetime"}
+    else:
+        headers, make, ui = STICKET_UI_HEADERS, sticket_row, {}
+    body = []
+    for i in range(UI_ROWS):
+        row = make(i)
+        cells = [f"<td><a href='/patient_detail/{row['Member CozevaID']}?tab=care'>{html.escape(row['Patient'])}</a></td>"]
+        cells += [f"<td>{html.escape(row[ui.get(h, h)])}</td>" for h in headers[1:]]
+        body.append(f"<tr role='row' class='{'odd' if i % 2 == 0 else 'even'}'>{''.join(cells)}</tr>")
+    head = "".join(f"<th>{html.escape(h)}</th>" for h in headers)
+    return (f"<table id='{kind}_log' class='datatable'><thead><tr>{head}</tr></thead>"
+            f"<tbody>{''.join(body)}</tbody></table>")
+
+
+# ─── Pages ─────────────────────────────────────────────────────
+_BASE_JS = r"""
+var AJAX_MS = %(ajax_ms)d;
+function busy(ms) {
+  var p = document.getElementById('ajax_preloader');
+  p.style.display = 'block';
+  setTimeout(function () { p.style.display = 'none'; }, ms === undefined ? AJAX_MS : ms);
+}
+function toggle(id) { var el = document.getElementById(id); el.style.display = el.style.display === 'block' ? 'none' : 'block'; }
+function show(id) { document.getElementById(id).style.display = 'block'; }
+function hide(id) { document.getElementById(id).style.display = 'none'; }
+function acBind(inputId, ulId, fmt) {
+  var input = document.getElementById(inputId), ul = document.getElementById(ulId), timer = null;
+  input.addEventListener('input', function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () {
+      fetch('/api/users?q=' + encodeURIComponent(input.value)).then(function (r) { return r.json(); })
+        .then(function (users) {
+          ul.innerHTML = users.map(fmt).join('');
+          ul.style.display = users.length ? 'block' : 'none';
+        });
+    }, 150);
+  });
+}
+window.addEventListener('load', function () { busy(); });
+"""
+
+_STYLE = """
+<style>
+  body{font-family:Arial,sans-serif;margin:0}
+  .ajax_preloader{position:fixed;inset:0;background:rgba(255,255,255,.6);display:block;pointer-events:none}
+  nav{padding:8px;background:#2f6f17;color:#fff}
+  nav a{color:#fff;margin-right:12px;cursor:pointer}
+  .panel{display:none;border:1px solid #ccc;padding:8px;margin:8px}
+  ul.dropdown-content{list-style:none;padding:0;margin:0;border:1px solid #ccc;display:none}
+  ul.dropdown-content li{padding:4px 8px;cursor:pointer}
+  td,th{border:1px solid #ddd;padding:3px 6px}
+</style>
+"""
+
+
+def page(title: str, body: str, settings: FakeSettings, script: str = "") -> str:
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>{_STYLE}"
+            f"</head><body><div id='ajax_preloader' class='ajax_preloader'></div>{body}"
+            f"<script>{_BASE_JS % {'ajax_ms': settings.ajax_ms}}{script}</script></body></html>")
+
+
+def login_page(settings: FakeSettings) -> str:
+    return page("Log in", """
+<form method="post" action="/user/login">
+  <input id="edit-name" name="name" type="text">
+  <input id="edit-pass" name="pass" type="password">
+  <input id="edit-submit" type="submit" value="Log in">
+</form>""", settings)
+
+
+def customer_page(settings: FakeSettings) -> str:
+    items = "".join(f"<li onclick=\"pick(this)\">{html.escape(c)}</li>" for c in CUSTOMERS)
+    return page("Select customer", f"""
+<div id="select-customer" onclick="show('customer-list')">Select customer</div>
+<ul id="customer-list" class="dropdown-content">{items}</ul>
+<form method="post" action="/customer_select">
+  <input type="hidden" id="customer" name="customer">
+  <textarea id="reason_textbox" name="reason"></textarea>
+  <input id="edit-submit" type="submit" value="Continue">
+</form>""", settings, """
+function pick(li) {
+  document.getElementById('customer').value = li.textContent;
+  document.getElementById('select-customer').textContent = li.textContent;
+  hide('customer-list');
+}""")
+
+
+def registries_page(settings: FakeSettings, session: _Session) -> str:
+    return page("Registries", f"""
+<nav><a data-target="sidenav_slide_out" onclick="toggle('sidenav_slide_out')">&#9776;</a>
+  <span>{html.escape(session.customer)}</span></nav>
+<ul id="sidenav_slide_out" class="panel">
+  <li><a id="data_validate" href="/export_dashboard" target="_blank">Export Dashboard</a></li>
+</ul>
+<div><a id="contact_log_tab" href="#" onclick="tab('contact');return false;">Contact Log</a>
+     <a id="sticket_log_tab" href="#" onclick="tab('sticket');return false;">Sticket Log</a></div>
+<div id="contact_section" class="panel">
+  <a data-target="datatable_bulk_filter_0_contact_log" onclick="bulk('contact')">&#8942;</a>
+  {_ui_table("contact")}
+</div>
+<div id="sticket_section" class="panel">
+  <a data-target="datatable_bulk_filter_0_sticket_log" onclick="bulk('sticket')">&#8942;</a>
+  {_ui_table("sticket")}
+</div>
+<ul id="bulk_menu" class="dropdown-content"><li><a onclick="show('confirm')">Export all to CSV</a></li></ul>
+<div id="confirm" class="panel">Export all rows? <a onclick="startExport()">YES</a> <a onclick="hide('confirm')">NO</a></div>
+""", settings, """
+var pending = null;
+function tab(kind) {
+  sessionStorage.setItem('tab', kind);
+  hide(kind === 'contact' ? 'sticket_section' : 'contact_section');
+  show(kind + '_section');
+  busy();
+}
+function bulk(kind) { pending = kind; toggle('bulk_menu'); }
+function startExport() {
+  hide('confirm'); hide('bulk_menu');
+  fetch('/api/export', {method: 'POST', headers: {'Content-Type': 'application/json'},
+                        body: JSON.stringify({type: pending})});
+}
+show((sessionStorage.getItem('tab') || 'contact') + '_section');
+""")
+
+
+def dashboard_page(settings: FakeSettings, session: _Session) -> str:
+    rows = []
+    now = time.time()
+    for n, exp in enumerate(reversed(session.exports)):
+        percent = min(100, int((now - exp.started) / max(settings.export_seconds, 0.001) * 100))
+        status = "Success" if percent >= 100 else "In Progress"
+        link = f"<a href='/unified_file_download?id={exp.id}'>Download</a>" if percent >= 100 else ""
+        label = "Contact Export" if exp.kind == "contact" else "Sticket Export"
+        rows.append(
+            f"<tr role='row' class='{'odd' if n % 2 == 0 else 'even'}'><td>{exp.id}</td>"
+            f"<td class='export-dashboard-row export-dashboard-row_pt'>{html.escape(session.user)}</td>"
+            f"<td class='export-dashboard-row export-dashboard-row_pt'>"
+            f"{time.strftime('%m/%d/%Y %H:%M', time.localtime(exp.started))}</td>"
+            f"<td>{html.escape(exp.customer)}</td>"
+            f"<td class='export-dashboard-row export-dashboard-row_pt'>{label}</td>"
+            f"<td><div class='status-info'><div>Export</div><div>{status}</div><div>{percent}%</div></div></td>"
+            f"<td>{link}</td></tr>")
+    return page("Export Dashboard", f"""
+<table id="export_dashboard"><thead><tr><th>ID</th><th>User</th><th>Requested</th><th>Customer</th>
+<th>Export</th><th>Status</th><th>File</th></tr></thead><tbody>{''.join(rows)}</tbody></table>""", settings)
+
+
+def _autocomplete(input_id: str, ul_id: str, fmt_js: str, attrs: str = "") -> tuple[str, str]:
+    """An input whose typing fills <ul id=ul_id> from /api/users (markup, script)."""
+    return (f"<input id='{input_id}' type='text' {attrs}><ul id='{ul_id}' class='dropdown-content'></ul>",
+            f"acBind({input_id!r}, {ul_id!r}, {fmt_js});")
+
+
+def user_list_page(settings: FakeSettings) -> str:
+    options = "".join(f"<li onclick=\"pickCustomer(this)\"><span>{html.escape(c)}</span></li>" for c in CUSTOMERS)
+    return page("User List", f"""
+<a id="userlist_filter" onclick="toggle('filter_panel')">Filter</a>
+<div id="filter_panel" class="panel">
+  <input id="customer_name" class="select-dropdown" readonly value="Select customer" onclick="show('customer_options')">
+  <ul id="customer_options" class="select-dropdown dropdown-content">{options}</ul>
+  <input name="search_people" type="text">
+  <a class="btn datatable_apply" onclick="apply()">Apply</a>
+</div>
+<table id="user_list"><thead><tr><th>Username</th><th>Name</th></tr></thead><tbody id="user_rows"></tbody></table>
+""", settings, """
+function pickCustomer(li) { document.getElementById('customer_name').value = li.textContent; hide('customer_options'); }
+function apply() {
+  var q = document.getElementsByName('search_people')[0].value;
+  hide('filter_panel'); busy();
+  fetch('/api/users?q=' + encodeURIComponent(q)).then(function (r) { return r.json(); }).then(function (users) {
+    document.getElementById('user_rows').innerHTML = users.slice(0, 1).map(function (u) {
+      return "<tr role='row' class='odd'><td class='username username_pt sorting_1'>" + u.username +
+             "</td><td>" + u.name + "</td></tr>"; }).join('');
+  });
+}""")
+
+
+def batch_list_page(settings: FakeSettings) -> str:
+    body, script = _autocomplete("batch_search", "ac-dropdown-share-with",
+                                 "function (u) { return '<li><b>' + u.username + '</b> ' + u.name + '</li>'; }")
+    return page("Batch List", f"""
+<a id="batch_menu" onclick="toggle('batch_actions')">&#8942;</a>
+<ul id="batch_actions" class="dropdown-content"><li><a id="batch_share" onclick="show('share_modal')">Share</a></li></ul>
+<div id="share_modal" class="panel">{body}</div>""", settings, script)
+
+
+def support_tool_page(settings: FakeSettings) -> str:
+    body, script = _autocomplete("deletedata_user", "ac-dropdown-logged_or_masquaraded_user_name",
+                                 "function (u) { return '<li>' + u.username + ' | ' + u.name + '</li>'; }")
+    return page("Support Tool", f"""
+<a id="deletetest_data" onclick="show('delete_panel')">Delete testing data</a>
+<div id="delete_panel" class="panel">
+  <label><input id="masq_checkbox" type="checkbox"> Logged in or masqueraded user</label>
+  {body}
+</div>""", settings, script)
+
+
+# ─── Server ────────────────────────────────────────────────────
+class FakeCozeva:
+    """The fake site's state; serve() / start() run it on 127.0.0.1."""
+
+    def __init__(self, settings: Optional[FakeSettings] = None) -> None:
+        self.settings = settings or FakeSettings()
+        self.sessions: dict[str, _Session] = {}
+        self.lock = threading.Lock()
+        self._next_export = 1
+        self._csv_cache: dict[tuple[str, int], bytes] = {}
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, port: int = 0) -> "FakeCozeva":
+        fake = self
+
+        class Handler(_Handler):
+            site = fake
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="fake-cozeva", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def csv_for(self, exp: _Export) -> bytes:
+        key = (exp.kind, exp.rows)
+        with self.lock:
+            data = self._csv_cache.get(key)
+        if data is None:
+            data = export_csv(exp.kind, exp.rows)
+            with self.lock:
+                self._csv_cache[key] = data
+        return data
+
+    def new_export(self, session: _Session, kind: str) -> _Export:
+        with self.lock:
+            exp = _Export(self._next_export, kind, session.customer, time.time(), self.settings.rows)
+            self._next_export += 1
+            session.exports.append(exp)
+        return exp
+
+    def find_export(self, session: _Session, export_id: int) -> Optional[_Export]:
+        return next((e for e in session.exports if e.id == export_id), None)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    site: FakeCozeva
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args) -> None:  # quiet
+        pass
+
+    # helpers
+    def _delay(self) -> None:
+        s = self.site.settings
+        delay = s.latency_ms + random.uniform(-s.jitter_ms, s.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def _session(self) -> Optional[_Session]:
+        match = re.search(r"(?:^|;\s*)SESSfake=([^;]+)", self.headers.get("Cookie") or "")
+        return self.site.sessions.get(match.group(1)) if match else None
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8",
+              headers: Optional[dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _html(self, text: str) -> None:
+        self._send(200, text.encode("utf-8"))
+
+    def _redirect(self, location: str, cookie: Optional[str] = None) -> None:
+        headers = {"Location": location}
+        if cookie is not None:
+            headers["Set-Cookie"] = cookie
+        self._send(303, b"", headers=headers)
+
+    def _form(self) -> dict[str, str]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8") if length else ""
+        if "json" in (self.headers.get("Content-Type") or ""):
+            return json.loads(raw or "{}")
+        return {k: v[0] for k, v in parse_qs(raw).items()}
+
+    # routes
+    def do_GET(self) -> None:
+        self._delay()
+        url = urlsplit(self.path)
+        path, query = url.path.rstrip("/") or "/", parse_qs(url.query)
+        settings = self.site.settings
+        if path == "/user/login":
+            return self._html(login_page(settings))
+        if path == "/user/logout":
+            match = re.search(r"SESSfake=([^;]+)", self.headers.get("Cookie") or "")
+            if match:
+                self.site.sessions.pop(match.group(1), None)
+            return self._redirect("/user/login", "SESSfake=; Path=/; Max-Age=0")
+        if path == "/favicon.ico":
+            return self._send(404, b"")
+
+        session = self._session()
+        if session is None:
+            return self._redirect("/user/login")
+        if path == "/customer_select":
+            return self._html(customer_page(settings))
+        if not session.customer:
+            return self._redirect("/customer_select")
+        if path in ("/", "/registries"):
+            return self._html(registries_page(settings, session))
+        if path == "/export_dashboard":
+            return self._html(dashboard_page(settings, session))
+        if path == "/unified_file_download":
+            return self._download(session, int((query.get("id") or ["0"])[0]))
+        if path == "/api/users":
+            q = (query.get("q") or [""])[0].strip()
+            users = [{"username": q, "name": "Matched User"}] if q else []
+            users += [{"username": n.split()[0].lower() + str(i), "name": n}
+                      for i, n in enumerate(USER_NAMES) if q and q.lower() in n.lower()]
+            return self._send(200, json.dumps(users).encode("utf-8"), "application/json")
+        pages = {"/user_list": user_list_page, "/batch_list": batch_list_page, "/support_tool": support_tool_page}
+        if path in pages:
+            return self._html(pages[path](settings))
+        self._send(404, b"not found", "text/plain")
+
+    def do_HEAD(self) -> None:
+        self.do_GET()
+
+    def do_POST(self) -> None:
+        self._delay()
+        path = urlsplit(self.path).path.rstrip("/")
+        form = self._form()
+        if path == "/user/login":
+            if not form.get("name") or not form.get("pass"):
+                return self._html(login_page(self.site.settings))
+            token = secrets.token_hex(16)
+            self.site.sessions[token] = _Session(user=form["name"])
+            return self._redirect("/customer_select", f"SESSfake={token}; Path=/; HttpOnly")
+        session = self._session()
+        if session is None:
+            return self._redirect("/user/login")
+        if path == "/customer_select":
+            if form.get("customer") not in CUSTOMERS:
+                return self._html(customer_page(self.site.settings))
+            session.customer = form["customer"]
+            return self._redirect("/registries")
+        if path == "/api/export":
+            exp = self.site.new_export(session, "sticket" if form.get("type") == "sticket" else "contact")
+            return self._send(200, json.dumps({"id": exp.id}).encode("utf-8"), "application/json")
+        self._send(404, b"not found", "text/plain")
+
+    def _download(self, session: _Session, export_id: int) -> None:
+        exp = self.site.find_export(session, export_id)
+        if exp is None:
+            return self._send(404, b"no such export", "text/plain")
+        data = self.site.csv_for(exp)
+        etag = '"' + hashlib.sha1(data).hexdigest()[:16] + '"'
+        headers = {"Content-Disposition": f'attachment; filename="{exp.kind}_export_{exp.id}.csv"',
+                   "ETag": etag, "Accept-Ranges": "bytes"}
+        match = re.match(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        if match and self.headers.get("If-Range", etag) == etag:
+            start = int(match.group(1))
+            headers["Content-Range"] = f"bytes {start}-{len(data) - 1}/{len(data)}"
+            return self._send(206, data[start:], "text/csv", headers)
+        self._send(200, data, "text/csv", headers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=FakeSettings.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=FakeSettings.jitter_ms)
+    parser.add_argument("--ajax-ms", type=float, default=FakeSettings.ajax_ms)
+    parser.add_argument("--export-seconds", type=float, default=FakeSettings.export_seconds)
+    parser.add_argument("--rows", type=int, default=FakeSettings.rows)
+    args = parser.parse_args()
+    fake = FakeCozeva(FakeSettings(args.latency_ms, args.jitter_ms, args.ajax_ms, args.export_seconds, args.rows))
+    fake.start(args.port)
+    print(f"fake Cozeva on {fake.base_url} (login: {fake.base_url}/user/login); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
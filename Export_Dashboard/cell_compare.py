@@ -0,0 +1,216 @@
+from __future__ import annotations
+import operator
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Optional, Sequence
+
+# Columnar export-vs-UI comparison. Each column is normalized once per distinct
+# value (exports repeat the same values a lot), compared with == in a single
+# map() over the column, and only the differing cells go through the column's
+# matcher. The result is one byte per cell.
+
+_PUNCTUATION = "\"'`.,;:()[]{}<>/\\-"
+_DROP_PUNCTUATION = str.maketrans("", "", _PUNCTUATION)
+_NUMBER_NOISE = str.maketrans("", "", "$,% ")
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%Y/%m/%d", "%m-%d-%Y")
+MAX_LOGGED_MISMATCHES = 20  # individual ❌ cell lines per comparison; the rest only counted
+
+
+def normalize_cell(s: str) -> str:
+    """Lower-case, collapse whitespace, drop punctuation."""
+    if not s:
+        return ""
+    if s.isalnum():  # ids, plain words: nothing to collapse or drop
+        return s.lower()
+    return " ".join((s or "").lower().split()).translate(_DROP_PUNCTUATION)
+
+
+@lru_cache(maxsize=65536)
+def _parse_date(token: str) -> str:
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(token, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return normalize_cell(token)
+
+
+def date_key(s: str) -> str:
+    """Date part of a date/datetime cell as YYYY-MM-DD, so UI and export formats line up."""
+    return _parse_date((s or "").strip().split(" ", 1)[0])
+
+
+def _number(s: str) -> Optional[float]:
+    try:
+        return float((s or "").translate(_NUMBER_NOISE))
+    except ValueError:
+        return None
+
+
+class Matcher:
+    """
+    Compares two columns cell by cell. Subclasses set `normalize` (applied once per
+    distinct value) and `equal` (called on normalized values). `equal` must accept
+    equal values, so it only runs on the cells that differ after normalization.
+    """
+
+    name = "exact"
+    normalize = staticmethod(normalize_cell)
+
+    def equal(self, csv_value, ui_value) -> bool:
+        return csv_value == ui_value
+
+    def _normalized(self, column: Sequence[str]) -> list:
+        distinct = list(set(column))
+        mapping = dict(zip(distinct, map(self.normalize, distinct)))
+        return list(map(mapping.__getitem__, column))
+
+    def compare(self, csv_column: Sequence[str], ui_column: Sequence[str]) -> bytearray:
+        csv_norm = self._normalized(csv_column)
+        ui_norm = self._normalized(ui_column)
+        result = bytearray(map(operator.eq, csv_norm, ui_norm))
+        i = result.find(0)
+        while i != -1:
+            result[i] = self.equal(csv_norm[i], ui_norm[i])
+            i = result.find(0, i + 1)
+        return result
+
+
+class ExactMatcher(Matcher):
+    name = "exact"
+
+
+class SubstringMatcher(Matcher):
+    """Blank matches blank; otherwise one normalized value must contain the other."""
+
+    name = "substring"
+
+    def equal(self, csv_value: str, ui_value: str) -> bool:
+        if not ui_value:
+            return not csv_value
+        return ui_value in csv_value or csv_value in ui_value
+
+
+class DateMatcher(Matcher):
+    """Same calendar date, whatever the format; a time part is ignored."""
+
+    name = "date"
+    normalize = staticmethod(date_key)
+
+
+class NumericMatcher(Matcher):
+    """Numbers equal within `abs_tol` (ignores $ , % and spaces); non-numbers compare as text."""
+
+    name = "numeric"
+
+    def __init__(self, abs_tol: float = 0.005) -> None:
+        self.abs_tol = abs_tol
+
+    def normalize(self, value: str):
+        number = _number(value)
+        return number if number is not None else normalize_cell(value)
+
+    def equal(self, csv_value, ui_value) -> bool:
+        if isinstance(csv_value, float) and isinstance(ui_value, float):
+            return abs(csv_value - ui_value) <= self.abs_tol
+        return csv_value == ui_value
+
+
+MATCHERS: dict[str, Callable[[], Matcher]] = {
+    "exact": ExactMatcher,
+    "substring": SubstringMatcher,
+    "date": DateMatcher,
+    "numeric": NumericMatcher,
+}
+
+
+def is_date_column(column: str) -> bool:
+    name = (column or "").strip().lower()
+    return bool({"date", "datetime", "dos"} & set(name.split())) or name in ("created", "last updated")
+
+
+def default_matcher_for(column: str) -> Matcher:
+    """Date-tolerant for date-like columns, substring for everything else."""
+    return DateMatcher() if is_date_column(column) else SubstringMatcher()
+
+
+@dataclass
+class CompareResult:
+    columns: list[str]
+    n_rows: int
+    matrix: list[bytearray]                      # column-major: matrix[col][row] is 1 for a match
+    matchers: list[str] = field(default_factory=list)
+    matches: list[int] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def total_matches(self) -> int:
+        return sum(self.matches)
+
+    @property
+    def total_cells(self) -> int:
+        return self.n_rows * len(self.columns)
+
+    def row_matrix(self, limit: Optional[int] = None) -> list[list[bool]]:
+        """Row-major bools for the HTML table (first `limit` rows)."""
+        n = self.n_rows if limit is None else min(limit, self.n_rows)
+        return [[bool(col[i]) for col in self.matrix] for i in range(n)]
+
+    def mismatches(self) -> list[tuple[int, int]]:
+        """(row, column) of every mismatching cell, row-major order."""
+        cells = [(i, j) for j, col in enumerate(self.matrix) for i, ok in enumerate(col) if not ok]
+        return sorted(cells)
+
+    def summary_lines(self, label: str = "") -> list[str]:
+        prefix = f"{label} " if label else ""
+        lines = [f"{prefix}comparison summary: rows={self.n_rows}, cols={len(self.columns)}, "
+                 f"matches={self.total_matches}, mismatches={self.total_cells - self.total_matches} "
+                 f"({self.elapsed_s * 1000:.1f} ms)"]
+        for name, kind, ok in zip(self.columns, self.matchers, self.matches):
+            marker = "✅" if ok == self.n_rows else "❌"
+            lines.append(f"{marker} {prefix}column '{name}' ({kind}): {ok}/{self.n_rows} rows match")
+        return lines
+
+
+class ColumnComparator:
+    """
+    Compares export rows with UI rows (both aligned with `columns`) column by column.
+    `matchers` maps a column name to a Matcher or a MATCHERS key; other columns use
+    default_matcher_for().
+    """
+
+    def __init__(self, columns: Sequence[str], matchers: Optional[dict[str, Matcher | str]] = None) -> None:
+        self.columns = list(columns)
+        chosen = {k.strip().lower(): v for k, v in (matchers or {}).items()}
+        self.matchers: list[Matcher] = []
+        for name in self.columns:
+            m = chosen.get(name.strip().lower())
+            if isinstance(m, str):
+                m = MATCHERS[m]()
+            self.matchers.append(m or default_matcher_for(name))
+
+    def _columns(self, rows: Sequence[Sequence[str]], n_rows: int) -> list[list[str]]:
+        """Transpose the first n_rows rows (padded/cut to the column count, blank rows added)."""
+        width = len(self.columns)
+        blank = ("",) * width
+        fixed = [row if len(row) == width else (tuple(row) + blank)[:width] for row in rows[:n_rows]]
+        fixed.extend([blank] * (n_rows - len(fixed)))
+        return [list(map(operator.itemgetter(j), fixed)) for j in range(width)]
+
+    def compare(self, csv_rows: Sequence[Sequence[str]], ui_rows: Sequence[Sequence[str]]) -> CompareResult:
+        """Missing UI rows/cells compare as blank."""
+        started = time.perf_counter()
+        n_rows = len(csv_rows)
+        csv_columns = self._columns(csv_rows, n_rows)
+        ui_columns = self._columns(ui_rows, n_rows)
+        matrix = [m.compare(c, u) for m, c, u in zip(self.matchers, csv_columns, ui_columns)]
+        return CompareResult(
+            columns=self.columns,
+            n_rows=n_rows,
+            matrix=matrix,
+            matchers=[m.name for m in self.matchers],
+            matches=[col.count(1) for col in matrix],
+            elapsed_s=time.perf_counter() - started,
+        )
@@ -0,0 +1,7 @@
+"""Put the repository root on sys.path so the shared cozeva_common package can be imported."""
+import sys
+from pathlib import Path
+
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
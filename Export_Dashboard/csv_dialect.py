@@ -0,0 +1,151 @@
+from __future__ import annotations
+import csv
+import itertools
+import threading
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+# Export reader with a per-export-type dialect cache: the dialect sniffed for
+# an export type is reused for its next files (csv.Sniffer runs once), with a
+# re-sniff of the header line when it doesn't fit. Records are parsed whole by
+# csv.reader; the wanted columns are picked from each one as it is read.
+
+SNIFF_CHARS = 8192
+BATCH_LINES = 4096
+FALLBACK_DELIMITERS = (",", "|", ";", "\t")
+
+_dialects: dict[str, dict] = {}
+_dialects_lock = threading.Lock()
+
+
+def cached_dialect(kind: str) -> Optional[dict]:
+    with _dialects_lock:
+        return _dialects.get(kind)
+
+
+def remember_dialect(kind: str, fmt: dict) -> None:
+    if kind:
+        with _dialects_lock:
+            _dialects[kind] = fmt
+
+
+def sniff_format(sample: str) -> dict:
+    """csv.reader format parameters sniffed from `sample` (excel's when sniffing fails)."""
+    try:
+        dialect = csv.Sniffer().sniff(sample)
+    except csv.Error:
+        dialect = csv.excel
+    return {
+        "delimiter": dialect.delimiter,
+        "quotechar": dialect.quotechar or '"',
+        "doublequote": dialect.doublequote,
+        "skipinitialspace": dialect.skipinitialspace,
+        "escapechar": dialect.escapechar,
+    }
+
+
+def _picker(indices: Sequence[int]) -> Callable[[Sequence[str]], tuple[str, ...]]:
+    if not indices:
+        return lambda parts: ()
+    if len(indices) == 1:
+        only = indices[0]
+        return lambda parts: (parts[only],)
+    return itemgetter(*indices)
+
+
+class CsvExportReader:
+    """
+    Reads export lines (an open file or a download stream) and yields the chosen
+    columns of each record. The header is read on construction; `kind` (e.g. "contact")
+    keys the dialect cache. `log` receives notices such as a fallback delimiter.
+    """
+
+    def __init__(self, lines: Iterable[str], kind: str = "",
+                 log: Optional[Callable[[str], None]] = None) -> None:
+        self.kind = kind
+        self._log = log or (lambda message: None)
+        self._lines = iter(lines)
+        self.sniffed = False
+
+        fmt = cached_dialect(kind) if kind else None
+        head: list[str] = []
+        if fmt is None:
+            # sniff from the first ~8 KB without consuming them
+            chars = 0
+            for line in self._lines:
+                head.append(line)
+                chars += len(line)
+                if chars >= SNIFF_CHARS:
+                    break
+            fmt = sniff_format("".join(head)[:SNIFF_CHARS])
+            self.sniffed = True
+        self._lines = itertools.chain(head, self._lines)
+        self.fmt = dict(fmt)
+
+        first = next(self._lines, "")
+        header = self._parse_record(first)
+        if len(header) == 1 and header[0] and not self.sniffed:
+            # the cached dialect doesn't fit this file: sniff its header line
+            self.fmt = sniff_format(first)
+            self.sniffed = True
+            header = next(csv.reader([first], **self.fmt), [])
+        if len(header) == 1 and header[0]:
+            # wrong delimiter: split on the first one that occurs
+            single = header[0]
+            for d in (self.fmt["delimiter"],) + FALLBACK_DELIMITERS:
+                if d and d in single:
+                    if d != self.fmt["delimiter"]:
+                        self._log(f"Fallback-split header using delimiter {d!r}")
+                    self.fmt["delimiter"] = d
+                    header = [h.strip() for h in single.split(d)]
+                    break
+        if header and header[0].startswith("\ufeff"):
+            header[0] = header[0].lstrip("\ufeff")
+        self.header = header
+        self.width = len(header)
+        remember_dialect(kind, self.fmt)
+
+    @property
+    def delimiter(self) -> str:
+        return self.fmt["delimiter"]
+
+    def _parse_record(self, line: str) -> list[str]:
+        """One full record starting at `line` (csv.reader pulls continuation lines of quoted newlines)."""
+        if not line:
+            return []
+        return next(csv.reader(itertools.chain((line,), self._lines), **self.fmt), [])
+
+    def batches(self, indices: Sequence[int]) -> Iterator[tuple[list[int], list[tuple[str, ...]]]]:
+        """
+        (field counts, rows of the values at `indices`) for BATCH_LINES records at a time,
+        every row exactly len(indices) long (fields a short row lacks read as "").
+        """
+        indices = list(indices)
+        pick = _picker(indices)
+        needed = max(indices) + 1 if indices else 0
+        delimiter = self.delimiter
+        width = self.width
+        reader = csv.reader(self._lines, **self.fmt)
+
+        def padded(parts: Sequence[str]) -> tuple[str, ...]:
+            return tuple(parts[i] if i < len(parts) else "" for i in indices)
+
+        while True:
+            # picked one by one: a batch of whole records would keep every field alive
+            counts: list[int] = []
+            values: list[tuple[str, ...]] = []
+            add_count, add_values = counts.append, values.append
+            for parts in itertools.islice(reader, BATCH_LINES):
+                if len(parts) == 1 and width > 1 and delimiter in parts[0]:
+                    # a whole row quoted as one field
+                    parts = [c.strip() for c in parts[0].split(delimiter)]
+                add_count(len(parts))
+                add_values(pick(parts) if len(parts) >= needed else padded(parts))
+            if not counts:
+                return
+            yield counts, values
+
+    def rows(self, indices: Sequence[int]) -> Iterator[tuple[int, tuple[str, ...]]]:
+        """(field count, values at `indices`) per record; see batches()."""
+        for counts, values in self.batches(indices):
+            yield from zip(counts, values)
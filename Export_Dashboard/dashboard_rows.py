@@ -0,0 +1,306 @@
+from __future__ import annotations
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Iterable, Optional
+
+# ─── Export Dashboard table ────────────────────────────────────
+# Every export row of the dashboard, parsed in one pass from the page HTML or a
+# DataTables JSON response, so a triggered export can be found by what it is
+# (customer, export type, request time, user) instead of by its position: rows
+# shift down whenever someone else starts an export.
+#
+# config.ini:
+#   [export_dashboard]
+#   requested_format = %m/%d/%Y %H:%M  ; format of the "requested" column (default: the formats below)
+#   match_early_s = 120                ; a row may show a request time this much before the trigger
+#                                      ; (minute resolution + clock difference with the server)
+#   match_late_s = 600                 ; ... and at most this much after it
+
+TERMINAL_FAILURES = ("Deleted", "Unsuccessful")
+REQUESTED_FORMATS = ("%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %I:%M %p", "%Y-%m-%d %H:%M:%S")
+MATCH_EARLY_SECONDS = 120.0
+MATCH_LATE_SECONDS = 600.0
+
+# cell positions in a dashboard row (0-based): first td is the export id, the 4th the
+# customer; the export-dashboard-row_pt cells are user, request time and export type
+# (DataTables JSON has no cell classes: then the td positions after them are used)
+ID_CELL = 0
+CUSTOMER_CELL = 3
+USER_PT, REQUESTED_PT, EXPORT_TYPE_PT = 0, 1, 2
+PT_CELLS = (1, 2, 4)
+DOWNLOAD_HREF_PART = "unified_file_download"
+
+# n-th export row of the dashboard page (1-based, newest first)
+DASHBOARD_ROW_XPATH = "(//tr[@role='row' and (contains(@class,'odd') or contains(@class,'even'))])[{row}]"
+
+_PERCENT_RE = re.compile(r"(\d{1,3})\s*%")
+_VOID_TAGS = {"area", "br", "col", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+
+@dataclass
+class ExportStatus:
+    status: str
+    percent: int
+    raw: str
+    source: str = "dom"  # "http" or "dom"
+
+    @property
+    def finished(self) -> bool:
+        return self.percent >= 100 or self.status in TERMINAL_FAILURES
+
+
+def parse_status_text(text: str, source: str = "dom") -> Optional[ExportStatus]:
+    """
+    Parse the text of the `status-info` cell ("<label>\\n<status>\\n<percent>%").
+    Returns None when the text doesn't have that shape.
+    """
+    lines = [ln.strip() for ln in (text or "").split("\n") if ln.strip()]
+    if len(lines) < 3:
+        return None
+    status_str = lines[1]
+    match = _PERCENT_RE.search(lines[2])
+    try:
+        percent = int(match.group(1)) if match else int(lines[2].strip("%"))
+    except ValueError:
+        percent = 0
+    return ExportStatus(status_str, percent, " | ".join(lines), source)
+
+
+def _norm(value: str) -> str:
+    return " ".join((value or "").split()).lower()
+
+
+@dataclass
+class DashboardRow:
+    position: int                 # 0-based, table order (newest first)
+    export_id: str
+    user: str
+    requested_text: str
+    customer: str
+    export_type: str
+    status: Optional[ExportStatus]
+    download_href: str = ""
+    requested: Optional[datetime] = None  # requested_text parsed (server time, minute resolution)
+
+    @property
+    def key(self) -> str:
+        """Identifies the row across polls (its position changes as new exports arrive)."""
+        if self.export_id:
+            return self.export_id
+        return "|".join((_norm(self.customer), _norm(self.export_type), self.requested_text, _norm(self.user)))
+
+    @property
+    def xpath(self) -> str:
+        """XPath of this row's <tr> on the dashboard page."""
+        if self.export_id and "'" not in self.export_id:
+            return f"//tr[@role='row'][normalize-space(td[{ID_CELL + 1}])='{self.export_id}']"
+        return DASHBOARD_ROW_XPATH.format(row=self.position + 1)
+
+    def describe(self) -> str:
+        return (f"row {self.position + 1} (id {self.export_id or '?'}, {self.export_type}, "
+                f"{self.customer}, requested {self.requested_text or '?'} by {self.user or '?'})")
+
+
+@dataclass
+class _Cell:
+    classes: str = ""
+    text: list[str] = field(default_factory=list)
+    links: list[str] = field(default_factory=list)
+    status: list[str] = field(default_factory=list)
+
+
+class _DashboardParser(HTMLParser):
+    """Collects the cells of every export row (<tr role="row" class="odd|even">)."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.rows: list[list[_Cell]] = []
+        self._row: Optional[list[_Cell]] = None
+        self._cell: Optional[_Cell] = None
+        self._cell_depth = 0
+        self._status_depth = 0
+
+    def handle_starttag(self, tag, attrs) -> None:
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if tag == "tr":
+            if attrs.get("role") == "row" and ("odd" in classes or "even" in classes):
+                self._row = []
+                self.rows.append(self._row)
+            else:
+                self._row = None
+            return
+        if self._row is None:
+            return
+        if tag == "td" and self._cell is None:
+            self._cell = _Cell(classes=" ".join(classes))
+            self._row.append(self._cell)
+            self._cell_depth = 1
+            return
+        if self._cell is None or tag in _VOID_TAGS:
+            if tag == "a" and self._cell is not None and attrs.get("href"):
+                self._cell.links.append(attrs["href"])
+            return
+        self._cell_depth += 1
+        if self._status_depth:
+            self._status_depth += 1
+        elif (attrs.get("class") or "").strip() == "status-info":
+            self._status_depth = 1
+        if tag == "a" and attrs.get("href"):
+            self._cell.links.append(attrs["href"])
+
+    def handle_endtag(self, tag) -> None:
+        if tag == "tr":
+            self._row = None
+            self._cell = None
+            return
+        if self._cell is None or tag in _VOID_TAGS:
+            return
+        self._cell_depth -= 1
+        if self._status_depth:
+            self._status_depth -= 1
+        if self._cell_depth <= 0 or tag == "td":
+            self._cell = None
+            self._cell_depth = self._status_depth = 0
+
+    def handle_data(self, data) -> None:
+        if self._cell is not None and data.strip():
+            self._cell.text.append(data.strip())
+            if self._status_depth:
+                self._cell.status.append(data.strip())
+
+
+def _html_of(body: str, content_type: str) -> str:
+    """The dashboard HTML, or DataTables JSON ({"data": [[cell html, ...], ...]}) turned into rows."""
+    if "json" not in content_type and not body.lstrip().startswith(("{", "[")):
+        return body
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return body
+    rows = (payload.get("data") or payload.get("aaData") or []) if isinstance(payload, dict) else payload
+    parts = []
+    for n, row in enumerate(rows):
+        values = row.values() if isinstance(row, dict) else row
+        cells = "".join(f"<td>{v}</td>" for v in values)
+        parts.append(f"<tr role='row' class='{'odd' if n % 2 == 0 else 'even'}'>{cells}</tr>")
+    return "<table>" + "".join(parts) + "</table>"
+
+
+def parse_requested(text: str, formats: Iterable[str] = REQUESTED_FORMATS) -> Optional[datetime]:
+    text = " ".join((text or "").split())
+    for fmt in formats:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_dashboard_rows(body: str, content_type: str = "", source: str = "http",
+                         requested_formats: Iterable[str] = REQUESTED_FORMATS) -> list[DashboardRow]:
+    """Every export row of a dashboard response (the page HTML or DataTables JSON), in table order."""
+    parser = _DashboardParser()
+    parser.feed(_html_of(body, content_type))
+    parser.close()
+    formats = tuple(requested_formats)
+
+    rows: list[DashboardRow] = []
+    for position, cells in enumerate(parser.rows):
+        texts = [" ".join(c.text) for c in cells]
+        pt = [" ".join(c.text) for c in cells if "export-dashboard-row_pt" in c.classes.split()]
+        if not pt:
+            pt = [texts[i] if i < len(texts) else "" for i in PT_CELLS]
+        status_cell = next((c for c in cells if c.status), None)
+        href = next((link for c in cells for link in c.links if DOWNLOAD_HREF_PART in link), "")
+        requested_text = pt[REQUESTED_PT] if len(pt) > REQUESTED_PT else ""
+        rows.append(DashboardRow(
+            position=position,
+            export_id=texts[ID_CELL] if len(texts) > ID_CELL else "",
+            user=pt[USER_PT] if len(pt) > USER_PT else "",
+            requested_text=requested_text,
+            customer=texts[CUSTOMER_CELL] if len(texts) > CUSTOMER_CELL else "",
+            export_type=pt[EXPORT_TYPE_PT] if len(pt) > EXPORT_TYPE_PT else "",
+            status=parse_status_text("\n".join(status_cell.status), source) if status_cell else None,
+            download_href=href,
+            requested=parse_requested(requested_text, formats),
+        ))
+    return rows
+
+
+# ─── Correlation ───────────────────────────────────────────────
+@dataclass
+class ExportTicket:
+    """An export this run triggered, to be found on the dashboard."""
+    customer: str
+    export_type: str       # "Contact Export" / "Sticket Export"
+    triggered_at: float    # time.time() when the export was confirmed
+    user: str = ""         # login name; preferred when the dashboard shows it
+    row_key: Optional[str] = None  # DashboardRow.key once correlated
+
+    def describe(self) -> str:
+        return (f"{self.export_type} for {self.customer} triggered "
+                f"{time.strftime('%m/%d/%Y %H:%M:%S', time.localtime(self.triggered_at))}")
+
+
+class DashboardIndex:
+    """Dashboard rows indexed by key and by (customer, export type)."""
+
+    def __init__(self, rows: list[DashboardRow]) -> None:
+        self.rows = rows
+        self.by_key: dict[str, DashboardRow] = {}
+        self.by_job: dict[tuple[str, str], list[DashboardRow]] = {}
+        for row in rows:
+            self.by_key.setdefault(row.key, row)
+            self.by_job.setdefault((_norm(row.customer), _norm(row.export_type)), []).append(row)
+
+    def get(self, key: str) -> Optional[DashboardRow]:
+        return self.by_key.get(key)
+
+    def correlate(self, ticket: ExportTicket, claimed: Iterable[str] = (),
+                  early_s: float = MATCH_EARLY_SECONDS,
+                  late_s: float = MATCH_LATE_SECONDS,
+                  allow_clock_offset: bool = False) -> tuple[Optional[DashboardRow], str]:
+        """
+        The row of `ticket`: same customer and export type, not `claimed` by another
+        ticket, requested within [-early_s, +late_s] of the trigger (by the ticket's
+        user when the dashboard shows it); the closest in time, the older on a tie so
+        tickets correlated in trigger order pair up with rows in request order.
+        Returns (row or None, note). With allow_clock_offset, a request time off by whole
+        hours (server in another time zone) is accepted with a note; only use it once the
+        row has had time to appear, or an older export of the same kind could match.
+        """
+        claimed = set(claimed)
+        same_job = [r for r in self.by_job.get((_norm(ticket.customer), _norm(ticket.export_type)), [])
+                    if r.key not in claimed]
+        if not same_job:
+            return None, f"no unclaimed '{ticket.export_type}' row for '{ticket.customer}'"
+        if ticket.user:
+            by_user = [r for r in same_job if _norm(r.user) == _norm(ticket.user)]
+            same_job = by_user or same_job  # the dashboard may show a display name instead
+
+        def pick(offset_s: float) -> Optional[DashboardRow]:
+            timed_rows = []
+            for row in same_job:
+                if row.requested is None:
+                    continue
+                delta = row.requested.timestamp() - offset_s - ticket.triggered_at
+                if -early_s <= delta <= late_s:
+                    timed_rows.append((abs(delta), -row.position, row))
+            return min(timed_rows, key=lambda t: t[:2])[2] if timed_rows else None
+
+        row = pick(0.0)
+        if row is not None:
+            return row, ""
+        for hours in range(-14, 15) if allow_clock_offset else ():
+            row = pick(hours * 3600.0) if hours else None
+            if row is not None:
+                return row, f"request time is {hours:+d}h from this machine's clock (server time zone)"
+        if all(r.requested is None for r in same_job):
+            # no readable request times: the newest row, as before the correlation
+            return same_job[0], "request times unreadable; matched by customer and export type only"
+        return None, f"no '{ticket.export_type}' row for '{ticket.customer}' requested near the trigger time"
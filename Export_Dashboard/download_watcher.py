@@ -0,0 +1,152 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+# watchdog uses inotify on Linux (ReadDirectoryChangesW on Windows, FSEvents on macOS);
+# without it we fall back to polling the folder.
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - optional dependency
+    FileSystemEventHandler = object  # type: ignore[assignment,misc]
+    Observer = None
+
+PARTIAL_SUFFIXES = (".crdownload", ".part", ".tmp")
+POLL_INTERVAL = 0.25   # seconds between folder scans (also the re-check interval with events)
+STABLE_FOR = 0.75      # file size must stay unchanged this long before it counts as finished
+
+
+@dataclass
+class DownloadResult:
+    path: Path
+    size_bytes: int
+    duration_s: float
+    mode: str  # "events" or "polling"
+
+    @property
+    def throughput_mb_s(self) -> float:
+        return (self.size_bytes / (1024 * 1024)) / self.duration_s if self.duration_s > 0 else 0.0
+
+
+class _WakeHandler(FileSystemEventHandler):
+    def __init__(self, wake: threading.Event) -> None:
+        super().__init__()
+        self.wake = wake
+
+    def on_any_event(self, event) -> None:
+        self.wake.set()
+
+
+class DownloadWatcher:
+    """
+    Detects the file downloaded by *this* job.
+
+    start() snapshots the folder before the download link is clicked; wait()
+    then ignores everything that was already there, follows Chrome's
+    `*.crdownload` partial until it is renamed to the final `*.csv`, and returns
+    once that file's size has stopped changing. It gives up when nothing
+    progresses for `idle_timeout` seconds, so big downloads don't time out
+    while they are still growing.
+    """
+
+    def __init__(self, directory: Path, suffix: str = ".csv") -> None:
+        self.directory = Path(directory)
+        self.suffix = suffix.lower()
+        self._wake = threading.Event()
+        self._observer = None
+        self._before: set[str] = set()
+        self._started = 0.0
+
+    @property
+    def mode(self) -> str:
+        return "events" if self._observer is not None else "polling"
+
+    def start(self) -> "DownloadWatcher":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._before = set(os.listdir(self.directory))
+        if Observer is not None:
+            try:
+                observer = Observer()
+                observer.schedule(_WakeHandler(self._wake), str(self.directory), recursive=False)
+                observer.start()
+                self._observer = observer
+            except Exception:
+                self._observer = None
+        self._started = time.perf_counter()
+        return self
+
+    def stop(self) -> None:
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=2)
+            except Exception:
+                pass
+            self._observer = None
+
+    def __enter__(self) -> "DownloadWatcher":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _new_entries(self) -> tuple[list[Path], list[Path]]:
+        """(finished candidates, partial downloads) created since start()."""
+        finished: list[Path] = []
+        partial: list[Path] = []
+        for name in os.listdir(self.directory):
+            if name in self._before:
+                continue
+            lower = name.lower()
+            if lower.endswith(PARTIAL_SUFFIXES):
+                partial.append(self.directory / name)
+            elif lower.endswith(self.suffix):
+                finished.append(self.directory / name)
+        return finished, partial
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return -1
+
+    def wait(self,
+             idle_timeout: float = 60.0,
+             max_timeout: float = 3600.0,
+             check_cancelled: Optional[Callable[[], None]] = None) -> Optional[DownloadResult]:
+        """Return the finished download, or None if nothing progressed for `idle_timeout` seconds."""
+        deadline = self._started + max_timeout
+        last_progress = time.perf_counter()
+        last_sizes: dict[Path, int] = {}
+        stable_since: dict[Path, float] = {}
+
+        while True:
+            if check_cancelled is not None:
+                check_cancelled()
+            now = time.perf_counter()
+            finished, partial = self._new_entries()
+
+            sizes = {p: self._size(p) for p in finished + partial}
+            if sizes != last_sizes:
+                last_progress = now
+            for path in finished:
+                if last_sizes.get(path) != sizes[path]:
+                    stable_since[path] = now
+
+            in_progress = {p.name.lower().rsplit(".", 1)[0] for p in partial}
+            for path in sorted(finished, key=lambda p: stable_since.get(p, now)):
+                done = (path.name.lower() not in in_progress and sizes[path] > 0
+                        and now - stable_since.get(path, now) >= STABLE_FOR)
+                if done:
+                    return DownloadResult(path, sizes[path], now - self._started, self.mode)
+            last_sizes = sizes
+
+            if now - last_progress > idle_timeout or now > deadline:
+                return None
+            self._wake.wait(POLL_INTERVAL)
+            self._wake.clear()
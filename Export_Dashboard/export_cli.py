@@ -0,0 +1,181 @@
+"""
+Export validation from the command line, without Tk (scheduled / server runs).
+
+    python -m export_cli export --customer "Customer A" --type sticket --env CERT
+    python -m export_cli export --all --type contact --type sticket --workers 4
+    python -m export_cli export --customer "Customer A" --same-session
+    python -m export_cli customers
+
+Progress and log lines go to stderr; stdout carries only the JSON summary
+(also written to <output-dir>/batch_summary.json). Exit codes: 0 all jobs
+passed, 1 at least one job failed, 2 bad arguments / unknown customer,
+3 setup error (config, Selenium), 130 interrupted.
+
+Selenium and the validation modules are imported only once the arguments are
+valid, so --help, `customers` and argument errors return immediately; nothing
+here imports tkinter or PIL.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import json
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Optional
+
+# ─── Configuration ─────────────────────────────────────────────
+CUSTOMER_CSV_PATH = Path("Customer.csv")
+OUTPUT_DIR = Path("cli_runs")
+EXPORT_TYPES = {"contact": "Contact Export", "sticket": "Sticket Export"}  # as in batch_runner
+SKIP_CUSTOMERS = {"Customer Not in List"}
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_SETUP = 3
+EXIT_INTERRUPTED = 130
+
+
+def read_customers(csv_path: Path) -> list[str]:
+    """Customer names from Customer.csv ('Customer Name' column)."""
+    with Path(csv_path).open(newline="", encoding="utf-8") as f:
+        names = [(row.get("Customer Name") or "").strip() for row in csv.DictReader(f)]
+    return [n for n in names if n and n not in SKIP_CUSTOMERS]
+
+
+def _emit(summary: dict) -> None:
+    print(json.dumps(summary, indent=2), flush=True)
+
+
+def _fail(command: str, code: int, message: str) -> int:
+    print(f"❌ {message}", file=sys.stderr)
+    _emit({"command": command, "ok": False, "exit_code": code, "error": message})
+    return code
+
+
+# ─── Commands ──────────────────────────────────────────────────
+def cmd_customers(args: argparse.Namespace) -> int:
+    try:
+        customers = read_customers(args.customers_csv)
+    except (OSError, csv.Error) as e:
+        return _fail("customers", EXIT_USAGE, f"Cannot read {args.customers_csv}: {e}")
+    _emit({"command": "customers", "ok": True, "exit_code": EXIT_OK, "customers": customers})
+    return EXIT_OK
+
+
+def _select_customers(args: argparse.Namespace) -> tuple[list[str], Optional[str]]:
+    """(customers to run, error message)."""
+    try:
+        known = read_customers(args.customers_csv)
+    except (OSError, csv.Error) as e:
+        if args.all:
+            return [], f"Cannot read {args.customers_csv}: {e}"
+        return [c.strip() for c in args.customer], None  # names given explicitly; no list to check against
+    if args.all:
+        return known, None
+    by_lower = {c.lower(): c for c in known}
+    unknown = [c for c in args.customer if c.strip().lower() not in by_lower]
+    if unknown:
+        return [], f"Unknown customer(s): {', '.join(unknown)} (see `customers`)"
+    return [by_lower[c.strip().lower()] for c in args.customer], None
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    customers, error = _select_customers(args)
+    if error:
+        return _fail("export", EXIT_USAGE, error)
+    export_types = [EXPORT_TYPES[t] for t in (args.types or sorted(EXPORT_TYPES))]
+    started = time.perf_counter()
+
+    # everything printed by the flows (log lines) goes to stderr from here on
+    with redirect_stdout(sys.stderr):
+        try:
+            import Export_Functionality
+            from batch_runner import ExportJob, run_export_batch
+            from cozeva_common.run_log import parse_level, set_console_level
+        except ImportError as e:
+            return _fail("export", EXIT_SETUP, f"Cannot load the export modules: {e}")
+
+        if args.config is not None:
+            if not args.config.exists():
+                return _fail("export", EXIT_SETUP, f"Config file not found: {args.config}")
+            Export_Functionality.CONFIG_FILE_PATH = args.config
+        if args.log_level:
+            set_console_level(parse_level(args.log_level))
+
+        if args.same_session:
+            export_types = [Export_Functionality.EXPORT_SEPARATOR.join(export_types)]
+        jobs = [ExportJob(c, t, args.env) for c in customers for t in export_types]
+        try:
+            results = run_export_batch(jobs, workers=args.workers, output_dir=args.output_dir,
+                                       reuse_sessions=not args.no_reuse)
+        except KeyboardInterrupt:
+            return _fail("export", EXIT_INTERRUPTED, "Interrupted.")
+
+    passed = sum(1 for r in results if r.ok)
+    code = EXIT_OK if passed == len(results) else EXIT_FAILED
+    _emit({
+        "command": "export",
+        "ok": code == EXIT_OK,
+        "exit_code": code,
+        "env": args.env,
+        "jobs": len(results),
+        "passed": passed,
+        "failed": len(results) - passed,
+        "wall_time_s": round(time.perf_counter() - started, 2),
+        "output_dir": str(args.output_dir),
+        "results": [
+            {
+                "customer": r.job.customer,
+                "export_type": r.job.export_type,
+                "ok": r.ok,
+                "elapsed_s": r.elapsed_s,
+                "report_path": r.report_path,
+                "download_dir": r.download_dir,
+                "error": r.error,
+            }
+            for r in results
+        ],
+    })
+    return code
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="export_cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers-csv", type=Path, default=CUSTOMER_CSV_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Run export validations.")
+    who = export.add_mutually_exclusive_group(required=True)
+    who.add_argument("--customer", action="append", help="Customer name (repeatable).")
+    who.add_argument("--all", action="store_true", help="Every customer in the customers CSV.")
+    export.add_argument("--type", dest="types", action="append", choices=sorted(EXPORT_TYPES),
+                        help="Export type(s) (repeatable). Default: contact and sticket.")
+    export.add_argument("--env", default="CERT", type=str.upper, choices=["CERT", "PROD"])
+    export.add_argument("--config", type=Path, default=None, help="config.ini (default: the app's).")
+    export.add_argument("--workers", type=int, default=1, help="Concurrent browser sessions.")
+    export.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    export.add_argument("--no-reuse", action="store_true", help="Fresh browser and login for every job.")
+    export.add_argument("--same-session", action="store_true",
+                        help="One job per customer: its export types in one login, polled together.")
+    export.add_argument("--log-level", default=None, help="Console log level (DEBUG, INFO, WARNING, ERROR).")
+    export.set_defaults(handler=cmd_export)
+
+    customers = commands.add_parser("customers", help="List the customers in the customers CSV.")
+    customers.set_defaults(handler=cmd_customers)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)  # exits with 2 on bad arguments
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        return _fail(args.command, EXIT_INTERRUPTED, "Interrupted.")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
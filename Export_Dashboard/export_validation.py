@@ -0,0 +1,165 @@
+from __future__ import annotations
+import time
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Optional, Sequence
+
+MAX_EXAMPLES = 10  # bad rows remembered for the report (memory stays constant)
+
+
+def _norm(s: str) -> str:
+    return (s or "").strip().lower()
+
+
+@dataclass
+class CsvValidationReport:
+    header_fields: int
+    rows: int = 0
+    bad_field_count_rows: int = 0
+    bad_row_examples: list[tuple[int, int]] = field(default_factory=list)  # (data row no., field count)
+    repeated_header_rows: int = 0
+    empty_mandatory: dict[str, int] = field(default_factory=dict)
+    missing_mandatory_columns: list[str] = field(default_factory=list)
+    bytes_read: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def ok(self) -> bool:
+        return (self.rows > 0 and not self.bad_field_count_rows and not self.missing_mandatory_columns
+                and not any(self.empty_mandatory.values()))
+
+    def summary_lines(self) -> list[str]:
+        """Human-readable lines for the run log (❌ marks failures)."""
+        mb = self.bytes_read / (1024 * 1024)
+        lines = [f"Full-file validation: {self.rows} data rows, {self.header_fields} columns, "
+                 f"{mb:.1f} MB in {self.elapsed_s:.2f}s ({self.rows_per_s:,.0f} rows/s)."]
+        if self.rows == 0:
+            lines.append("❌ Export contains no data rows.")
+        if self.bad_field_count_rows:
+            examples = ", ".join(f"row {r} has {n}" for r, n in self.bad_row_examples)
+            lines.append(f"❌ {self.bad_field_count_rows} row(s) do not have {self.header_fields} fields "
+                         f"(truncated/corrupted?) e.g. {examples}.")
+        if self.repeated_header_rows:
+            lines.append(f"Notice: skipped {self.repeated_header_rows} repeated header row(s).")
+        for name in self.missing_mandatory_columns:
+            lines.append(f"❌ Mandatory column '{name}' is missing from the export header.")
+        for name, count in self.empty_mandatory.items():
+            if count:
+                lines.append(f"❌ Mandatory column '{name}' is empty in {count} row(s).")
+        if self.ok:
+            lines.append("✅ Export file passed full-file validation.")
+        return lines
+
+
+class CsvStreamValidator:
+    """
+    Single-pass, constant-memory validator for a downloaded export.
+
+    Feed every parsed row (after the header) to feed(); it returns False for
+    repeated header rows so callers can skip them. finish() returns the report.
+    Only counters and a handful of examples are kept, so file size doesn't matter.
+    """
+
+    def __init__(self,
+                 header: Sequence[str],
+                 mandatory_columns: Sequence[str] = (),
+                 header_check_indices: Optional[Sequence[int]] = None) -> None:
+        self.width = len(header)
+        header_norm = [_norm(h) for h in header]
+        index_by_name = {h: i for i, h in enumerate(header_norm)}
+
+        self._mandatory: list[tuple[str, int]] = []
+        self._report = CsvValidationReport(header_fields=self.width)
+        for name in mandatory_columns:
+            idx = index_by_name.get(_norm(name))
+            if idx is None:
+                self._report.missing_mandatory_columns.append(name)
+            else:
+                self._mandatory.append((name, idx))
+                self._report.empty_mandatory[name] = 0
+
+        check = range(self.width) if header_check_indices is None else header_check_indices
+        self._header_check = [(i, header_norm[i]) for i in check if i < self.width]
+        self._started = time.perf_counter()
+
+    @property
+    def needed_indices(self) -> list[int]:
+        """Header positions the checks read (mandatory and header-check columns)."""
+        return sorted({idx for _, idx in self._mandatory} | {i for i, _ in self._header_check})
+
+    def use_projection(self, indices: Sequence[int]) -> None:
+        """
+        Rows fed from now on hold only the header columns `indices`, in that order
+        (they must include needed_indices); pass each row's real field count to feed().
+        """
+        position = {idx: p for p, idx in enumerate(indices)}
+        self._mandatory = [(name, position[idx]) for name, idx in self._mandatory]
+        self._header_check = [(position[i], expected) for i, expected in self._header_check]
+
+    def is_header_row(self, row: Sequence[str]) -> bool:
+        if not self._header_check:
+            return False
+        for i, expected in self._header_check:
+            if _norm(row[i] if i < len(row) else "") != expected:
+                return False
+        return True
+
+    def feed(self, row: Sequence[str], n_fields: Optional[int] = None) -> bool:
+        if self._header_check:
+            # cheap test on the first checked column before the full header comparison
+            i, expected = self._header_check[0]
+            if (row[i] if i < len(row) else "").strip().lower() == expected and self.is_header_row(row):
+                self._report.repeated_header_rows += 1
+                return False
+
+        report = self._report
+        report.rows += 1
+        n = len(row) if n_fields is None else n_fields
+        if n != self.width:
+            report.bad_field_count_rows += 1
+            if len(report.bad_row_examples) < MAX_EXAMPLES:
+                report.bad_row_examples.append((report.rows, n))
+        width = len(row)
+        for name, idx in self._mandatory:
+            if idx >= width or not row[idx].strip():
+                report.empty_mandatory[name] += 1
+        return True
+
+    def feed_batch(self, rows: Sequence[Sequence[str]], n_fields: Sequence[int]) -> Sequence[Sequence[str]]:
+        """
+        feed() for a batch of equally long (projected) rows with their field counts;
+        returns the rows that are not repeated headers. Checks run column-wise.
+        """
+        report = self._report
+        if self._header_check:
+            i, expected = self._header_check[0]
+            firsts = list(map(str.lower, map(str.strip, map(itemgetter(i), rows))))
+            if expected in firsts:
+                keep = [k for k, first in enumerate(firsts) if first != expected or not self.is_header_row(rows[k])]
+                report.repeated_header_rows += len(rows) - len(keep)
+                rows = [rows[k] for k in keep]
+                n_fields = [n_fields[k] for k in keep]
+
+        base = report.rows
+        report.rows += len(rows)
+        bad = len(n_fields) - n_fields.count(self.width)
+        if bad:
+            report.bad_field_count_rows += bad
+            for k, n in enumerate(n_fields):
+                if len(report.bad_row_examples) >= MAX_EXAMPLES:
+                    break
+                if n != self.width:
+                    report.bad_row_examples.append((base + k + 1, n))
+        for name, idx in self._mandatory:
+            report.empty_mandatory[name] += list(map(str.strip, map(itemgetter(idx), rows))).count("")
+        return rows
+
+    def finish(self, bytes_read: int = 0) -> CsvValidationReport:
+        self._report.elapsed_s = time.perf_counter() - self._started
+        self._report.bytes_read = bytes_read
+        return self._report
+
@@ -0,0 +1,208 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional, Sequence
+
+# Resolves the columns an export type cares about (canonical names) to positions
+# in a header row, CSV or UI alike. Exact names and aliases win; only names left
+# over are matched by words (every word of the name must be in the header).
+# Results are cached per export type and header row hash, in memory and in a
+# JSON file, so the same schema is never matched twice. The file keeps the
+# CACHE_MAX_ENTRIES most recently used header rows.
+
+CACHE_MAX_ENTRIES = 256
+_WORDS = re.compile(r"[^a-z0-9#]+")
+
+
+def normalize_header(s: str) -> str:
+    return " ".join((s or "").replace("\ufeff", "").strip().lower().split())
+
+
+def _tokens(s: str) -> frozenset[str]:
+    return frozenset(t for t in _WORDS.split(normalize_header(s)) if t)
+
+
+@dataclass
+class HeaderIndex:
+    canonical: list[str]                                            # names resolved, in canonical order
+    positions: list[int]                                            # header position per name; -1 when missing
+    fuzzy: dict[str, str] = field(default_factory=dict)             # name -> header matched by words only
+    ambiguous: dict[str, list[str]] = field(default_factory=dict)   # name -> every header it could mean
+    key: str = ""
+    cached: bool = False
+
+    def position(self, name: str) -> int:
+        target = normalize_header(name)
+        for c, p in zip(self.canonical, self.positions):
+            if normalize_header(c) == target:
+                return p
+        return -1
+
+    @property
+    def present(self) -> list[int]:
+        """Resolved positions in canonical order, without duplicates."""
+        seen: set[int] = set()
+        return [p for p in self.positions if p >= 0 and not (p in seen or seen.add(p))]
+
+    @property
+    def missing(self) -> list[str]:
+        return [c for c, p in zip(self.canonical, self.positions) if p < 0]
+
+    def canonical_at(self, position: int) -> Optional[str]:
+        for c, p in zip(self.canonical, self.positions):
+            if p == position:
+                return c
+        return None
+
+
+class HeaderResolver:
+    """
+    Header resolution for one export type. `canonical` lists the wanted columns
+    (empty: every header not in `exclude`), `aliases` maps a canonical name to
+    other spellings (e.g. the UI's), and headers in `exclude` never match.
+    """
+
+    def __init__(self,
+                 kind: str,
+                 canonical: Sequence[str],
+                 aliases: Optional[dict[str, Sequence[str]]] = None,
+                 exclude: Sequence[str] = (),
+                 cache_path: Optional[Path] = None) -> None:
+        self.kind = kind
+        self.canonical = list(canonical)
+        self.aliases = {normalize_header(k): [normalize_header(a) for a in v] for k, v in (aliases or {}).items()}
+        self.exclude = {normalize_header(h) for h in exclude}
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        config = json.dumps([kind, self.canonical, self.aliases, sorted(self.exclude)], sort_keys=True)
+        self.signature = hashlib.sha1(config.encode("utf-8")).hexdigest()[:12]
+
+    def _names_for(self, name: str) -> list[str]:
+        norm = normalize_header(name)
+        return [norm] + [a for a in self.aliases.get(norm, []) if a != norm]
+
+    def key_of(self, headers: Sequence[str]) -> str:
+        raw = self.signature + "\x1e" + "\x1f".join(h or "" for h in headers)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def resolve(self, headers: Sequence[str]) -> HeaderIndex:
+        """Index of `headers`; matched once per distinct header row, then served from the cache."""
+        key = self.key_of(headers)
+        hit = _cache_get(self.cache_path, key)
+        if hit is not None:
+            return HeaderIndex(**dict(hit, key=key, cached=True))
+        index = self._match(headers)
+        index.key = key
+        _cache_put(self.cache_path, key, {k: v for k, v in asdict(index).items() if k not in ("key", "cached")})
+        return index
+
+    def _match(self, headers: Sequence[str]) -> HeaderIndex:
+        norm = [normalize_header(h) for h in headers]
+        candidates = [i for i, h in enumerate(norm) if h and h not in self.exclude]
+
+        if not self.canonical:
+            return HeaderIndex(canonical=[headers[i] for i in candidates], positions=list(candidates))
+
+        by_name: dict[str, list[int]] = {}
+        for i in candidates:
+            by_name.setdefault(norm[i], []).append(i)
+
+        positions = [-1] * len(self.canonical)
+        fuzzy: dict[str, str] = {}
+        ambiguous: dict[str, list[str]] = {}
+        claimed: set[int] = set()
+
+        # pass 1: the name itself or one of its aliases
+        for c, name in enumerate(self.canonical):
+            hits: list[int] = []
+            for spelling in self._names_for(name):
+                hits.extend(i for i in by_name.get(spelling, []) if i not in hits)
+            if hits:
+                positions[c] = hits[0]
+                claimed.add(hits[0])
+                if len(hits) > 1:
+                    ambiguous[name] = [headers[i] for i in hits]
+
+        # pass 2: every word of the name (or an alias) in an unclaimed header; fewest extra words wins
+        tokens = {i: _tokens(headers[i]) for i in candidates}
+        for c, name in enumerate(self.canonical):
+            if positions[c] >= 0:
+                continue
+            wanted = [w for w in map(_tokens, self._names_for(name)) if w]
+            scored = sorted(
+                (min(len(tokens[i] - w) for w in wanted if w <= tokens[i]), i)
+                for i in candidates
+                if i not in claimed and any(w <= tokens[i] for w in wanted)
+            )
+            if not scored:
+                continue
+            best, i = scored[0]
+            positions[c] = i
+            claimed.add(i)
+            fuzzy[name] = headers[i]
+            ties = [headers[j] for s, j in scored if s == best]
+            if len(ties) > 1:
+                ambiguous[name] = ties
+
+        return HeaderIndex(canonical=list(self.canonical), positions=positions, fuzzy=fuzzy, ambiguous=ambiguous)
+
+    def map_columns(self, source_headers: Sequence[str], target_headers: Sequence[str]) -> list[int]:
+        """
+        For each of `source_headers` (e.g. the CSV columns shown in the report), the
+        position of the same canonical column in `target_headers` (e.g. the UI table), or -1.
+        """
+        source = self.resolve(source_headers)
+        target = self.resolve(target_headers)
+        out = []
+        for j in range(len(source_headers)):
+            name = source.canonical_at(j)
+            out.append(target.position(name) if name is not None else -1)
+        return out
+
+
+# ─── Cache (memory + JSON file) ────────────────────────────────
+_cache: dict[Optional[Path], dict[str, dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def _load(path: Optional[Path]) -> dict[str, dict]:
+    entries = _cache.get(path)
+    if entries is None:
+        entries = {}
+        if path is not None and path.exists():
+            try:
+                entries = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                entries = {}
+        _cache[path] = entries
+    return entries
+
+
+def _cache_get(path: Optional[Path], key: str) -> Optional[dict]:
+    with _cache_lock:
+        entries = _load(path)
+        hit = entries.pop(key, None)
+        if hit is not None:
+            entries[key] = hit  # most recently used last; saved with the next put
+        return hit
+
+
+def _cache_put(path: Optional[Path], key: str, entry: dict) -> None:
+    with _cache_lock:
+        entries = _load(path)
+        entries.pop(key, None)
+        entries[key] = entry
+        for old in list(entries)[:max(0, len(entries) - CACHE_MAX_ENTRIES)]:
+            del entries[old]
+        if path is None:
+            return
+        try:
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_text(json.dumps(entries, indent=1), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass  # the in-memory cache still serves this process
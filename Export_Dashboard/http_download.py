@@ -0,0 +1,174 @@
+from __future__ import annotations
+import codecs
+import hashlib
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+from urllib.parse import unquote, urlparse
+
+import urllib3
+
+import common_path  # noqa: F401 (repo root on sys.path for cozeva_common)
+from cozeva_common.http_session import BrowserHttpSession
+
+# ─── Configuration ─────────────────────────────────────────────
+# config.ini:
+#   [export_dashboard]
+#   download_mode = browser   ; "browser" (default): click the link, Chrome downloads the file
+#   download_mode = http      ; stream the link's href with the browser's cookies
+CHUNK_SIZE = 1024 * 1024  # bytes per read from the socket
+MAX_RESUMES = 3           # Range requests after an interrupted transfer
+
+_FILENAME_RE = re.compile(r"filename\*?=(?:UTF-8'')?\"?([^\";]+)\"?", re.IGNORECASE)
+
+
+class DownloadError(Exception):
+    pass
+
+
+@dataclass
+class HttpDownloadResult:
+    path: Path
+    size_bytes: int
+    sha256: str
+    ttfb_s: float
+    duration_s: float
+    resumes: int = 0
+
+    @property
+    def throughput_mb_s(self) -> float:
+        return (self.size_bytes / (1024 * 1024)) / self.duration_s if self.duration_s > 0 else 0.0
+
+
+def _filename_from(resp: urllib3.BaseHTTPResponse, url: str) -> str:
+    match = _FILENAME_RE.search(resp.headers.get("Content-Disposition", "") or "")
+    name = unquote(match.group(1)) if match else os.path.basename(urlparse(url).path)
+    name = os.path.basename(name.strip()) or "export"
+    return name if name.lower().endswith(".csv") else name + ".csv"
+
+
+class HttpExportDownload:
+    """
+    Streams an export file to disk over a pooled HTTP session.
+
+    iter_lines() yields the decoded text lines while the bytes are written to
+    `<name>.part` and hashed, so a CSV reader can validate rows as they arrive
+    without reading the file back. An interrupted transfer is resumed with a
+    Range request from the last written byte. When the generator is exhausted
+    the file is renamed to its final name and `result` is filled in.
+    """
+
+    def __init__(self,
+                 http: BrowserHttpSession,
+                 url: str,
+                 directory: Path,
+                 encoding: str = "utf-8",
+                 chunk_size: int = CHUNK_SIZE,
+                 check_cancelled: Optional[Callable[[], None]] = None) -> None:
+        self.http = http
+        self.url = url
+        self.directory = Path(directory)
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.check_cancelled = check_cancelled
+        self.bytes_written = 0
+        self.resumes = 0
+        self.result: Optional[HttpDownloadResult] = None
+        self._resp: Optional[urllib3.BaseHTTPResponse] = None
+
+    def open(self) -> "HttpExportDownload":
+        """Send the request and check the response before any byte is consumed."""
+        self._started = time.perf_counter()
+        try:
+            resp = self.http.get(self.url, headers={"Accept-Encoding": "identity"}, preload_content=False)
+        except urllib3.exceptions.HTTPError as e:
+            raise DownloadError(f"download request failed: {e}") from e
+        self.ttfb_s = time.perf_counter() - self._started
+        if resp.status != 200:
+            resp.release_conn()
+            raise DownloadError(f"HTTP {resp.status} for download link"
+                                + (" (redirected - session expired?)" if 300 <= resp.status < 400 else ""))
+        self._resp = resp
+        self._validator = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+        length = resp.headers.get("Content-Length")
+        self.total_bytes = int(length) if length and length.isdigit() else None
+        self.final_path = self.directory / _filename_from(resp, self.url)
+        self.part_path = self.final_path.with_name(self.final_path.name + ".part")
+        return self
+
+    def _resume(self) -> urllib3.BaseHTTPResponse:
+        headers = {"Accept-Encoding": "identity", "Range": f"bytes={self.bytes_written}-"}
+        if self._validator:
+            headers["If-Range"] = self._validator
+        try:
+            resp = self.http.get(self.url, headers=headers, preload_content=False)
+        except urllib3.exceptions.HTTPError as e:
+            raise DownloadError(f"resume request failed: {e}") from e
+        if resp.status != 206:
+            resp.release_conn()
+            raise DownloadError(f"server can't resume the download (HTTP {resp.status} to a Range request)")
+        return resp
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        resp = self._resp
+        while True:
+            try:
+                for chunk in resp.stream(self.chunk_size, decode_content=False):
+                    if chunk:
+                        yield chunk
+                resp.release_conn()
+                return
+            except (urllib3.exceptions.HTTPError, OSError) as e:
+                resp.release_conn()
+                if self.resumes >= MAX_RESUMES:
+                    raise DownloadError(f"download interrupted after {self.bytes_written} bytes: {e}") from e
+                self.resumes += 1
+                resp = self._resume()
+
+    def iter_lines(self) -> Iterator[str]:
+        if self._resp is None:
+            self.open()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        pending = ""
+        try:
+            with self.part_path.open("wb") as out:
+                for chunk in self._iter_chunks():
+                    if self.check_cancelled is not None:
+                        self.check_cancelled()
+                    out.write(chunk)
+                    digest.update(chunk)
+                    self.bytes_written += len(chunk)
+
+                    # split on \n only (like newline=""), keeping the unfinished last line for the next chunk
+                    lines = (pending + decoder.decode(chunk)).split("\n")
+                    pending = lines.pop()
+                    for line in lines:
+                        yield line + "\n"
+                pending += decoder.decode(b"", final=True)
+                if pending:
+                    yield pending
+
+            if self.total_bytes is not None and self.bytes_written != self.total_bytes:
+                raise DownloadError(f"download truncated: {self.bytes_written} of {self.total_bytes} bytes")
+            os.replace(self.part_path, self.final_path)
+        except BaseException:
+            # failed, cancelled or abandoned by the reader: don't leave a partial file behind
+            self.part_path.unlink(missing_ok=True)
+            raise
+        self.result = HttpDownloadResult(
+            path=self.final_path,
+            size_bytes=self.bytes_written,
+            sha256=digest.hexdigest(),
+            ttfb_s=self.ttfb_s,
+            duration_s=time.perf_counter() - self._started,
+            resumes=self.resumes,
+        )
+
+    def close(self) -> None:
+        if self._resp is not None:
+            self._resp.release_conn()
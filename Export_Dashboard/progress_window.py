@@ -0,0 +1,232 @@
+from __future__ import annotations
+import queue
+import threading
+from tkinter import Tk, Toplevel, Label, Button, StringVar, messagebox
+from tkinter import ttk as tkttk
+from typing import Optional
+
+import common_path  # noqa: F401 (repo root on sys.path for cozeva_common)
+from cozeva_common.driver_pool import BrowserWarmup, DriverPool
+from Export_Functionality import (
+    LOG_HTML_FILE,
+    ExportCancelled,
+    RunContext,
+    bind_run,
+    execute_export_job,
+    export_flow_steps,
+    log,
+)
+
+# Tk side of the export flow. Kept out of Export_Functionality so that batch and
+# command-line runs (batch_runner.py, export_cli.py) never import tkinter.
+
+
+# ─── Tkinter Progress UI ─────────────────────────────────────────────
+class ProgressWindow:
+    """
+    Progress window fed from the Selenium worker thread.
+
+    update()/complete()/error() only put events on a queue and never sleep;
+    the Tk thread drains the queue with after() every REPAINT_INTERVAL_MS,
+    so repaints are capped no matter how fast the worker reports.
+    Cancel (or closing the window) sets cancel_event, which the worker
+    observes in update(), check_cancelled() and sleep().
+    """
+    REPAINT_INTERVAL_MS = 100
+
+    def __init__(self, master: Tk, total_steps: int) -> None:
+        # slightly wider/taller window to reduce wrap collisions
+        self.window = Toplevel(master)
+        self.window.title("Export Dashboard Validation Progress")
+        self.window.geometry("700x210")
+        self.window.configure(bg="#4f8611")
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.step = 0
+        self.total_steps = max(1, total_steps)
+        self.events: queue.Queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.closed = False
+
+        self.status_var = StringVar(value="Starting validation...")
+        # status label with wraplength and centered justification so long text wraps
+        self.status_label = Label(
+            self.window,
+            textvariable=self.status_var,
+            bg="#4f8611",
+            fg="white",
+            font=("Arial", 13, "bold"),
+            wraplength=640,
+            justify="center",
+        )
+        self.status_label.pack(pady=(12, 6), fill="x", padx=10)
+
+        # progressbar with horizontal padding so labels don't touch it
+        self.progress = tkttk.Progressbar(self.window, orient="horizontal", length=560, mode="determinate")
+        self.progress.pack(pady=(2, 6), padx=20, fill="x")
+        self.progress["maximum"] = self.total_steps
+        self.progress["value"] = 0
+
+        # percent label placed below the progress bar to avoid overlap
+        self.percent_label = Label(
+            self.window,
+            text="0%",
+            bg="#4f8611",
+            fg="white",
+            font=("Arial", 11, "bold")
+        )
+        self.percent_label.pack(pady=(0, 6))
+
+        # Properly keep a reference to the label displaying the last message.
+        self.last_msg = StringVar(value="")
+        self.last_msg_label = Label(
+            self.window,
+            textvariable=self.last_msg,
+            bg="#4f8611",
+            fg="white",
+            font=("Arial", 10),
+            wraplength=640,
+            justify="center",
+        )
+        # add a little bottom padding to prevent crowding
+        self.last_msg_label.pack(pady=(0, 6), fill="x", padx=10)
+
+        self.cancel_button = Button(
+            self.window,
+            text="Cancel",
+            command=self.cancel,
+            bg="white",
+            fg="#4f8611",
+            font=("Arial", 10, "bold"),
+            width=12,
+        )
+        self.cancel_button.pack(pady=(0, 10))
+
+        self.window.update()
+        self.window.after(self.REPAINT_INTERVAL_MS, self._drain)
+
+    # ─── Worker-side API (thread-safe, non-blocking) ─────────────
+    def update(self, step_description: str) -> None:
+        """Advance one step and show `step_description` + append to logs."""
+        self.check_cancelled()
+        log(step_description)
+        self.events.put(("step", step_description))
+
+    def complete(self) -> None:
+        """Mark complete and log; the window closes once the worker calls finish()."""
+        log("Validation completed")
+        self.events.put(("complete", None))
+
+    def error(self, title: str, message: str) -> None:
+        """Surface an error to the user (shown by the Tk thread)."""
+        self.events.put(("error", (title, message)))
+
+    def finish(self) -> None:
+        """Called by the worker when it is done; closes the window on the next drain."""
+        self.events.put(("finish", None))
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event.is_set():
+            raise ExportCancelled("Validation cancelled by user.")
+
+    def sleep(self, seconds: float) -> None:
+        """Cancellable replacement for time.sleep() in the worker."""
+        if self.cancel_event.wait(seconds):
+            raise ExportCancelled("Validation cancelled by user.")
+
+    # ─── Tk-side ─────────────────────────────────────────────────
+    def cancel(self) -> None:
+        if self.cancel_event.is_set():
+            return
+        self.cancel_event.set()
+        self.status_var.set("Cancelling... (waiting for the current browser step)")
+        self.cancel_button.config(state="disabled")
+
+    def _drain(self) -> None:
+        last_step: Optional[str] = None
+        completed = finished = False
+        errors: list[tuple[str, str]] = []
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == "step":
+                    self.step = min(self.step + 1, self.total_steps)
+                    last_step = payload
+                elif kind == "complete":
+                    completed = True
+                elif kind == "error":
+                    errors.append(payload)
+                elif kind == "finish":
+                    finished = True
+        except queue.Empty:
+            pass
+
+        if last_step is not None and not self.cancel_event.is_set():
+            self.status_var.set(last_step)
+            self.last_msg.set(last_step)
+        if last_step is not None or completed:
+            if completed:
+                self.step = self.total_steps
+                self.status_var.set("✅ Validation completed!")
+            self.progress["value"] = self.step
+            self.percent_label.config(text=f"{int((self.step / self.total_steps) * 100)}%")
+        for title, message in errors:
+            messagebox.showerror(title, message, parent=self.window)
+
+        if finished:
+            self.close()
+        elif not self.closed:
+            self.window.after(self.REPAINT_INTERVAL_MS, self._drain)
+
+    def close(self) -> None:
+        self.closed = True
+        try:
+            self.window.destroy()
+        except Exception:
+            pass
+
+
+# ─── Export flow (called from UI) ─────────────────────────────────
+def run_export_flow(selected_customer: str, selected_export: str, selected_env: str, master: Tk,
+                    warmup: Optional[BrowserWarmup] = None, pool: Optional[DriverPool] = None) -> None:
+    """
+    Run the whole Selenium + validation flow for the given customer/export/env,
+    using `master` as the Tk root for ProgressWindow and messageboxes.
+
+    The Selenium work runs on a worker thread; this call keeps the Tk event
+    loop running (wait_window) until the progress window closes. With a
+    `warmup`, its pre-launched browser is used when it is for `selected_env`.
+    With a `pool` (shared_driver_pool()), the logged-in browser is kept after
+    the run and a repeat run for the same customer skips Chrome and the login.
+    A combined `selected_export` ("Contact Export + Sticket Export") runs all
+    of its exports in the one login.
+    """
+    progress = ProgressWindow(master, export_flow_steps(selected_export))
+    outcome: dict[str, Exception] = {}
+
+    run = RunContext(customer=selected_customer, jsonl_path=LOG_HTML_FILE.with_suffix(".jsonl"))
+
+    def worker() -> None:
+        with bind_run(run):
+            try:
+                warm_session = pool is not None and pool.has_idle(selected_env, selected_customer)
+                client = warmup.take(selected_env) if warmup is not None and not warm_session else None
+                execute_export_job(selected_customer, selected_export, selected_env, progress,
+                                   pool=pool, client=client)
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                run.log.close()
+                progress.finish()
+
+    threading.Thread(target=worker, name="export-flow", daemon=True).start()
+    master.wait_window(progress.window)
+
+    error = outcome.get("error")
+    if isinstance(error, ExportCancelled):
+        messagebox.showinfo("Cancelled", str(error), parent=master)
+    elif error is not None:
+        messagebox.showerror("Error", str(error), parent=master)
+    else:
+        messagebox.showinfo("Success", "Validation completed successfully!", parent=master)
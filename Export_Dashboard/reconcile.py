@@ -0,0 +1,224 @@
+from __future__ import annotations
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+from cell_compare import ColumnComparator, date_key, is_date_column, normalize_cell
+from csv_dialect import CsvExportReader
+
+MAX_EXAMPLES = 10  # keys remembered per problem kind for the report
+MAX_KEPT_ROWS = 500_000  # export rows kept for the join while parsing; a larger export is read again
+
+_PATIENT_ID_RE = re.compile(r"/patient_detail/([^/?#]+)")
+
+
+def _norm(s: str) -> str:
+    return (s or "").strip().lower()
+
+
+def patient_id_from_links(links: Sequence[str]) -> str:
+    """Member CozevaID from the first patient_detail link of a UI row ("" if none)."""
+    for href in links:
+        match = _PATIENT_ID_RE.search(href or "")
+        if match:
+            return match.group(1)
+    return ""
+
+
+def iter_projected_rows(path: Path, columns: Sequence[str], encoding: str = "utf-8",
+                        kind: str = "") -> Iterator[list[str]]:
+    """
+    Stream the rows of an export CSV, projected onto `columns` (matched by header
+    name, case-insensitive). Missing columns read as ""; repeated header rows are
+    skipped. `kind` reuses the export type's dialect.
+    """
+    with Path(path).open("r", encoding=encoding, newline="") as f:
+        reader = CsvExportReader(f, kind)
+        index = {_norm(h): i for i, h in enumerate(reader.header)}
+        picks = [index.get(_norm(c), -1) for c in columns]
+        present = [i for i in picks if i >= 0]
+        header = [_norm(reader.header[i]) for i in present]
+        first = header[0] if header else None
+        for _, values in reader.rows(present):
+            if first is not None and _norm(values[0]) == first and [_norm(v) for v in values] == header:
+                continue
+            it = iter(values)
+            yield [next(it) if i >= 0 else "" for i in picks]
+
+
+class ExportRowStore:
+    """
+    The export rows projected onto the reconciliation `columns`, kept while the
+    export is parsed (streamed or read) so the join needs no second pass over the
+    file. Past `max_rows` the rows are dropped and `complete` turns False.
+    """
+
+    def __init__(self, columns: Sequence[str], max_rows: int = MAX_KEPT_ROWS) -> None:
+        self.columns = list(columns)
+        self.max_rows = max_rows
+        self.rows: list[tuple[str, ...]] = []
+        self.complete = True
+
+    def extend(self, rows: Iterable[tuple[str, ...]]) -> None:
+        if not self.complete:
+            return
+        self.rows.extend(rows)
+        if len(self.rows) > self.max_rows:
+            self.rows = []
+            self.complete = False
+
+
+@dataclass
+class ReconciliationResult:
+    key_columns: list[str]
+    csv_rows: int = 0
+    ui_rows: int = 0
+    matched: int = 0
+    missing_in_ui: int = 0
+    missing_in_csv: int = 0
+    mismatched_rows: int = 0
+    mismatched_fields: dict[str, int] = field(default_factory=dict)
+    duplicate_csv_keys: int = 0
+    ui_rows_without_key: int = 0
+    missing_in_csv_examples: list[str] = field(default_factory=list)
+    mismatch_examples: list[str] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.matched > 0 and not self.missing_in_csv and not self.mismatched_rows
+
+    def summary_lines(self) -> list[str]:
+        """Human-readable lines for the run log (❌ marks failures)."""
+        keys = " + ".join(self.key_columns)
+        lines = [f"Reconciliation on {keys}: {self.csv_rows} CSV rows vs {self.ui_rows} UI rows in "
+                 f"{self.elapsed_s:.2f}s - matched={self.matched}, missing_in_ui={self.missing_in_ui}, "
+                 f"missing_in_csv={self.missing_in_csv}, mismatched_rows={self.mismatched_rows}."]
+        if self.missing_in_ui:
+            lines.append(f"Notice: {self.missing_in_ui} CSV row(s) are not shown in the UI table "
+                         f"(the UI lists {self.ui_rows} row(s)).")
+        if self.duplicate_csv_keys:
+            lines.append(f"Notice: {self.duplicate_csv_keys} CSV row(s) repeat a key already matched.")
+        if self.ui_rows_without_key:
+            lines.append(f"Notice: {self.ui_rows_without_key} UI row(s) have no key value and were skipped.")
+        if self.missing_in_csv:
+            lines.append(f"❌ {self.missing_in_csv} UI row(s) not found in the export, e.g. "
+                         + "; ".join(self.missing_in_csv_examples))
+        for name, count in self.mismatched_fields.items():
+            if count:
+                lines.append(f"❌ Column '{name}' differs between export and UI in {count} matched row(s).")
+        if self.mismatch_examples:
+            lines.append("❌ Mismatch examples: " + "; ".join(self.mismatch_examples))
+        if self.ok:
+            lines.append("✅ Every UI row was found in the export with matching values.")
+        return lines
+
+
+class HashJoinReconciler:
+    """
+    Hash join between the UI rows (build side, small) and the export rows (probe
+    side, streamed). Both sides are lists aligned with `columns`; rows are joined
+    on `key_columns` (date/datetime keys compare on their date part only).
+    Duplicate UI keys are matched in order, one export row each.
+    """
+
+    def __init__(self,
+                 columns: Sequence[str],
+                 key_columns: Sequence[str],
+                 ui_rows: Sequence[Sequence[str]],
+                 comparator: Optional[ColumnComparator] = None) -> None:
+        by_name = {_norm(c): i for i, c in enumerate(columns)}
+        missing = [k for k in key_columns if _norm(k) not in by_name]
+        if missing:
+            raise ValueError(f"key column(s) not in the compared columns: {', '.join(missing)}")
+        self.columns = list(columns)
+        self.key_idx = [by_name[_norm(k)] for k in key_columns]
+        self._date_key = [is_date_column(k) for k in key_columns]
+        self.ui_rows = ui_rows
+        self.matchers = (comparator or ColumnComparator(columns)).matchers
+        self.result = ReconciliationResult(key_columns=list(key_columns), ui_rows=len(ui_rows),
+                                           mismatched_fields={c: 0 for c in columns})
+        self._index: dict[tuple[str, ...], list[int]] = {}
+        self._matched_ui: set[int] = set()
+        self._started = time.perf_counter()
+        for i, row in enumerate(ui_rows):
+            key = self.key_of(row)
+            if not any(key):
+                self.result.ui_rows_without_key += 1
+                continue
+            self._index.setdefault(key, []).append(i)
+
+    @property
+    def usable(self) -> bool:
+        """False when no UI row has a key (e.g. the key column isn't shown in the UI)."""
+        return bool(self._index)
+
+    def key_of(self, row: Sequence[str]) -> tuple[str, ...]:
+        key = []
+        for idx, date_only in zip(self.key_idx, self._date_key):
+            value = row[idx] if idx < len(row) else ""
+            key.append(date_key(value) if date_only else normalize_cell(value))
+        return tuple(key)
+
+    def probe(self, csv_row: Sequence[str]) -> Optional[int]:
+        """Join one export row; returns the matched UI row index or None."""
+        result = self.result
+        result.csv_rows += 1
+        key = self.key_of(csv_row)
+        candidates = self._index.get(key)
+        if not candidates:
+            result.missing_in_ui += 1
+            return None
+        ui_idx = next((i for i in candidates if i not in self._matched_ui), None)
+        if ui_idx is None:
+            result.duplicate_csv_keys += 1
+            return None
+
+        self._matched_ui.add(ui_idx)
+        result.matched += 1
+        ui_row = self.ui_rows[ui_idx]
+        bad = []
+        for j, (name, m) in enumerate(zip(self.columns, self.matchers)):
+            csv_val = csv_row[j] if j < len(csv_row) else ""
+            ui_val = ui_row[j] if j < len(ui_row) else ""
+            if not m.equal(m.normalize(csv_val), m.normalize(ui_val)):
+                result.mismatched_fields[name] += 1
+                bad.append(name)
+        if bad:
+            result.mismatched_rows += 1
+            if len(result.mismatch_examples) < MAX_EXAMPLES:
+                result.mismatch_examples.append(f"{' | '.join(key)}: {', '.join(bad)}")
+        return ui_idx
+
+    def finish(self) -> ReconciliationResult:
+        result = self.result
+        for key, rows in self._index.items():
+            for i in rows:
+                if i not in self._matched_ui:
+                    result.missing_in_csv += 1
+                    if len(result.missing_in_csv_examples) < MAX_EXAMPLES:
+                        result.missing_in_csv_examples.append(" | ".join(key))
+        result.elapsed_s = time.perf_counter() - self._started
+        return result
+
+
+def reconcile_rows(reconciler: HashJoinReconciler, rows: Iterable[Sequence[str]],
+                   sample_rows: int = 0) -> tuple[ReconciliationResult, list[Optional[int]]]:
+    """
+    Probe every export row (aligned with reconciler.columns) and finish the join.
+    Also returns the matched UI row index (or None) of the first `sample_rows` export rows.
+    """
+    sample_matches: list[Optional[int]] = []
+    for row in rows:
+        ui_idx = reconciler.probe(row)
+        if len(sample_matches) < sample_rows:
+            sample_matches.append(ui_idx)
+    return reconciler.finish(), sample_matches
+
+
+def reconcile_csv_file(reconciler: HashJoinReconciler, path: Path, sample_rows: int = 0,
+                       kind: str = "") -> tuple[ReconciliationResult, list[Optional[int]]]:
+    """reconcile_rows over the export file, streamed again (one pass, constant memory)."""
+    return reconcile_rows(reconciler, iter_projected_rows(path, reconciler.columns, kind=kind), sample_rows)
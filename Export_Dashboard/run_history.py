@@ -0,0 +1,364 @@
+"""
+Local history of export validation runs (SQLite) and latency / SLA report.
+
+    python run_history.py report [--db run_history.sqlite] [--days 30] [--customer NAME] [--type contact]
+                                 [--recent 5] [--baseline 20] [--threshold 0.25] [--json]
+    python run_history.py runs [--db run_history.sqlite] [--limit 20]
+
+Every run (GUI, batch_runner, export_cli) is recorded when it ends, passed or
+failed: stage durations, and per export the dashboard status transitions seen
+while polling, trigger -> 100% -> downloaded times, file size, row count and
+the UI match rate. `report` shows p50/p95 trigger-to-download latency per
+env, customer and export type and flags a regression when the p50 of the latest
+`--recent` runs is more than `--threshold` above the p50 of the `--baseline`
+runs before them (exit code 1 when any group is flagged, for scheduled checks).
+"""
+from __future__ import annotations
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from configparser import ConfigParser
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+# ─── Configuration ─────────────────────────────────────────────
+# config.ini:
+#   [run_history]               ; without this section no history is recorded
+#   enabled = true
+#   path = run_history.sqlite   ; a relative path is taken from the config.ini folder
+DEFAULT_PATH = Path("run_history.sqlite")
+RECENT_RUNS = 5
+BASELINE_RUNS = 20
+REGRESSION_THRESHOLD = 0.25  # recent p50 this much above the baseline p50 is flagged
+MIN_BASELINE_RUNS = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    env TEXT,
+    customer TEXT,
+    selection TEXT,          -- export selection of the run, e.g. "Contact Export + Sticket Export"
+    label TEXT,
+    ok INTEGER NOT NULL,
+    error TEXT,
+    total_s REAL,
+    report_path TEXT
+);
+CREATE TABLE IF NOT EXISTS stages (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    stage TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    customer TEXT,
+    export_type TEXT,
+    export_id TEXT,
+    triggered_at REAL,
+    finished_at REAL,        -- first poll showing 100% or a terminal state
+    downloaded_at REAL,
+    final_status TEXT,
+    to_finished_s REAL,
+    to_download_s REAL,      -- trigger -> file downloaded and validated
+    file_bytes INTEGER,
+    row_count INTEGER,
+    match_rate REAL          -- matching / compared sample cells (UI comparison)
+);
+CREATE TABLE IF NOT EXISTS transitions (
+    export_pk INTEGER NOT NULL REFERENCES exports(id),
+    at REAL NOT NULL,
+    status TEXT,
+    percent INTEGER
+);
+CREATE INDEX IF NOT EXISTS exports_by_job ON exports(customer, export_type, triggered_at);
+"""
+
+
+# ─── Per-run metrics (filled in while the run goes) ──────────────
+@dataclass
+class ExportMetrics:
+    export_type: str
+    export_id: str = ""
+    row_key: str = ""
+    triggered_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    downloaded_at: Optional[float] = None
+    final_status: str = ""
+    file_bytes: Optional[int] = None
+    row_count: Optional[int] = None
+    match_rate: Optional[float] = None
+    transitions: list[tuple[float, str, int]] = field(default_factory=list)  # (time, status, percent)
+
+    def record_status(self, status: str, percent: int, finished: bool, at: Optional[float] = None) -> None:
+        """Keep the poll result if it differs from the last one seen."""
+        at = time.time() if at is None else at
+        if not self.transitions or self.transitions[-1][1:] != (status, percent):
+            self.transitions.append((at, status, percent))
+        self.final_status = status
+        if finished and self.finished_at is None:
+            self.finished_at = at
+
+    def record_download(self, file_bytes: int, row_count: int, at: Optional[float] = None) -> None:
+        self.downloaded_at = time.time() if at is None else at
+        self.file_bytes = file_bytes
+        self.row_count = row_count
+
+    def record_match_matrix(self, matrix: Optional[list[list[bool]]]) -> None:
+        cells = [bool(c) for row in matrix or [] for c in row]
+        self.match_rate = sum(cells) / len(cells) if cells else None
+
+    def since_trigger(self, at: Optional[float]) -> Optional[float]:
+        if at is None or self.triggered_at is None:
+            return None
+        return at - self.triggered_at
+
+
+class RunMetrics:
+    """Export metrics of one run, by export type; updated from the run's threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.exports: dict[str, ExportMetrics] = {}
+
+    def export(self, export_type: str) -> ExportMetrics:
+        with self._lock:
+            metrics = self.exports.get(export_type)
+            if metrics is None:
+                metrics = self.exports[export_type] = ExportMetrics(export_type)
+            return metrics
+
+    def for_row(self, row_key: str) -> Optional[ExportMetrics]:
+        with self._lock:
+            return next((m for m in self.exports.values() if m.row_key == row_key), None)
+
+
+# ─── Store ─────────────────────────────────────────────────────
+class RunHistory:
+    """The SQLite run-history file; one short connection per write, safe across threads."""
+
+    _write_lock = threading.Lock()
+
+    def __init__(self, path: Path = DEFAULT_PATH, enabled: bool = True) -> None:
+        self.path = Path(path)
+        self.enabled = enabled
+
+    @classmethod
+    def from_config(cls, config: ConfigParser, base_dir: Optional[Path] = None) -> "RunHistory":
+        """Off unless config.ini has a [run_history] section; a relative path is resolved against `base_dir`."""
+        path = Path(config.get("run_history", "path", fallback=str(DEFAULT_PATH)))
+        if not path.is_absolute() and base_dir is not None:
+            path = Path(base_dir) / path
+        return cls(
+            path=path,
+            enabled=(config.has_section("run_history")
+                     and config.getboolean("run_history", "enabled", fallback=True)),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def record_run(self, *, started_at: float, env: str, customer: str, selection: str, label: str,
+                   ok: bool, error: Optional[str], stages: dict[str, float], metrics: RunMetrics,
+                   report_path: str = "") -> Optional[int]:
+        """Write one finished run; returns its id (None when the history is off)."""
+        if not self.enabled:
+            return None
+        finished_at = time.time()
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            run_id = conn.execute(
+                "INSERT INTO runs (started_at, finished_at, env, customer, selection, label, ok, error, "
+                "total_s, report_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (started_at, finished_at, env, customer, selection, label, int(ok), error,
+                 finished_at - started_at, report_path),
+            ).lastrowid
+            conn.executemany("INSERT INTO stages (run_id, stage, seconds) VALUES (?, ?, ?)",
+                             [(run_id, stage, seconds) for stage, seconds in stages.items()])
+            for m in list(metrics.exports.values()):
+                export_pk = conn.execute(
+                    "INSERT INTO exports (run_id, customer, export_type, export_id, triggered_at, finished_at, "
+                    "downloaded_at, final_status, to_finished_s, to_download_s, file_bytes, row_count, match_rate) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, customer, m.export_type, m.export_id, m.triggered_at, m.finished_at,
+                     m.downloaded_at, m.final_status, m.since_trigger(m.finished_at),
+                     m.since_trigger(m.downloaded_at), m.file_bytes, m.row_count, m.match_rate),
+                ).lastrowid
+                conn.executemany("INSERT INTO transitions (export_pk, at, status, percent) VALUES (?, ?, ?, ?)",
+                                 [(export_pk, at, status, percent) for at, status, percent in m.transitions])
+        return run_id
+
+    def export_rows(self, since: Optional[float] = None, customer: Optional[str] = None,
+                    export_type: Optional[str] = None) -> list[sqlite3.Row]:
+        """Exported files of passed runs, oldest first."""
+        if not self.path.exists():
+            return []
+        query = ("SELECT e.*, r.env FROM exports e JOIN runs r ON r.id = e.run_id "
+                 "WHERE r.ok = 1 AND e.to_download_s IS NOT NULL")
+        params: list = []
+        if since is not None:
+            query += " AND e.triggered_at >= ?"
+            params.append(since)
+        if customer:
+            query += " AND lower(e.customer) = lower(?)"
+            params.append(customer)
+        if export_type:
+            query += " AND lower(e.export_type) LIKE lower(?)"
+            params.append(f"%{export_type}%")
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(query + " ORDER BY e.triggered_at", params).fetchall()
+
+    def recent_runs(self, limit: int = 20) -> list[sqlite3.Row]:
+        if not self.path.exists():
+            return []
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            return conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+
+
+# ─── Report ────────────────────────────────────────────────────
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile (q in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+@dataclass
+class LatencySummary:
+    env: str
+    customer: str
+    export_type: str
+    runs: int
+    p50_s: Optional[float]
+    p95_s: Optional[float]
+    p50_to_finished_s: Optional[float]
+    p50_mb: Optional[float]
+    p50_rows: Optional[float]
+    p50_match_rate: Optional[float]
+    recent_p50_s: Optional[float] = None
+    baseline_p50_s: Optional[float] = None
+    regression: bool = False
+
+
+def summarize(rows: list[sqlite3.Row], recent: int = RECENT_RUNS, baseline: int = BASELINE_RUNS,
+              threshold: float = REGRESSION_THRESHOLD) -> list[LatencySummary]:
+    """p50/p95 per (env, customer, export type), and the latest `recent` runs against the `baseline` before them."""
+    groups: dict[tuple[str, str, str], list[sqlite3.Row]] = {}
+    for row in rows:
+        groups.setdefault((row["env"] or "", row["customer"], row["export_type"]), []).append(row)
+
+    def p50(values) -> Optional[float]:
+        return percentile([v for v in values if v is not None], 50)
+
+    out = []
+    for (env, customer, export_type), items in sorted(groups.items()):
+        latency = [r["to_download_s"] for r in items]
+        summary = LatencySummary(
+            env=env,
+            customer=customer,
+            export_type=export_type,
+            runs=len(items),
+            p50_s=percentile(latency, 50),
+            p95_s=percentile(latency, 95),
+            p50_to_finished_s=p50(r["to_finished_s"] for r in items),
+            p50_mb=p50(r["file_bytes"] / (1024 * 1024) if r["file_bytes"] is not None else None for r in items),
+            p50_rows=p50(r["row_count"] for r in items),
+            p50_match_rate=p50(r["match_rate"] for r in items),
+        )
+        trailing = latency[-(recent + baseline):-recent] if len(latency) > recent else []
+        if len(trailing) >= MIN_BASELINE_RUNS:
+            summary.recent_p50_s = percentile(latency[-recent:], 50)
+            summary.baseline_p50_s = percentile(trailing, 50)
+            summary.regression = summary.recent_p50_s > summary.baseline_p50_s * (1 + threshold)
+        out.append(summary)
+    return out
+
+
+def _fmt(value: Optional[float], unit: str = "s", digits: int = 1) -> str:
+    return "-" if value is None else f"{value:.{digits}f}{unit}"
+
+
+def print_report(summaries: list[LatencySummary], threshold: float) -> None:
+    if not summaries:
+        print("No recorded exports yet.")
+        return
+    print(f"{'Env':4} {'Customer':28} {'Export':16} {'runs':>5} {'p50':>8} {'p95':>8} {'to 100%':>8} "
+          f"{'MB':>7} {'rows':>9} {'match':>6}  trend")
+    for s in summaries:
+        trend = "-"
+        if s.baseline_p50_s is not None:
+            change = (s.recent_p50_s / s.baseline_p50_s - 1) * 100 if s.baseline_p50_s else 0.0
+            trend = f"{change:+.0f}% vs baseline {s.baseline_p50_s:.1f}s"
+            if s.regression:
+                trend = "❌ REGRESSION " + trend
+        print(f"{s.env or '-':4} {s.customer[:28]:28} {s.export_type[:16]:16} {s.runs:>5} {_fmt(s.p50_s):>8} {_fmt(s.p95_s):>8} "
+              f"{_fmt(s.p50_to_finished_s):>8} {_fmt(s.p50_mb, '', 1):>7} {_fmt(s.p50_rows, '', 0):>9} "
+              f"{_fmt(s.p50_match_rate * 100 if s.p50_match_rate is not None else None, '%', 0):>6}  {trend}")
+    print(f"(latency = trigger to downloaded file; regression = latest runs' p50 more than "
+          f"{threshold * 100:.0f}% above the trailing baseline's)")
+
+
+# ─── Command line ──────────────────────────────────────────────
+def cmd_report(args: argparse.Namespace) -> int:
+    history = RunHistory(args.db)
+    since = time.time() - args.days * 86400 if args.days else None
+    summaries = summarize(history.export_rows(since, args.customer, args.type),
+                          recent=args.recent, baseline=args.baseline, threshold=args.threshold)
+    if args.json:
+        print(json.dumps([s.__dict__ for s in summaries], indent=2))
+    else:
+        print_report(summaries, args.threshold)
+    return 1 if any(s.regression for s in summaries) else 0
+
+
+def cmd_runs(args: argparse.Namespace) -> int:
+    for r in RunHistory(args.db).recent_runs(args.limit):
+        marker = "✅" if r["ok"] else "❌"
+        started = time.strftime("%Y-%m-%d %H:%M", time.localtime(r["started_at"]))
+        print(f"{marker} {started} {r['env'] or '-':4} {r['customer'] or '-':28} {r['selection'] or '-':32} "
+              f"{r['total_s']:7.1f}s" + (f"  {r['error']}" if r["error"] else ""))
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    db = argparse.ArgumentParser(add_help=False)
+    db.add_argument("--db", type=Path, default=DEFAULT_PATH, help="The run-history file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report", parents=[db],
+                                 help="p50/p95 export latency per env, customer and export type.")
+    report.add_argument("--days", type=float, default=None, help="Only exports from the last N days.")
+    report.add_argument("--customer", default=None)
+    report.add_argument("--type", default=None, help="Export type (substring, e.g. contact).")
+    report.add_argument("--recent", type=int, default=RECENT_RUNS)
+    report.add_argument("--baseline", type=int, default=BASELINE_RUNS)
+    report.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    report.add_argument("--json", action="store_true")
+    report.set_defaults(handler=cmd_report)
+
+    runs = commands.add_parser("runs", parents=[db], help="The latest runs.")
+    runs.add_argument("--limit", type=int, default=20)
+    runs.set_defaults(handler=cmd_runs)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,317 @@
+from __future__ import annotations
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import common_path  # noqa: F401 (repo root on sys.path for cozeva_common)
+from dashboard_rows import DashboardIndex, DashboardRow, ExportStatus, parse_dashboard_rows
+from cozeva_common.http_session import BrowserHttpSession
+
+# ─── Configuration ─────────────────────────────────────────────
+# config.ini:
+#   [export_dashboard]
+#   status_poll = http        ; "http" (default) or "dom"
+#   status_url = https://...  ; endpoint returning the dashboard table (HTML or DataTables JSON);
+#                             ; defaults to the dashboard page itself
+#   poll_min_s = 2
+#   poll_max_s = 30
+#   shared_poll = true        ; one HTTP poller per (env, customer, user, status_url) for the jobs in
+#                             ; this process (SharedDashboardPoller); false: each job polls alone
+POLL_MIN_SECONDS = 2.0
+POLL_MAX_SECONDS = 30.0
+POLL_INITIAL_SECONDS = 6.0
+SHARED_MISSING_POLLS = 3  # a watched row absent this many polls in a row is not visible to the shared session
+
+
+class AdaptiveBackoff:
+    """
+    Picks the next poll delay from how fast the percentage is rising:
+    about half the estimated time to 100%, clamped to [min_s, max_s].
+    No progress since the last poll grows the delay by 1.5x.
+    """
+
+    def __init__(self, min_s: float = POLL_MIN_SECONDS, max_s: float = POLL_MAX_SECONDS,
+                 initial_s: float = POLL_INITIAL_SECONDS) -> None:
+        self.min_s = min_s
+        self.max_s = max_s
+        self.delay = min(max(initial_s, min_s), max_s)
+        self._last: Optional[tuple[float, int]] = None
+
+    def next_delay(self, percent: int, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        if self._last is not None:
+            last_t, last_p = self._last
+            if percent > last_p and now > last_t:
+                rate = (percent - last_p) / (now - last_t)  # percent per second
+                self.delay = (100 - percent) / rate / 2
+            else:
+                self.delay *= 1.5
+        self.delay = min(max(self.delay, self.min_s), self.max_s)
+        self._last = (now, percent)
+        return self.delay
+
+
+def fetch_dashboard_rows(http: BrowserHttpSession, status_url: str) -> list[DashboardRow]:
+    """One HTTP read of the dashboard table; raises when it isn't usable (error, login page, no rows)."""
+    resp = http.get(status_url, headers={"X-Requested-With": "XMLHttpRequest"})
+    if resp.status != 200:
+        raise RuntimeError(f"HTTP {resp.status} from status endpoint")
+    body = resp.data.decode("utf-8", errors="replace")
+    rows = parse_dashboard_rows(body, resp.headers.get("Content-Type", ""), source="http")
+    if not any(row.status is not None for row in rows):
+        raise RuntimeError("no status-info found in status response")
+    return rows
+
+
+class ExportStatusPoller:
+    """
+    Polls the Export Dashboard until the tracked exports reach 100% or a terminal state.
+
+    Each poll reads the whole dashboard table (parse_dashboard_rows), and exports are
+    tracked by row key, not position, so new rows from other exports don't matter and
+    tracking several exports costs no more requests than tracking one. Uses a pooled
+    HTTP session with the browser's cookies against `status_url`; on any HTTP problem
+    (error status, redirect to login, no export rows found) it switches to `dom_fetch`
+    (page refresh + table read) for the rest of the run.
+    """
+
+    def __init__(self,
+                 dom_fetch: Callable[[], list[DashboardRow]],
+                 http: Optional[BrowserHttpSession] = None,
+                 status_url: Optional[str] = None,
+                 backoff: Optional[AdaptiveBackoff] = None,
+                 sleep: Callable[[float], None] = time.sleep,
+                 log: Callable[[str], None] = print) -> None:
+        self.dom_fetch = dom_fetch  # every dashboard row, in table order
+        self.http = http
+        self.status_url = status_url
+        self.backoff = backoff or AdaptiveBackoff()
+        self.sleep = sleep
+        self.log = log
+        self.use_http = http is not None and bool(status_url)
+        self.polls = 0
+
+    def _fetch_http(self) -> list[DashboardRow]:
+        return fetch_dashboard_rows(self.http, self.status_url)
+
+    def poll_once(self) -> DashboardIndex:
+        """Every dashboard row of one fetch, indexed."""
+        self.polls += 1
+        if self.use_http:
+            try:
+                return DashboardIndex(self._fetch_http())
+            except Exception as e:
+                self.use_http = False
+                self.log(f"Notice: HTTP status polling unavailable ({e}); falling back to page refresh.")
+        return DashboardIndex(self.dom_fetch())
+
+    def wait_until_finished(self, key: str,
+                            on_status: Optional[Callable[[ExportStatus], None]] = None) -> DashboardRow:
+        """Wait for the export in the row with `key`; returns that row as last seen."""
+        report = (lambda _, status: on_status(status)) if on_status is not None else None
+        return self.wait_for_rows([key], on_status=report)[key]
+
+    def wait_for_rows(self,
+                      keys: list[str],
+                      on_status: Optional[Callable[[str, ExportStatus], None]] = None,
+                      on_finished: Optional[Callable[[str, DashboardRow], None]] = None
+                      ) -> dict[str, DashboardRow]:
+        """
+        Poll until the exports in the rows with `keys` (DashboardRow.key) are all
+        finished; returns those rows as last seen (status, download link).
+        on_finished(key, row) is called as soon as a row finishes, while the
+        others are still being polled.
+        """
+        finished: dict[str, DashboardRow] = {}
+        while True:
+            index = self.poll_once()
+            percents: list[int] = []
+            for key in [k for k in keys if k not in finished]:
+                row = index.get(key)
+                if row is None:
+                    self.log(f"Notice: export row {key} not on the dashboard in this poll.")
+                    continue
+                status = row.status
+                if status is None:
+                    continue
+                if on_status is not None:
+                    on_status(key, status)
+                if status.finished:
+                    finished[key] = row
+                    if on_finished is not None:
+                        on_finished(key, row)
+                else:
+                    percents.append(status.percent)
+            if len(finished) == len(keys):
+                return {key: finished[key] for key in keys}
+            if not percents:
+                self.log("❌ Unexpected status text format, retrying after wait...")
+                self.sleep(self.backoff.delay)
+                continue
+            # the slowest export still running sets the pace
+            delay = self.backoff.next_delay(min(percents))
+            self.log(f"Progress {min(percents)}% - next status check in {delay:.1f}s "
+                     f"({'http' if self.use_http else 'dom'}).")
+            self.sleep(delay)
+
+
+# ─── Shared poller ─────────────────────────────────────────────
+class SharedPollUnavailable(Exception):
+    """The shared poller can't serve a watch; `finished` holds the rows it did deliver as finished."""
+
+    def __init__(self, message: str, finished: Optional[dict[str, DashboardRow]] = None) -> None:
+        super().__init__(message)
+        self.finished = finished or {}
+
+
+@dataclass(eq=False)
+class _Watch:
+    keys: list[str]
+    http: BrowserHttpSession
+    updates: queue.Queue = field(default_factory=queue.Queue)  # (key, row); (None, error) ends the watch
+    missing: dict[str, int] = field(default_factory=dict)
+    delivered: set = field(default_factory=set)  # keys delivered as finished
+    http_failed: bool = False
+
+
+class SharedDashboardPoller:
+    """
+    One dashboard poller for every export job of the same (env, customer, user) in
+    this process: every watch's session sees the same dashboard.
+
+    A background thread fetches the dashboard table over HTTP once per cycle and
+    hands each job (a watch) the rows it waits for, so the dashboard load depends
+    on the number of pollers, not on the number of exports in flight. The pace
+    follows the slowest export still running (AdaptiveBackoff). Each watch
+    brings an HTTP session with its own browser's cookies; the first working one
+    is used. A new watch waits for the next cycle (its row was just read when it
+    was located), so jobs joining don't add fetches. When no session works, or a row stays invisible to the shared
+    session, the watch ends with SharedPollUnavailable and the job polls alone.
+    """
+
+    def __init__(self, status_url: str, backoff: Optional[AdaptiveBackoff] = None,
+                 log: Callable[[str], None] = print, name: str = "dashboard") -> None:
+        self.status_url = status_url
+        self.backoff = backoff or AdaptiveBackoff()
+        self.log = log
+        self.name = name
+        self.fetches = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._watches: list[_Watch] = []
+        self._retired: list[BrowserHttpSession] = []
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def watching(self) -> int:
+        with self._lock:
+            return sum(len(w.keys) - len(w.delivered) for w in self._watches)
+
+    def _add(self, watch: _Watch) -> None:
+        with self._lock:
+            self._watches.append(watch)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"shared-poll-{self.name}", daemon=True)
+                self._thread.start()
+
+    def _remove(self, watch: _Watch) -> None:
+        """Stop serving `watch` and retire its session; a second call does nothing."""
+        with self._lock:
+            if watch not in self._watches:
+                return
+            self._watches.remove(watch)
+            self._retired.append(watch.http)  # closed by the poll thread, which may be using it
+            if not self._watches:
+                self._wake.set()  # let the thread finish now
+
+    def wait_for_rows(self, http: BrowserHttpSession, keys: list[str],
+                      on_status: Optional[Callable[[str, ExportStatus], None]] = None,
+                      on_finished: Optional[Callable[[str, DashboardRow], None]] = None,
+                      check_cancelled: Optional[Callable[[], None]] = None) -> dict[str, DashboardRow]:
+        """
+        ExportStatusPoller.wait_for_rows served by the shared poll thread; the callbacks
+        run in the calling thread. Takes ownership of `http` (closed when done).
+        """
+        watch = _Watch(list(keys), http)
+        finished: dict[str, DashboardRow] = {}
+        self._add(watch)
+        try:
+            while len(finished) < len(keys):
+                try:
+                    key, row = watch.updates.get(timeout=0.5)
+                except queue.Empty:
+                    if check_cancelled is not None:
+                        check_cancelled()
+                    continue
+                if key is None:
+                    raise SharedPollUnavailable(row, finished)
+                if on_status is not None:
+                    on_status(key, row.status)
+                if row.status.finished:
+                    finished[key] = row
+                    if on_finished is not None:
+                        on_finished(key, row)
+            return {key: finished[key] for key in keys}
+        finally:
+            self._remove(watch)
+
+    def _fetch(self, watches: list[_Watch]) -> list[DashboardRow]:
+        errors = []
+        for watch in watches:
+            if watch.http_failed:
+                continue
+            try:
+                return fetch_dashboard_rows(watch.http, self.status_url)
+            except Exception as e:
+                watch.http_failed = True
+                errors.append(str(e))
+        raise RuntimeError("; ".join(errors) or "no usable session")
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                retired, self._retired = self._retired, []
+                watches = list(self._watches)
+                if not watches:
+                    self._thread = None
+            for http in retired:
+                http.close()
+            if not watches:
+                return
+
+            self._wake.clear()
+            self.fetches += 1
+            try:
+                index = DashboardIndex(self._fetch(watches))
+            except Exception as e:
+                for watch in watches:
+                    watch.updates.put((None, f"shared HTTP poll failed ({e})"))
+                    self._remove(watch)
+                continue
+
+            percents: list[int] = []
+            for watch in watches:
+                for key in watch.keys:
+                    if key in watch.delivered:
+                        continue
+                    row = index.get(key)
+                    if row is None:
+                        watch.missing[key] = watch.missing.get(key, 0) + 1
+                        if watch.missing[key] >= SHARED_MISSING_POLLS:
+                            watch.updates.put((None, f"export row {key} not visible to the shared poller"))
+                            self._remove(watch)
+                            break
+                        continue
+                    watch.missing.pop(key, None)
+                    if row.status is None:
+                        continue
+                    watch.updates.put((key, row))
+                    if row.status.finished:
+                        watch.delivered.add(key)
+                    else:
+                        percents.append(row.status.percent)
+
+            delay = self.backoff.next_delay(min(percents)) if percents else self.backoff.delay
+            self._wake.wait(delay)
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# the app's modules are imported by name, as when it runs from its folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import common_path  # noqa: E402,F401 (repo root on sys.path for cozeva_common)
@@ -0,0 +1,45 @@
+"""JSONL run log rotation ([logging] jsonl_max_mb / jsonl_backups)."""
+from __future__ import annotations
+import json
+
+import pytest
+
+from cozeva_common import run_log
+from cozeva_common.run_log import RunLog, set_jsonl_rotation
+
+
+@pytest.fixture
+def small_rotation():
+    set_jsonl_rotation(2 / 1024, 2)  # 2 KB, two old files
+    yield
+    set_jsonl_rotation(run_log.JSONL_MAX_MB, run_log.JSONL_BACKUPS)
+
+
+def test_jsonl_log_rotates_and_keeps_backups(tmp_path, small_rotation):
+    path = tmp_path / "validation_log.jsonl"
+    for run in range(4):
+        log = RunLog(jsonl_path=path, console_level=100)
+        for i in range(40):
+            log.emit(f"run {run} line {i} " + "x" * 40)
+        log.close()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["validation_log.jsonl", "validation_log.jsonl.1", "validation_log.jsonl.2"]
+    for name in files:
+        assert (tmp_path / name).stat().st_size <= 2048
+    newest = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert newest[-1]["message"].startswith("run 3 line 39 ")
+
+
+def test_jsonl_rotation_off(tmp_path):
+    set_jsonl_rotation(0, 2)
+    try:
+        path = tmp_path / "log.jsonl"
+        log = RunLog(jsonl_path=path, console_level=100)
+        for i in range(100):
+            log.emit("x" * 100)
+        log.close()
+    finally:
+        set_jsonl_rotation(run_log.JSONL_MAX_MB, run_log.JSONL_BACKUPS)
+    assert [p.name for p in tmp_path.iterdir()] == ["log.jsonl"]
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 100
@@ -0,0 +1,250 @@
+"""ExportStatusPoller and SharedDashboardPoller against a local stand-in of the dashboard endpoint."""
+from __future__ import annotations
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cozeva_common.http_session import BrowserHttpSession
+from status_poller import (
+    SHARED_MISSING_POLLS,
+    AdaptiveBackoff,
+    ExportStatusPoller,
+    SharedDashboardPoller,
+    SharedPollUnavailable,
+)
+
+
+def dashboard_html(rows: list[tuple[str, str, int]]) -> str:
+    """The dashboard table with one row per (export id, status, percent)."""
+    cells = []
+    for n, (export_id, status, percent) in enumerate(rows):
+        cells.append(
+            f"<tr role='row' class='{'odd' if n % 2 == 0 else 'even'}'><td>{export_id}</td>"
+            "<td class='export-dashboard-row_pt'>qa.user</td>"
+            "<td class='export-dashboard-row_pt'>01/02/2026 10:00</td>"
+            "<td>Customer A</td>"
+            "<td class='export-dashboard-row_pt'>Contact Export</td>"
+            f"<td><div class='status-info'><div>Export</div><div>{status}</div><div>{percent}%</div></div></td>"
+            f"<td><a href='/unified_file_download?id={export_id}'>Download</a></td></tr>")
+    return f"<html><body><table>{''.join(cells)}</table></body></html>"
+
+
+class StandIn:
+    """
+    Local HTTP server for the dashboard endpoint. `respond(n)` gives the
+    (status, headers, body) of the n-th request (0-based).
+    """
+
+    def __init__(self, respond) -> None:
+        self.respond = respond
+        self.requests: list[dict[str, str]] = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                n = len(stand_in.requests)
+                stand_in.requests.append(dict(self.headers))
+                status, headers, body = stand_in.respond(n)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                for name, value in {"Content-Type": "text/html", **headers}.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/export_dashboard"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    servers: list[StandIn] = []
+
+    def start(respond) -> StandIn:
+        servers.append(StandIn(respond))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def http_session() -> BrowserHttpSession:
+    return BrowserHttpSession({"SESSID": "abc"}, user_agent="pytest")
+
+
+def progress(*steps: list[tuple[str, str, int]]):
+    """respond() walking through `steps` (one dashboard per request, the last one repeated)."""
+    return lambda n: (200, {}, dashboard_html(steps[min(n, len(steps) - 1)]))
+
+
+def no_dom() -> list:
+    raise AssertionError("DOM fallback used")
+
+
+def fast_backoff() -> AdaptiveBackoff:
+    return AdaptiveBackoff(min_s=0.01, max_s=0.05, initial_s=0.01)
+
+
+# ─── ExportStatusPoller ────────────────────────────────────────
+def test_polls_over_http_until_success(stand_in):
+    server = stand_in(progress([("7", "In Progress", 0)], [("7", "In Progress", 50)], [("7", "Success", 100)]))
+    sleeps: list[float] = []
+    poller = ExportStatusPoller(no_dom, http=http_session(), status_url=server.url,
+                                sleep=sleeps.append, log=lambda _: None)
+    seen: list[int] = []
+
+    row = poller.wait_until_finished("7", on_status=lambda status: seen.append(status.percent))
+
+    assert row.status.status == "Success" and row.status.source == "http"
+    assert row.download_href == "/unified_file_download?id=7"
+    assert seen == [0, 50, 100]
+    assert poller.polls == 3 and len(sleeps) == 2 and poller.use_http
+    assert server.requests[0]["Cookie"] == "SESSID=abc"
+    assert server.requests[0]["X-Requested-With"] == "XMLHttpRequest"
+
+
+def test_retry_after_is_waited_out_without_leaving_http(stand_in):
+    def respond(n):
+        if n == 0:
+            return 503, {"Retry-After": "1"}, "busy"
+        return 200, {}, dashboard_html([("7", "Success", 100)])
+
+    server = stand_in(respond)
+    poller = ExportStatusPoller(no_dom, http=http_session(), status_url=server.url,
+                                sleep=lambda _: None, log=lambda _: None)
+
+    row = poller.wait_until_finished("7")
+
+    assert row.status.status == "Success"
+    assert len(server.requests) == 2  # the 503 was retried after Retry-After
+    assert poller.use_http
+
+
+def test_terminal_state_ends_the_wait(stand_in):
+    server = stand_in(progress([("7", "In Progress", 20)], [("7", "Unsuccessful", 40)]))
+    poller = ExportStatusPoller(no_dom, http=http_session(), status_url=server.url,
+                                sleep=lambda _: None, log=lambda _: None)
+
+    row = poller.wait_until_finished("7")
+
+    assert row.status.status == "Unsuccessful" and row.status.percent == 40
+    assert row.status.finished
+    assert poller.polls == 2
+
+
+def test_http_errors_fall_back_to_dom_polling(stand_in):
+    server = stand_in(lambda n: (500, {}, "error"))
+    dom_reads: list[int] = []
+
+    def dom_fetch():
+        from dashboard_rows import parse_dashboard_rows
+        dom_reads.append(1)
+        percent = 100 if len(dom_reads) > 1 else 60
+        status = "Success" if percent == 100 else "In Progress"
+        return parse_dashboard_rows(dashboard_html([("7", status, percent)]), "text/html", source="dom")
+
+    logs: list[str] = []
+    poller = ExportStatusPoller(dom_fetch, http=http_session(), status_url=server.url,
+                                sleep=lambda _: None, log=logs.append)
+
+    row = poller.wait_until_finished("7")
+
+    assert row.status.source == "dom" and row.status.status == "Success"
+    assert not poller.use_http and len(dom_reads) == 2
+    assert len(server.requests) == 1  # HTTP is not tried again after the fallback
+    assert any("falling back to page refresh" in line for line in logs)
+
+
+def test_several_rows_share_each_fetch(stand_in):
+    server = stand_in(progress(
+        [("8", "In Progress", 10), ("7", "In Progress", 30)],
+        [("8", "In Progress", 60), ("7", "Success", 100)],
+        [("8", "Success", 100), ("7", "Success", 100)],
+    ))
+    poller = ExportStatusPoller(no_dom, http=http_session(), status_url=server.url,
+                                sleep=lambda _: None, log=lambda _: None)
+    finished: list[str] = []
+
+    rows = poller.wait_for_rows(["7", "8"], on_finished=lambda key, row: finished.append(key))
+
+    assert finished == ["7", "8"]
+    assert set(rows) == {"7", "8"} and len(server.requests) == 3
+
+
+# ─── SharedDashboardPoller ─────────────────────────────────────
+def test_shared_poller_serves_every_watch_from_one_fetch_per_cycle(stand_in):
+    jobs = [str(n) for n in range(10)]
+
+    def respond(n):
+        percent = min(100, n * 25)
+        status = "Success" if percent == 100 else "In Progress"
+        return 200, {}, dashboard_html([(key, status, percent) for key in jobs])
+
+    server = stand_in(respond)
+    poller = SharedDashboardPoller(server.url, backoff=fast_backoff(), log=lambda _: None)
+    results: dict[str, object] = {}
+
+    def job(key: str) -> None:
+        results[key] = poller.wait_for_rows(http_session(), [key])[key]
+
+    threads = [threading.Thread(target=job, args=(key,)) for key in jobs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert sorted(results) == sorted(jobs)
+    assert all(row.status.status == "Success" for row in results.values())
+    assert poller.fetches == len(server.requests) <= 8  # not one fetch per job and cycle
+    assert poller.watching == 0
+
+
+def test_shared_poller_gives_up_on_a_row_it_cannot_see(stand_in):
+    server = stand_in(progress([("7", "Success", 100)]))
+    poller = SharedDashboardPoller(server.url, backoff=fast_backoff(), log=lambda _: None)
+
+    with pytest.raises(SharedPollUnavailable) as caught:
+        poller.wait_for_rows(http_session(), ["7", "9"])
+
+    assert "9" in str(caught.value)
+    assert set(caught.value.finished) == {"7"}  # handed over to the job's own poller
+    assert len(server.requests) == SHARED_MISSING_POLLS
+
+
+def test_shared_poller_reports_http_failure(stand_in):
+    server = stand_in(lambda n: (500, {}, "error"))
+    poller = SharedDashboardPoller(server.url, backoff=fast_backoff(), log=lambda _: None)
+
+    with pytest.raises(SharedPollUnavailable, match="shared HTTP poll failed"):
+        poller.wait_for_rows(http_session(), ["7"])
+    assert len(server.requests) == 1
+
+
+def test_shared_poller_retires_a_failed_session_once(stand_in):
+    server = stand_in(lambda n: (500, {}, "error"))
+    poller = SharedDashboardPoller(server.url, backoff=fast_backoff(), log=lambda _: None)
+    http = http_session()
+    closes: list[int] = []
+    close = http.close
+    http.close = lambda: (closes.append(1), close())
+
+    with pytest.raises(SharedPollUnavailable):
+        poller.wait_for_rows(http, ["7"])  # removed by the poll thread, then by wait_for_rows
+    deadline = time.monotonic() + 5
+    while poller._thread is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert poller._thread is None
+    assert len(closes) == 1
+    assert not poller._retired  # nothing left to close a second time
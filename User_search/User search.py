@@ -3,10 +3,14 @@ import threading
 import webbrowser
 from tkinter import *
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
 from tkinter import font as tkfont
+from typing import Optional
 
-from user_validation_runner import run_user_validation
+import common_path  # noqa: F401 (repo root on sys.path for cozeva_common)
+from cozeva_common.driver_pool import BrowserWarmup, DriverPool
+
+# user_validation_runner (Selenium, openpyxl) and PIL are imported on first use,
+# so the window shows without waiting for them (see bench_gui_startup.py).
 
 # ─── Constants ─────────────────────────────────────────
 CSV_FILE_PATH = r"C:\Users\nsikder\PycharmProjects\User_search\Customer.csv"
@@ -18,6 +22,51 @@ FONT_BOLD_11 = ("Arial", 11, "bold")
 FONT_BOLD_13 = ("Arial", 13, "bold")
 FONT_COMBOBOX = ("Arial", 9, "bold")
 
+LOGO_DELAY_MS = 50      # logo is loaded and resized once the window is on screen
+WARMUP_DELAY_MS = 300   # Chrome warm-up starts once the window is up
+
+
+# ─── Browser warm-up ──────────────────────────────────
+def _log(message: str):
+    from user_validation_runner import log
+    log(message)
+
+
+def _prelaunch(env: str):
+    from user_validation_runner import prelaunch_user_search_browser
+    return prelaunch_user_search_browser(env)
+
+
+warmup = BrowserWarmup(_prelaunch, log=_log)
+_pool: Optional[DriverPool] = None
+
+
+def driver_pool() -> DriverPool:
+    """Logged-in browsers kept between runs, so a repeat validation skips Chrome and the login."""
+    global _pool
+    if _pool is None:
+        from user_validation_runner import shared_driver_pool
+        _pool = shared_driver_pool()
+    return _pool
+
+
+def close_browsers() -> None:
+    """Quit the warm-up browser and the pooled sessions (app closing)."""
+    warmup.discard()
+    if _pool is not None:
+        _pool.close_all()
+
+
+def load_logo(label, path: str, size: tuple):
+    try:
+        from PIL import Image, ImageTk
+
+        photo = ImageTk.PhotoImage(Image.open(path).resize(size, Image.Resampling.LANCZOS))
+        label._logo = photo  # prevent GC
+        label.config(image=photo)
+    except Exception:
+        pass
+
 
 # ─── Load Customer CSV ─────────────────────────────────
 def load_customers_from_csv(filename: str):
@@ -217,14 +266,12 @@ def launch_main_window():
     faq_btn.place(relx=1, x=-10, y=10, anchor="ne")
     ToolTip(faq_btn, "Help / FAQ")
 
-    # ─── Logo ─────────────────────
-    try:
-        img = Image.open("cozeva2.png").resize((170, 60), Image.Resampling.LANCZOS)
-        photo = ImageTk.PhotoImage(img)
-        win._logo = photo
-        Label(win, image=photo, bg="white").pack(pady=(10, 5))
-    except Exception:
-        pass
+    # ─── Logo (filled in after the window is drawn) ─────────────────────
+    blank = PhotoImage(width=170, height=60)  # keeps the layout from shifting when the logo arrives
+    logo_label = Label(win, image=blank, bg="white")
+    logo_label._logo = blank
+    logo_label.pack(pady=(10, 5))
+    win.after(LOGO_DELAY_MS, lambda: load_logo(logo_label, "cozeva2.png", (170, 60)))
 
     # ─── Customer Dropdown ─────────────────────
     customers = load_customers_from_csv(CSV_FILE_PATH)
@@ -329,10 +376,10 @@ def launch_main_window():
         .pack(side="left", padx=(0, 10))
 
     Radiobutton(env_frame, text="CERT", variable=env_var, value="CERT",
-                bg="white", font=FONT_10).pack(side="left", padx=5)
+                bg="white", font=FONT_10, command=lambda: warmup.start(env_var.get())).pack(side="left", padx=5)
 
     Radiobutton(env_frame, text="PROD", variable=env_var, value="PROD",
-                bg="white", font=FONT_10).pack(side="left", padx=5)
+                bg="white", font=FONT_10, command=lambda: warmup.start(env_var.get())).pack(side="left", padx=5)
 
     # ─── Submit ─────────────────────
     def submit():
@@ -346,21 +393,32 @@ def launch_main_window():
             return
 
         win.withdraw()
+        customer, env = customer_var.get(), env_var.get()
 
-        threading.Thread(
-            target=lambda: (
-                run_user_validation(win, customer_var.get(), selected, env_var.get()),
-                win.after(0, win.destroy)  # ✅ close app cleanly
-            ),
-            daemon=True,
-        ).start()
+        def run():
+            from user_validation_runner import run_user_validation
+            # a pooled session for this customer, else continue from the pre-launched browser
+            pool = driver_pool()
+            warm_runner = None if pool.has_idle(env, customer) else warmup.take(env)
+            run_user_validation(win, customer, selected, env, pool=pool, warm_runner=warm_runner)
+            win.after(0, lambda: (win.deiconify(), warmup.start(env_var.get())))  # ready for the next run
+
+        threading.Thread(target=run, daemon=True).start()
 
     Button(
         win,
         text="SUBMIT", bg=bg_color, fg="white",
         font=FONT_BOLD_11, width=22, command=submit).pack(pady=10)
 
+    def close():
+        close_browsers()
+        win.destroy()
+
+    win.protocol("WM_DELETE_WINDOW", close)
+    win.after(WARMUP_DELAY_MS, lambda: warmup.start(env_var.get()))
+
     win.mainloop()
+    close_browsers()
 
 
 if __name__ == "__main__":
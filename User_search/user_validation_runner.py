@@ -1,12 +1,11 @@
 from __future__ import annotations
 import csv
-import html
 import os
 import re
 import time
 import random
+import threading
 from configparser import ConfigParser
-from datetime import datetime
 from pathlib import Path
 from typing import Optional, List
 from openpyxl import load_workbook
@@ -26,22 +25,61 @@ from selenium.webdriver.support.ui import WebDriverWait
 from tkinter import Tk, Toplevel, Label, StringVar, messagebox
 from tkinter import ttk as tkttk
 
+import common_path  # noqa: F401 (repo root on sys.path for cozeva_common)
+from cozeva_common.driver_pool import DriverPool, PooledSession, quit_browser
+from cozeva_common.run_log import RunLog, apply_logging_config
+from cozeva_common.report_writer import ReportWriter
+from cozeva_common.browser_profile import (
+    PageLoadStats,
+    apply_profile_cdp,
+    apply_profile_options,
+    browser_profile,
+    timed_get,
+    warmup_enabled,
+)
+from cozeva_common.timing import Timeline, instrument_driver, render_waterfall
+from cozeva_common.session_cache import SessionCache, capture_session, restore_session, session_is_valid
+from cozeva_common.page_readiness import (
+    ReadinessStats,
+    estimated_saving,
+    install_readiness_hook,
+    quiet_ms,
+    readiness_mode,
+    wait_for_page_idle,
+)
+
 
 # ─── Configuration ─────────────────────────────────────────────
 CONFIG_FILE_PATH = Path(r"C:\Users\nsikder\Downloads\config.ini")
 LOG_HTML_FILE = Path("validation_log.html")
 
-# ─── Global log store ──────────────────────────────────────────
-log_entries: list[str] = []
+# ─── Run log (structured, bounded; replaced at the start of every run) ───
+_run_log = RunLog()
+_timeline = Timeline()  # stage / step / WebDriver spans of the run, saved next to the report
 html_report_written: bool = False
 
 
 # ─── Logging Utilities ─────────────────────────────────────────
-def log(message: str) -> None:
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    entry = f"[{ts}] {message}"
-    log_entries.append(entry)
-    print(entry)
+def start_run_log(customer: str) -> RunLog:
+    """Begin a fresh run log (records also appended to validation_log.jsonl)."""
+    global _run_log, _timeline
+    _run_log = RunLog(customer=customer, jsonl_path=LOG_HTML_FILE.with_suffix(".jsonl"))
+    _timeline = Timeline(customer)
+    return _run_log
+
+
+def log(message: str, level: Optional[int] = None, stage: Optional[str] = None) -> None:
+    _run_log.emit(message, level, stage)
+
+
+def set_stage(stage: str) -> None:
+    _run_log.set_stage(stage)
+    _timeline.stage(stage)
+
+
+def timed(name: str):
+    """Context manager timing a sub-step of the current stage in the run's timeline."""
+    return _timeline.span(name)
 
 
 # ─── HTML Report ───────────────────────────────────────────────
@@ -54,32 +92,13 @@ def save_logs_to_html(
     global html_report_written
 
     try:
-        with filename.open("w", encoding="utf-8") as f:
-            f.write("<!doctype html><html><head><meta charset='utf-8'>")
-            f.write("<title>Export Validation Log</title>")
-            f.write("""
-            <style>
-                body{font-family:Segoe UI,Arial;background:#f6f7f9;padding:20px}
-                .card{background:#fff;padding:20px;border-radius:8px}
-                .entry{background:#f3f4f6;padding:8px;margin:6px 0;border-radius:6px}
-                h1{color:#2f6f17}
-            </style>
-            </head><body>
-            """)
-
-            f.write("<div class='card'>")
-            f.write("<h1>Export Dashboard Validation Log</h1>")
-            f.write(f"<p><b>Customer:</b> {html.escape(customer)}</p>")
-            f.write(f"<p><b>Export:</b> {html.escape(export_type)}</p>")
-            f.write("<hr>")
-
-            for e in log_entries:
-                f.write(f"<div class='entry'>{html.escape(e)}</div>")
-
-            if sample_table_html:
-                f.write(sample_table_html)
-
-            f.write("</div></body></html>")
+        report = ReportWriter(filename).begin({"Customer": customer, "Export": export_type})
+        if sample_table_html:
+            report.add_section(sample_table_html)
+        _timeline.close()
+        report.add_section(render_waterfall(_timeline))
+        report.finish(_run_log)
+        _timeline.save(filename.with_suffix(".timing.json"))
 
         html_report_written = True
         log(f"HTML report saved: {filename.resolve()}")
@@ -88,6 +107,22 @@ def save_logs_to_html(
         log(f"Failed to save HTML log: {e}")
 
 
+# ─── Saved login sessions ──────────────────────────────────────
+_session_cache: Optional[SessionCache] = None
+_session_cache_lock = threading.Lock()
+
+
+def session_cache_for(config: ConfigParser) -> SessionCache:
+    """The process-wide session cache ([session_cache] in config.ini), created on first use."""
+    global _session_cache
+    with _session_cache_lock:
+        if _session_cache is None:
+            _session_cache = SessionCache.from_config(config)
+            if not _session_cache.enabled and config.getboolean("session_cache", "enabled", fallback=False):
+                log("Session cache off (needs Windows DPAPI, or cryptography with COZEVA_SESSION_KEY or an OS keyring)")
+        return _session_cache
+
+
 # ─── Config & Driver Setup ─────────────────────────────────────
 class ConfParser:
     def __init__(self, config_file_path: Path) -> None:
@@ -98,6 +133,7 @@ class ConfParser:
             raise FileNotFoundError(f"Config not found: {config_file_path}")
 
         self.config.read(config_file_path)
+        apply_logging_config(self.config)
         log(f"Config loaded: {config_file_path}")
 
 
@@ -106,19 +142,30 @@ class ChromeDriverSetup(ConfParser):
         super().__init__(config_file_path)
 
         options = webdriver.ChromeOptions()
+        # [browser] profile = performance: headless, eager loads, throwaway profile
+        self.profile = browser_profile(self.config)
+        throwaway_dir = apply_profile_options(options, self.config)
 
-        try:
-            options.add_argument(self.config["path"]["chrome_profile"])
-        except Exception:
-            pass
+        if throwaway_dir is not None:
+            options.add_argument(f"--user-data-dir={throwaway_dir}")
+        else:
+            try:
+                options.add_argument(self.config["path"]["chrome_profile"])
+            except Exception:
+                pass
 
         prefs = {"safebrowsing.enabled": True}
         options.add_experimental_option("prefs", prefs)
 
         service = Service(self.config["path"]["chrome_driver"])
-        self.driver = webdriver.Chrome(service=service, options=options)
+        with timed("chrome_start"):
+            self.driver = webdriver.Chrome(service=service, options=options)
+        instrument_driver(self.driver, lambda: _timeline)
+        if self.profile == "performance" and not apply_profile_cdp(self.driver, self.config):
+            log("CDP unavailable; images, fonts and third-party requests are not blocked")
+        self.page_loads = PageLoadStats(self.profile)
 
-        log("Chrome driver initialized")
+        log(f"Chrome driver initialized ({self.profile} profile)")
 
 
 def get_usernames_for_customer(customer_name: str) -> Tuple[List[str], str | None]:
@@ -164,9 +211,31 @@ class SupportiveFunctions:
     driver: webdriver.Chrome
     config: ConfigParser
 
+    # fixed pause of the legacy "preloader" wait
+    PRELOADER_PRE_SLEEP = 1.0
+
+    _readiness_hooked: bool = False
+    readiness_stats: Optional[ReadinessStats] = None
+    page_loads: Optional[PageLoadStats] = None
+
+    def open_page(self, url: str, label: Optional[str] = None) -> None:
+        # driver.get(url), timed per page so the [browser] profiles can be compared
+        load = timed_get(self.driver, url, label)
+        if self.page_loads is None:
+            self.page_loads = PageLoadStats()
+        self.page_loads.record(load)
+        log(f"DEBUG {self.page_loads.describe(load)}")
+
     def ajax_preloader_wait(self, timeout: int = 300) -> None:
+        # [wait] readiness_mode in config.ini: "preloader" (legacy) or "network_idle"
+        if readiness_mode(self.config) == "network_idle":
+            self._network_idle_wait(timeout)
+        else:
+            self._preloader_wait(timeout)
+
+    def _preloader_wait(self, timeout: int) -> None:
         try:
-            time.sleep(1)
+            time.sleep(self.PRELOADER_PRE_SLEEP)
             WebDriverWait(self.driver, timeout).until(
                 EC.invisibility_of_element(
                     (By.XPATH, "//div[contains(@class,'ajax_preloader')]")
@@ -175,6 +244,27 @@ class SupportiveFunctions:
         except Exception:
             log("Ajax preloader wait skipped or timed out")
 
+    def _network_idle_wait(self, timeout: int) -> None:
+        if not self._readiness_hooked:
+            install_readiness_hook(self.driver)
+            self._readiness_hooked = True
+        if self.readiness_stats is None:
+            self.readiness_stats = ReadinessStats()
+
+        quiet = quiet_ms(self.config)
+        try:
+            result = wait_for_page_idle(self.driver, timeout, quiet)
+        except Exception as e:
+            log(f"Network-idle wait failed ({e}); using preloader wait")
+            self._preloader_wait(timeout)
+            return
+
+        if not result.idle:
+            log("Ajax preloader wait skipped or timed out")
+        saved = estimated_saving(result, self.PRELOADER_PRE_SLEEP, 0.0, quiet)
+        self.readiness_stats.record(result, saved)
+        log(f"Page idle after {result.elapsed_s:.2f}s (saved ~{saved:.2f}s vs fixed sleeps)")
+
     def get_element_from_config(self, section: str, key: str):
         xpath = self.config.get(section, key)
         return self.driver.find_element(By.XPATH, xpath)
@@ -264,47 +354,78 @@ class ProgressWindow:
 
 # ─── Login + Validation Runner ─────────────────────────────────
 class CozevaLogin(ChromeDriverSetup, SupportiveFunctions):
-    def certlogin_cozeva(self, customer: str, progress: ProgressWindow) -> None:
-        """Perform login to CERT and select customer via UI interactions."""
+    landing_url: Optional[str] = None  # page reached after login; pooled sessions return here
+    login_page_ready: Optional[str] = None  # config section whose login page is already open (warm-up)
+
+    def login_cozeva(self, env: str, customer: str, progress: ProgressWindow) -> None:
+        """Resume the saved session for (env, customer, CS2User) if it is still valid, else log in and save it."""
+        env_upper = env.upper()
+        user = os.environ.get("CS2User", "")
+        if self.resume_saved_session(env_upper, customer, progress, user):
+            return
+        if env_upper == "CERT":
+            self.certlogin_cozeva(customer, progress)
+        else:
+            self.prodlogin_cozeva(customer, progress)
+        session_cache_for(self.config).save(capture_session(
+            self.driver, env_upper, customer, self.landing_url or self.driver.current_url, user))
+
+    def resume_saved_session(self, env: str, customer: str, progress: ProgressWindow, user: str = "") -> bool:
+        """Restore cookies/localStorage saved by an earlier login; False when a full login is needed."""
+        cache = session_cache_for(self.config)
+        state = cache.load(env, customer, user)
+        if state is None:
+            return False
+        started = time.perf_counter()
+        progress.update(f"Checking saved Cozeva session ({env})...")
+        with timed("session_check"):
+            valid = session_is_valid(state)
+        if not valid:
+            log(f"Saved {env} session for {customer} has expired; logging in")
+            cache.discard(env, customer, user)
+            return False
+        self.login_page_ready = None  # the restore navigates away from it
         try:
-            progress.update("Logging into Cozeva (CERT)...")
-            self.driver.get(self.config.get("cert", "logout_url", fallback="about:blank"))
-            self.driver.get(self.config.get("cert", "login_url", fallback="about:blank"))
-            self.driver.maximize_window()
-
-            user = os.environ.get("CS2User")
-            pwd = os.environ.get("CS2Password")
-            if not all((user, pwd)):
-                raise RuntimeError("Environment variables CS2User / CS2Password not set.")
-
-            self.driver.find_element(By.ID, "edit-name").send_keys(user)
-            self.driver.find_element(By.ID, "edit-pass").send_keys(pwd)
-            self.driver.find_element(By.ID, "edit-submit").click()
-
-            WebDriverWait(self.driver, 120).until(EC.presence_of_element_located((By.ID, "reason_textbox")))
-            self.driver.find_element(By.XPATH, "//*[@id='select-customer']").click()
-            self.driver.find_element(By.XPATH, f"//*[contains(text(), '{str(customer)}')]").click()
-
-            WebDriverWait(self.driver, 60).until(EC.presence_of_element_located((By.ID, "reason_textbox")))
-            reason_text = self.config.get("credentials", "user_search_reason", fallback="")
-            self.driver.find_element(By.ID, "reason_textbox").send_keys(reason_text)
-            self.driver.find_element(By.ID, "edit-submit").click()
-            time.sleep(5)
-
-            self.ajax_preloader_wait()
-            progress.update("Logged in successfully (CERT).")
+            with timed("session_restore"):
+                restore_session(self.driver, state)
+                self.ajax_preloader_wait()
+            on_login_page = bool(self.driver.find_elements(By.ID, "edit-pass")
+                                 or self.driver.find_elements(By.ID, "reason_textbox"))
         except Exception as e:
-            log(f"❌ Login Error (CERT): {e}")
-            messagebox.showerror("Login Error", str(e))
-            raise
+            log(f"Could not restore the saved {env} session ({e}); logging in")
+            return False
+        if on_login_page:
+            log(f"Saved {env} session for {customer} was rejected; logging in")
+            cache.discard(env, customer, user)
+            return False
+        self.landing_url = self.driver.current_url
+        log(f"Resumed saved {env} session for {customer} in {time.perf_counter() - started:.1f}s")
+        progress.update(f"Logged in successfully ({env}, saved session).")
+        return True
+
+    def certlogin_cozeva(self, customer: str, progress: ProgressWindow) -> None:
+        """Perform login to CERT and select customer via UI interactions."""
+        self._full_login("cert", customer, progress)
 
     def prodlogin_cozeva(self, customer: str, progress: ProgressWindow) -> None:
         """Perform login to PROD and select customer via UI interactions."""
-        try:
-            progress.update("Logging into Cozeva (PROD)...")
-            self.driver.get(self.config.get("prod", "logout_url", fallback="about:blank"))
-            self.driver.get(self.config.get("prod", "login_url", fallback="about:blank"))
+        self._full_login("prod", customer, progress)
+
+    def open_login_page(self, section: str) -> None:
+        """Logout, then open the login page of `section` ("cert" / "prod")."""
+        self.open_page(self.config.get(section, "logout_url", fallback="about:blank"), "logout")
+        self.open_page(self.config.get(section, "login_url", fallback="about:blank"), "login")
+        if self.profile != "performance":  # headless windows are sized by --window-size
             self.driver.maximize_window()
+        self.login_page_ready = section
+
+    def _full_login(self, section: str, customer: str, progress: ProgressWindow) -> None:
+        env_label = section.upper()
+        try:
+            progress.update(f"Logging into Cozeva ({env_label})...")
+            if self.login_page_ready != section:
+                self.open_login_page(section)
+            self.login_page_ready = None
 
             user = os.environ.get("CS2User")
             pwd = os.environ.get("CS2Password")
@@ -326,17 +447,25 @@ class CozevaLogin(ChromeDriverSetup, SupportiveFunctions):
             time.sleep(5)
 
             self.ajax_preloader_wait()
-            progress.update("Logged in successfully (PROD).")
+            self.landing_url = self.driver.current_url
+            progress.update(f"Logged in successfully ({env_label}).")
         except Exception as e:
-            log(f"❌ Login Error (PROD): {e}")
+            log(f"❌ Login Error ({env_label}): {e}")
             messagebox.showerror("Login Error", str(e))
             raise
 
-    def logout(self, progress: ProgressWindow, customer: str) -> None:
-        try:
-            self.driver.quit()
-        except Exception:
-            pass
+    def logout(self, progress: ProgressWindow, customer: str, keep_session: bool = False) -> None:
+        """Quit the browser (or keep it logged in for a DriverPool) and write the report."""
+        set_stage("logout")
+        if self.readiness_stats is not None and self.readiness_stats.summary():
+            log(self.readiness_stats.summary())
+        if self.page_loads is not None and self.page_loads.summary():
+            log(self.page_loads.summary())
+        if not keep_session:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
         progress.complete()
         save_logs_to_html(customer, "User Search Validation")
 
@@ -355,7 +484,7 @@ class user_search(SupportiveFunctions):
             progress.update("Opening User List page...")
 
             # 1️⃣ Open User List page
-            self.driver.get(self.config.get("user_list", "list_url", fallback="about:blank"))
+            self.open_page(self.config.get("user_list", "list_url", fallback="about:blank"), "User List")
             self.ajax_preloader_wait()
             time.sleep(2)
             progress.update("Opening user list filter...")
@@ -434,7 +563,7 @@ class user_search(SupportiveFunctions):
             progress.update("Opening Batch List page...")
 
             # 1️⃣ Open Batch List page
-            self.driver.get(self.config.get("batch_list", "batch_url", fallback="about:blank"))
+            self.open_page(self.config.get("batch_list", "batch_url", fallback="about:blank"), "Batch List")
             self.ajax_preloader_wait()
             time.sleep(2)
             self.click_from_config("BatchListLocator", "xpath_batch_menu")
@@ -469,7 +598,7 @@ class user_search(SupportiveFunctions):
             progress.update("Opening Batch List page...")
 
             # 1️⃣ Open Batch List page
-            self.driver.get(self.config.get("secure_messaging", "secure_url", fallback="about:blank"))
+            self.open_page(self.config.get("secure_messaging", "secure_url", fallback="about:blank"), "Secure Messaging")
             self.ajax_preloader_wait()
             time.sleep(2)
             self.click_from_config("SecureMessagingLocator", "xpath_new_message")
@@ -504,7 +633,7 @@ class user_search(SupportiveFunctions):
             progress.update("Opening Analytics...")
 
             # 1️⃣ Open Analytics
-            self.driver.get(self.config.get("analytics", "analytics_url", fallback="about:blank"))
+            self.open_page(self.config.get("analytics", "analytics_url", fallback="about:blank"), "Analytics")
             self.ajax_preloader_wait()
             time.sleep(2)
             self.click_from_config("AnalyticsLocator", "xpath_analytics_share")
@@ -543,7 +672,7 @@ class user_search(SupportiveFunctions):
 
     def ticket_search(self, customer: str, progress: ProgressWindow) -> None:
         progress.update("Opening Support Ticket Page...")
-        self.driver.get(self.config.get("support_ticket", "ticket_url", fallback="about:blank"))
+        self.open_page(self.config.get("support_ticket", "ticket_url", fallback="about:blank"), "Support Ticket")
         self.ajax_preloader_wait()
         time.sleep(2)
         plus_xpath = "//a[@class='btn-floating btn-large red waves-effect waves-light new_support_activity_btn']"
@@ -576,7 +705,7 @@ class user_search(SupportiveFunctions):
     def casemanagement_search(self, customer: str, progress: ProgressWindow):
         progress.update("Opening patient dashboard to perform Case Management User Search...")
         # 1️⃣ Open Batch List page
-        self.driver.get(self.config.get("case_management", "task_url", fallback="about:blank"))
+        self.open_page(self.config.get("case_management", "task_url", fallback="about:blank"), "Case Management")
         self.ajax_preloader_wait()
         time.sleep(2)
         self.click_from_config("CMLocator", "xpath_kebab_icon")
@@ -607,7 +736,7 @@ class user_search(SupportiveFunctions):
             progress.update("Opening Support Tool list...")
 
             # 1️⃣ Open Batch List page
-            self.driver.get(self.config.get("delete_data", "supporttool_url", fallback="about:blank"))
+            self.open_page(self.config.get("delete_data", "supporttool_url", fallback="about:blank"), "Support Tool")
             self.ajax_preloader_wait()
             time.sleep(2)
             self.click_from_config("SupportToolLocator", "xpath_deletetest_data")
@@ -641,32 +770,105 @@ class user_search(SupportiveFunctions):
             raise
 
 
+# ─── Driver pool ──────────────────────────────────────────────
+_shared_pool: Optional[DriverPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def open_user_search_session(env: str, customer: str, progress: ProgressWindow,
+                             runner: Optional[CozevaLogin] = None) -> CozevaLogin:
+    """
+    DriverPool factory: start Chrome and log in for (env, customer). A `runner`
+    from prelaunch_user_search_browser is logged in instead of starting Chrome.
+    """
+    if env.upper() != "CERT":
+        raise NotImplementedError("PROD login not wired yet")
+    if runner is None:
+        runner = CozevaLogin(CONFIG_FILE_PATH)
+    else:
+        log("Using the pre-launched browser (Chrome start skipped)")
+    try:
+        runner.login_cozeva(env, customer, progress)
+    except Exception:
+        try:
+            runner.driver.quit()
+        except Exception:
+            pass
+        raise
+    return runner
+
+
+def prelaunch_user_search_browser(env: str) -> Optional[CozevaLogin]:
+    """
+    BrowserWarmup factory: start Chrome and open the login page of `env` before
+    the customer is chosen. None when [browser] warmup is off.
+    """
+    if env.upper() != "CERT":
+        raise NotImplementedError("PROD login not wired yet")
+    config = ConfigParser()
+    config.read(CONFIG_FILE_PATH)
+    if not warmup_enabled(config):
+        return None
+    runner = CozevaLogin(CONFIG_FILE_PATH)
+    try:
+        runner.open_login_page(env.lower())
+    except Exception:
+        try:
+            runner.driver.quit()
+        except Exception:
+            pass
+        raise
+    return runner
+
+
+def shared_driver_pool() -> DriverPool:
+    """Process-wide pool of warm user-search sessions, created on first use."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool(open_user_search_session, log=log)
+        return _shared_pool
+
+
 # ─── ENTRY POINT CALLED FROM UI ─────────────────────────────────
 def run_user_validation(
     master_window: Tk,
     customer: str,
     selected_areas: List[str],
     environment: str = "CERT",
+    pool: Optional[DriverPool] = None,
+    warm_runner: Optional[CozevaLogin] = None,
 ) -> None:
 
     # 🔒 Safety: ensure list
     if not isinstance(selected_areas, list):
         selected_areas = [selected_areas]
 
+    run_log = start_run_log(customer)
     progress = ProgressWindow(master_window, total_steps=3 + len(selected_areas))
+    session: Optional[PooledSession] = None
 
     try:
-        # ─── Driver + Login ────────────────────────────────────
-        runner = CozevaLogin(CONFIG_FILE_PATH)
-
-        if environment.upper() == "CERT":
-            runner.certlogin_cozeva(customer, progress)
+        set_stage("login")
+        # ─── Driver + Login (or a warm session from the pool) ──
+        if pool is not None:
+            session = pool.checkout(environment, customer, progress, warm_runner)
+            runner = session.client
+            if warm_runner is not None and runner is not warm_runner:
+                quit_browser(warm_runner)  # a warm session was reused; the pre-launched browser is not needed
         else:
-            raise NotImplementedError("PROD login not wired yet")
+            runner = open_user_search_session(environment, customer, progress, runner=warm_runner)
 
         # ─── Initialize Search Handler ─────────────────────────
         search = user_search(runner.driver, runner.config)
 
+        # share readiness hook state/stats with the login runner so its summary covers every wait
+        if runner.readiness_stats is None:
+            runner.readiness_stats = ReadinessStats()
+        search.readiness_stats = runner.readiness_stats
+        search._readiness_hooked = runner._readiness_hooked
+        search.page_loads = runner.page_loads
+
         # ─── Fetch usernames ───────────────────────────────────
         usernames, first_username = get_usernames_for_customer(customer)
 
@@ -689,6 +891,7 @@ def run_user_validation(
         for area_name, action in execution_flow:
             if area_name in selected_areas:
                 executed_any = True
+                set_stage(area_name)
                 progress.update(f"Starting User Search validation in {area_name}...")
                 action()
 
@@ -701,13 +904,20 @@ def run_user_validation(
             )
 
         # ─── Logout ────────────────────────────────────────────
-        runner.logout(progress, customer)
+        runner.logout(progress, customer, keep_session=session is not None)
+        if session is not None:
+            pool.release(session)
+            session = None
 
     except Exception as e:
         log(f"❌ Validation failed: {e}")
+        if session is not None:
+            pool.release(session, healthy=False)
         messagebox.showerror("Validation Error", str(e))
         try:
             progress.window.destroy()
         except Exception:
             pass
 
+    finally:
+        run_log.close()
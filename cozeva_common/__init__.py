@@ -0,0 +1,8 @@
+"""
+Modules shared by the Export Dashboard and User Search apps: browser profile,
+warm driver pool, page readiness, HTTP session from the browser's cookies,
+run log + HTML report, saved login sessions and timings.
+
+The apps run as scripts from their own folders; their `common_path` module puts
+the repository root on sys.path so this package can be imported.
+"""
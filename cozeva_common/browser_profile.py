@@ -0,0 +1,164 @@
+from __future__ import annotations
+import atexit
+import shutil
+import tempfile
+import time
+from configparser import ConfigParser
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+# ─── Configuration ─────────────────────────────────────────────
+# config.ini:
+#   [browser]
+#   profile = default       ; windowed Chrome with [path] chrome_profile (interactive use)
+#   profile = performance   ; headless, "eager" page loads, images/fonts/third-party
+#                           ; requests blocked, throwaway profile directory
+#   blocked_urls = *.mp4, *cdn.example.com*   ; extra CDP URL patterns (performance only)
+#   window_size = 1920,1080                   ; headless viewport
+#   warmup = true           ; GUIs start Chrome on the login page while the form is filled in
+BROWSER_PROFILES = ("default", "performance")
+DEFAULT_WINDOW_SIZE = "1920,1080"
+
+BLOCKED_URL_PATTERNS = (
+    # images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    # fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # third-party analytics / fonts / tags
+    "*google-analytics.com*", "*googletagmanager.com*", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    "*doubleclick.net*", "*hotjar.com*", "*newrelic.com*", "*nr-data.net*", "*facebook.net*",
+    "*clarity.ms*", "*fullstory.com*", "*intercom.io*", "*intercomcdn.com*",
+)
+
+# Switches that keep Chrome from doing work unrelated to the page under test.
+PERFORMANCE_ARGUMENTS = (
+    "--headless=new",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-notifications",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--mute-audio",
+)
+
+_NAVIGATION_TIMING_JS = r"""
+var n = performance.getEntriesByType('navigation')[0];
+if (!n) { return null; }
+return {dcl: n.domContentLoadedEventEnd, load: n.loadEventEnd,
+        bytes: n.transferSize || 0, resources: performance.getEntriesByType('resource').length};
+"""
+
+
+def browser_profile(config: ConfigParser) -> str:
+    profile = config.get("browser", "profile", fallback="default").strip().lower()
+    return profile if profile in BROWSER_PROFILES else "default"
+
+
+def warmup_enabled(config: ConfigParser) -> bool:
+    try:
+        return config.getboolean("browser", "warmup", fallback=True)
+    except ValueError:
+        return True
+
+
+def blocked_url_patterns(config: ConfigParser) -> list[str]:
+    extra = config.get("browser", "blocked_urls", fallback="")
+    patterns = list(BLOCKED_URL_PATTERNS)
+    patterns += [p.strip() for p in extra.replace("\n", ",").split(",") if p.strip() and p.strip() not in patterns]
+    return patterns
+
+
+def throwaway_profile_dir() -> Path:
+    """A fresh Chrome profile directory, removed when the process exits."""
+    path = Path(tempfile.mkdtemp(prefix="cozeva_chrome_"))
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+def apply_profile_options(options, config: ConfigParser) -> Optional[Path]:
+    """
+    Add the performance profile's switches to ChromeOptions `options`.
+    Returns the throwaway profile directory to use (None for the default profile).
+    """
+    if browser_profile(config) != "performance":
+        return None
+    for arg in PERFORMANCE_ARGUMENTS:
+        options.add_argument(arg)
+    window_size = config.get("browser", "window_size", fallback=DEFAULT_WINDOW_SIZE).strip() or DEFAULT_WINDOW_SIZE
+    options.add_argument(f"--window-size={window_size}")
+    # DOMContentLoaded is enough: every flow waits for its own elements / the ajax preloader
+    options.page_load_strategy = "eager"
+    return throwaway_profile_dir()
+
+
+def apply_profile_cdp(driver, config: ConfigParser) -> bool:
+    """Block images, fonts and third-party requests for this driver; True when CDP accepted it."""
+    if browser_profile(config) != "performance":
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns(config)})
+        return True
+    except Exception:
+        return False
+
+
+# ─── Page load timing ──────────────────────────────────────────
+@dataclass
+class PageLoad:
+    label: str
+    wall_s: float                    # driver.get() duration, i.e. what the flow waited for
+    dom_ready_ms: Optional[float]    # navigation timing domContentLoadedEventEnd
+    load_ms: Optional[float]         # loadEventEnd (0 / None with "eager" when still loading)
+    resources: int = 0
+
+
+def page_label(url: str) -> str:
+    parts = urlsplit(url or "")
+    return parts.path.rstrip("/") or parts.netloc or "about:blank"
+
+
+def timed_get(driver, url: str, label: Optional[str] = None) -> PageLoad:
+    """driver.get(url) plus the browser's navigation timing for the loaded document."""
+    started = time.perf_counter()
+    driver.get(url)
+    wall = time.perf_counter() - started
+    timing: dict = {}
+    try:
+        timing = driver.execute_script(_NAVIGATION_TIMING_JS) or {}
+    except Exception:
+        pass
+    return PageLoad(
+        label=label or page_label(url),
+        wall_s=wall,
+        dom_ready_ms=timing.get("dcl") or None,
+        load_ms=timing.get("load") or None,
+        resources=int(timing.get("resources", 0) or 0),
+    )
+
+
+@dataclass
+class PageLoadStats:
+    profile: str = "default"
+    loads: list[PageLoad] = field(default_factory=list)
+
+    def record(self, load: PageLoad) -> None:
+        self.loads.append(load)
+
+    def describe(self, load: PageLoad) -> str:
+        dom = f", DOM ready {load.dom_ready_ms:.0f}ms" if load.dom_ready_ms else ""
+        return (f"Page load [{self.profile}] {load.label}: {load.wall_s:.2f}s{dom}, "
+                f"{load.resources} resource(s)")
+
+    def summary(self) -> Optional[str]:
+        if not self.loads:
+            return None
+        total = sum(p.wall_s for p in self.loads)
+        slowest = max(self.loads, key=lambda p: p.wall_s)
+        return (f"Page loads [{self.profile} profile]: {len(self.loads)} pages, {total:.1f}s total, "
+                f"{total / len(self.loads):.2f}s avg, slowest {slowest.label} {slowest.wall_s:.2f}s")
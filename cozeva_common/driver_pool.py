@@ -0,0 +1,297 @@
+from __future__ import annotations
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+# ─── Defaults ─────────────────────────────────────────────────
+MAX_IDLE_SECONDS = 15 * 60     # evict sessions idle longer than this (server session timeout)
+MAX_AGE_SECONDS = 2 * 60 * 60  # recycle browsers older than this
+MAX_SESSIONS = 4               # browsers open at most (checked out + idle); idle ones are evicted to stay under it
+
+
+class PooledSession:
+    """A warm, logged-in browser session (the login client holding `.driver`)."""
+
+    def __init__(self, key: tuple[str, str], client: Any) -> None:
+        self.key = key
+        self.client = client
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+
+    @property
+    def driver(self):
+        return self.client.driver
+
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def idle(self) -> float:
+        return time.monotonic() - self.last_used
+
+
+class DriverPool:
+    """
+    Keeps logged-in WebDriver sessions warm, keyed by (env, customer).
+
+    `factory(env, customer, *args)` must start a browser, log in and return the
+    login client (an object with a `.driver`). checkout() hands out a healthy
+    idle session for the key or builds a new one; release() resets the session
+    (extra windows closed, partial downloads removed, back on the landing page)
+    and keeps it for the next run. Stale or crashed sessions are quit and evicted.
+    max_sessions counts checked-out and idle sessions: the least recently used
+    idle ones are quit to make room (checked-out sessions are never taken away).
+    """
+
+    def __init__(self,
+                 factory: Callable[..., Any],
+                 max_sessions: int = MAX_SESSIONS,
+                 max_idle_s: float = MAX_IDLE_SECONDS,
+                 max_age_s: float = MAX_AGE_SECONDS,
+                 log: Callable[[str], None] = print) -> None:
+        self.factory = factory
+        self.max_sessions = max(1, max_sessions)
+        self.max_idle_s = max_idle_s
+        self.max_age_s = max_age_s
+        self.log = log
+        self._idle: list[PooledSession] = []
+        self._active = 0  # checked out, not yet released
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ─── Checkout / release ───────────────────────────────────
+    def has_idle(self, env: str, customer: str) -> bool:
+        """True when a warm session for (env, customer) is waiting (it may still turn out stale)."""
+        key = (env.upper(), customer)
+        with self._lock:
+            return any(s.key == key for s in self._idle)
+
+    def checkout(self, env: str, customer: str, *factory_args: Any) -> PooledSession:
+        key = (env.upper(), customer)
+        while True:
+            with self._lock:
+                candidate = next((s for s in reversed(self._idle) if s.key == key), None)
+                if candidate is not None:
+                    self._idle.remove(candidate)
+            if candidate is None:
+                break
+            if self._is_stale(candidate) or not self.is_healthy(candidate):
+                self._evict(candidate, "stale or unhealthy")
+                continue
+            candidate.uses += 1
+            candidate.last_used = time.monotonic()
+            with self._lock:
+                self.hits += 1
+                self._active += 1
+            self.log(f"Driver pool: reusing warm session for {key} (use #{candidate.uses}).")
+            return candidate
+
+        with self._lock:
+            self.misses += 1
+            self._active += 1
+            overflow = self._overflow()  # room for the new browser
+        for old in overflow:
+            self._evict(old, "pool full")
+        self.log(f"Driver pool: no warm session for {key}; starting a new browser.")
+        try:
+            session = PooledSession(key, self.factory(key[0], customer, *factory_args))
+        except BaseException:
+            with self._lock:
+                self._active -= 1
+            raise
+        session.uses = 1
+        return session
+
+    def release(self, session: PooledSession, healthy: bool = True) -> None:
+        """Return a session after a run; unhealthy sessions are evicted instead."""
+        with self._lock:
+            self._active -= 1
+        if not healthy or self._is_stale(session):
+            self._evict(session, "released as unhealthy" if not healthy else "stale")
+            return
+        try:
+            self.reset(session)
+        except Exception as e:
+            self._evict(session, f"reset failed: {e}")
+            return
+
+        session.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(session)
+            overflow = self._overflow()
+        for old in overflow:
+            self._evict(old, "pool full")
+
+    def _overflow(self) -> list[PooledSession]:
+        """Idle sessions to quit so that checked-out + idle sessions fit max_sessions (caller holds the lock)."""
+        overflow: list[PooledSession] = []
+        while self._idle and self._active + len(self._idle) > self.max_sessions:
+            overflow.append(self._idle.pop(0))  # least recently released first
+        return overflow
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._evict(session, "pool closed")
+
+    # ─── Health / reset ───────────────────────────────────────
+    def _is_stale(self, session: PooledSession) -> bool:
+        return session.idle() > self.max_idle_s or session.age() > self.max_age_s
+
+    @staticmethod
+    def is_healthy(session: PooledSession) -> bool:
+        try:
+            handles = session.driver.window_handles
+            _ = session.driver.current_url
+            return bool(handles)
+        except Exception:
+            return False
+
+    @staticmethod
+    def reset(session: PooledSession) -> None:
+        driver = session.driver
+        handles = list(driver.window_handles)
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        download_dir: Optional[Path] = getattr(session.client, "download_dir", None)
+        if download_dir is not None and Path(download_dir).exists():
+            for partial in Path(download_dir).glob("*.crdownload"):
+                partial.unlink(missing_ok=True)
+
+        landing_url = getattr(session.client, "landing_url", None)
+        if landing_url:
+            driver.get(landing_url)
+            if hasattr(session.client, "ajax_preloader_wait"):
+                session.client.ajax_preloader_wait()
+
+    def _evict(self, session: PooledSession, reason: str) -> None:
+        self.log(f"Driver pool: evicting session {session.key} ({reason}).")
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+
+# ─── Speculative warm-up ──────────────────────────────────────
+WARMUP_WAIT_SECONDS = 90         # take() waits this long for a browser that is still starting
+WARMUP_MAX_AGE_SECONDS = 30 * 60  # a login page left open longer is not used
+
+
+class BrowserWarmup:
+    """
+    One browser started ahead of time, while the user is still filling in the
+    form: `factory(env)` starts Chrome and opens the login page for `env` (no
+    login, the customer is not known yet) and returns the login client, or None
+    when warm-up is switched off. take(env) hands the browser to the run; a
+    warm-up for another environment is quit and restarted by start().
+    """
+
+    def __init__(self, factory: Callable[[str], Any], log: Callable[[str], None] = print) -> None:
+        self.factory = factory
+        self.log = log
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._env: Optional[str] = None
+        self._done: Optional[threading.Event] = None
+        self._client: Any = None
+        self._ready_at = 0.0
+
+    def start(self, env: str) -> None:
+        """Warm up a browser for `env` in the background (no-op if one is already warm or starting)."""
+        env = env.upper()
+        with self._lock:
+            if self._env == env:
+                return
+            stale = self._detach()
+            self._env = env
+            self._done = done = threading.Event()
+            generation = self._generation
+        self._quit(stale)
+        threading.Thread(target=self._run, args=(env, generation, done),
+                         name="browser-warmup", daemon=True).start()
+
+    def _run(self, env: str, generation: int, done: threading.Event) -> None:
+        started = time.perf_counter()
+        try:
+            client = self.factory(env)
+        except Exception as e:
+            self.log(f"Notice: browser warm-up for {env} failed: {e}")
+            client = None
+        with self._lock:
+            current = generation == self._generation
+            if current:
+                self._client = client
+                self._ready_at = time.monotonic()
+        if not current:
+            self._quit(client)  # discarded or re-targeted while Chrome was starting
+        elif client is not None:
+            self.log(f"Browser warm-up: {env} login page ready in {time.perf_counter() - started:.1f}s.")
+        done.set()
+
+    def take(self, env: str, timeout: float = WARMUP_WAIT_SECONDS) -> Any:
+        """
+        The warm login client for `env`, or None (nothing warm for `env`, still
+        not ready after `timeout`, too old or crashed). Waits for a warm-up
+        still in progress: that is never slower than starting another Chrome.
+        """
+        env = env.upper()
+        with self._lock:
+            done = self._done if self._env == env else None
+        if done is None:
+            self.discard()
+            return None
+        done.wait(timeout)
+        with self._lock:
+            client = self._client if done.is_set() and self._env == env else None
+            age = time.monotonic() - self._ready_at
+            self._client = None
+            stale = self._detach()
+        self._quit(stale)
+        if client is None:
+            return None
+        if age > WARMUP_MAX_AGE_SECONDS or not _client_alive(client):
+            self.log(f"Notice: pre-launched {env} browser is stale; starting a new one.")
+            self._quit(client)
+            return None
+        return client
+
+    def discard(self) -> None:
+        """Quit the warm browser, or have the one still starting quit once it is up."""
+        with self._lock:
+            stale = self._detach()
+        self._quit(stale)
+
+    def _detach(self) -> Any:
+        """Forget the current warm-up (caller holds the lock); returns its client to quit."""
+        client, self._client = self._client, None
+        self._generation += 1
+        self._env = None
+        self._done = None
+        return client
+
+    @staticmethod
+    def _quit(client: Any) -> None:
+        quit_browser(client)
+
+
+def quit_browser(client: Any) -> None:
+    """Quit the browser of a login client (None and already-closed browsers are fine)."""
+    if client is None:
+        return
+    try:
+        client.driver.quit()
+    except Exception:
+        pass
+
+
+def _client_alive(client: Any) -> bool:
+    try:
+        return bool(client.driver.window_handles)
+    except Exception:
+        return False
@@ -0,0 +1,54 @@
+from __future__ import annotations
+from typing import Optional
+
+import urllib3  # installed with selenium
+
+DEFAULT_TIMEOUT = urllib3.Timeout(connect=10.0, read=60.0)
+
+
+class BrowserHttpSession:
+    """
+    Connection-pooled HTTP client that talks to Cozeva with the cookies of an
+    already logged-in WebDriver session, so single requests don't need a page render.
+    Redirects are not followed: a redirect usually means the session expired.
+    """
+
+    def __init__(self,
+                 cookies: dict[str, str],
+                 user_agent: Optional[str] = None,
+                 maxsize: int = 4,
+                 timeout: urllib3.Timeout = DEFAULT_TIMEOUT) -> None:
+        self.cookies = dict(cookies)
+        self.user_agent = user_agent
+        self.http = urllib3.PoolManager(
+            maxsize=maxsize,
+            block=False,
+            timeout=timeout,
+            retries=urllib3.Retry(total=2, connect=2, read=1, redirect=False, backoff_factor=0.3,
+                                  raise_on_redirect=False, raise_on_status=False),
+        )
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs) -> "BrowserHttpSession":
+        cookies = {c["name"]: c["value"] for c in driver.get_cookies()}
+        try:
+            user_agent = driver.execute_script("return navigator.userAgent;")
+        except Exception:
+            user_agent = None
+        return cls(cookies, user_agent=user_agent, **kwargs)
+
+    def headers(self, extra: Optional[dict[str, str]] = None) -> dict[str, str]:
+        headers = {"Cookie": "; ".join(f"{k}={v}" for k, v in self.cookies.items())}
+        if self.user_agent:
+            headers["User-Agent"] = self.user_agent
+        if extra:
+            headers.update(extra)
+        return headers
+
+    def get(self, url: str, headers: Optional[dict[str, str]] = None,
+            preload_content: bool = True) -> urllib3.BaseHTTPResponse:
+        return self.http.request("GET", url, headers=self.headers(headers),
+                                 redirect=False, preload_content=preload_content)
+
+    def close(self) -> None:
+        self.http.clear()
@@ -0,0 +1,192 @@
+from __future__ import annotations
+import time
+from configparser import ConfigParser
+from dataclasses import dataclass
+from typing import Optional
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+# ─── Configuration ─────────────────────────────────────────────
+# config.ini:
+#   [wait]
+#   readiness_mode = preloader      ; legacy fixed sleeps + preloader invisibility
+#   readiness_mode = network_idle   ; injected XHR/fetch + MutationObserver hook
+#   quiet_ms = 250                  ; idle window required before returning
+READINESS_MODES = ("preloader", "network_idle")
+DEFAULT_QUIET_MS = 250
+_CHUNK_MS = 5000  # one execute_async_script call waits at most this long (below the 30s script timeout)
+# a page that navigated mid-wait ("document unloaded", script context destroyed) or a
+# script past the script timeout: the wait goes on. Any other WebDriverException (invalid
+# session, closed window, crashed browser) is raised so the caller's fallback runs at once.
+_RETRY_ERRORS = (JavascriptException, TimeoutException)
+
+# Installed on every new document (via CDP) or on the current page as a fallback.
+# Counts in-flight XHR/fetch requests and tracks visibility of the ajax_preloader div;
+# lastChange moves whenever either of them changes.
+READINESS_HOOK_JS = r"""
+(function () {
+  if (window.__czReady) { return; }
+  var st = window.__czReady = {pending: 0, lastChange: Date.now(), preloaderVisible: false};
+  function touch() { st.lastChange = Date.now(); }
+  function settle() { st.pending = Math.max(0, st.pending - 1); touch(); }
+
+  var origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    var finished = false;
+    function finish() { if (!finished) { finished = true; settle(); } }
+    st.pending++; touch();
+    this.addEventListener('loadend', finish);
+    try { return origSend.apply(this, arguments); } catch (e) { finish(); throw e; }
+  };
+
+  if (window.fetch) {
+    var origFetch = window.fetch;
+    window.fetch = function () {
+      st.pending++; touch();
+      var p;
+      try { p = origFetch.apply(this, arguments); } catch (e) { settle(); throw e; }
+      p.then(settle, settle);
+      return p;
+    };
+  }
+
+  function preloaderVisible() {
+    var els = document.querySelectorAll("div[class*='ajax_preloader']");
+    for (var i = 0; i < els.length; i++) {
+      var el = els[i];
+      if ((el.offsetWidth || el.offsetHeight || el.getClientRects().length) &&
+          window.getComputedStyle(el).visibility !== 'hidden') { return true; }
+    }
+    return false;
+  }
+  function check() {
+    var v = preloaderVisible();
+    if (v !== st.preloaderVisible) { st.preloaderVisible = v; touch(); }
+  }
+  function observe() {
+    check();
+    new MutationObserver(check).observe(document.documentElement, {
+      subtree: true, childList: true, attributes: true, attributeFilter: ['class', 'style']
+    });
+  }
+  if (document.documentElement) { observe(); } else { document.addEventListener('DOMContentLoaded', observe); }
+})();
+"""
+
+# Waits inside the browser (one round trip) until the page has been idle for
+# `quiet` ms since the call started, or `maxWait` ms have passed.
+_WAIT_IDLE_JS = r"""
+var quiet = arguments[0], maxWait = arguments[1], done = arguments[arguments.length - 1];
+var t0 = Date.now();
+(function poll() {
+  var st = window.__czReady;
+  if (!st) { done({hook: false}); return; }
+  var quietFor = Date.now() - Math.max(st.lastChange, t0);
+  var idle = document.readyState !== 'loading' && st.pending === 0 && !st.preloaderVisible && quietFor >= quiet;
+  if (idle || Date.now() - t0 >= maxWait) {
+    done({hook: true, idle: idle, pending: st.pending, preloader: st.preloaderVisible});
+    return;
+  }
+  setTimeout(poll, 25);
+})();
+"""
+
+
+@dataclass
+class IdleResult:
+    elapsed_s: float
+    idle: bool
+    pending_requests: int = 0
+    preloader_visible: bool = False
+
+
+def readiness_mode(config: ConfigParser) -> str:
+    mode = config.get("wait", "readiness_mode", fallback="preloader").strip().lower()
+    return mode if mode in READINESS_MODES else "preloader"
+
+
+def quiet_ms(config: ConfigParser) -> int:
+    try:
+        return max(0, config.getint("wait", "quiet_ms", fallback=DEFAULT_QUIET_MS))
+    except ValueError:
+        return DEFAULT_QUIET_MS
+
+
+def install_readiness_hook(driver) -> bool:
+    """
+    Register the hook for every future document of this driver (CDP) and inject
+    it into the current page. Returns True when the CDP registration worked.
+    """
+    registered = False
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": READINESS_HOOK_JS})
+        registered = True
+    except Exception:
+        pass
+    try:
+        driver.execute_script(READINESS_HOOK_JS)
+    except Exception:
+        pass
+    return registered
+
+
+def wait_for_page_idle(driver, timeout: float, quiet: int = DEFAULT_QUIET_MS) -> IdleResult:
+    """
+    Block until no XHR/fetch is in flight and the ajax_preloader is hidden for `quiet` ms.
+    Raises the WebDriverException of a dead session (see _RETRY_ERRORS).
+    """
+    started = time.perf_counter()
+    deadline = started + timeout
+    last: dict = {}
+    while True:
+        remaining_ms = int((deadline - time.perf_counter()) * 1000)
+        if remaining_ms <= 0:
+            break
+        try:
+            last = driver.execute_async_script(_WAIT_IDLE_JS, quiet, min(_CHUNK_MS, remaining_ms)) or {}
+        except _RETRY_ERRORS:
+            # page navigated mid-wait (script context destroyed); the new document gets the hook via CDP
+            time.sleep(0.05)
+            continue
+        if not last.get("hook"):
+            try:
+                driver.execute_script(READINESS_HOOK_JS)
+            except _RETRY_ERRORS:
+                time.sleep(0.05)
+            continue
+        if last.get("idle"):
+            return IdleResult(time.perf_counter() - started, True)
+    return IdleResult(
+        time.perf_counter() - started,
+        False,
+        pending_requests=int(last.get("pending", 0) or 0),
+        preloader_visible=bool(last.get("preloader", False)),
+    )
+
+
+def estimated_saving(result: IdleResult, pre_sleep: float, post_sleep: float, quiet: int) -> float:
+    """
+    Seconds saved compared with the legacy wait, which slept `pre_sleep`, then waited
+    for the preloader (roughly the busy time), then slept `post_sleep`.
+    """
+    busy = max(0.0, result.elapsed_s - quiet / 1000.0)
+    legacy = max(pre_sleep, busy) + post_sleep
+    return legacy - result.elapsed_s
+
+
+@dataclass
+class ReadinessStats:
+    calls: int = 0
+    waited_s: float = 0.0
+    saved_s: float = 0.0
+
+    def record(self, result: IdleResult, saved: float) -> None:
+        self.calls += 1
+        self.waited_s += result.elapsed_s
+        self.saved_s += saved
+
+    def summary(self) -> Optional[str]:
+        if not self.calls:
+            return None
+        return (f"Page readiness: {self.calls} waits, {self.waited_s:.1f}s waited, "
+                f"~{self.saved_s:.1f}s saved vs fixed sleeps")
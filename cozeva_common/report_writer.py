@@ -0,0 +1,326 @@
+from __future__ import annotations
+import base64
+import gzip
+import html
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Optional
+
+from .run_log import ERROR, RunLog, format_ts
+
+# ─── Streaming HTML report ─────────────────────────────────────
+# The report is written top to bottom while the run goes: the header first,
+# then sections (sample tables, ...) and log chunks as they come, and the
+# failure summary plus the log viewer at the end. Log records are embedded as
+# gzip+base64 JSON chunks that the page unpacks and renders lazily (only the
+# rows in view exist in the DOM), so writing and opening the report stays
+# cheap however many records the run produced. Printing (or the PDF button)
+# renders every row of the current filter first; finish() also writes the
+# buffered records as plain text, shown by browsers without DecompressionStream.
+
+MAX_FAILURE_LINES = 500  # failures listed in the summary; the rest via the log viewer's ERROR filter
+
+_STYLE = """
+<style>
+    :root{--brand:#2f6f17;--muted:#4a5568;--bg:#f6f7f9}
+    body{font-family:Segoe UI, Arial, sans-serif;background:var(--bg);padding:20px;margin:0}
+    .page-wrap{max-width:1100px;margin:20px auto;position:relative}
+    .card{background:#fff;border-radius:8px;padding:22px 22px 30px 22px;
+          box-shadow:0 2px 6px rgba(0,0,0,0.08);position:relative}
+    h1{color:var(--brand);margin:0 0 10px 0}
+    h2{margin:0 0 8px 0}
+    .meta{color:#555;font-size:0.95rem;margin-bottom:12px}
+    .entry{font-family:Times New Roman;background:#f3f4f6;
+           padding:8px;margin:6px 0;border-radius:6px}
+    table.sample{border-collapse:collapse;width:100%;margin-top:12px}
+    table.sample th, table.sample td{
+        border:1px solid #e9ecef;padding:6px;text-align:left}
+    table.sample thead th{background:#f3f4f6}
+
+    .top-right-actions{
+        position:absolute;top:12px;right:12px;display:flex;gap:8px;z-index:10}
+    .btn-download{
+        padding:8px 12px;border-radius:6px;background:var(--brand);
+        color:white;border:none;cursor:pointer;font-weight:600}
+    .btn-secondary{background:var(--muted)}
+
+    table.sample td[data-match="true"]{background:#90dba5!important}
+    table.sample td[data-match="false"]{background:#e88a8a!important}
+
+    .failures{background:#fff5f5;border:1px solid #f5c2c7;border-radius:6px;
+              padding:10px;max-height:240px;overflow:auto}
+    .log-tools{display:flex;gap:8px;align-items:center;margin:8px 0;flex-wrap:wrap}
+    .log-tools select, .log-tools input{padding:4px 6px}
+    .log-count{color:#555;font-size:0.9rem}
+    .log-viewport{position:relative;height:520px;overflow:auto;border:1px solid #e9ecef;
+                  border-radius:6px;background:#fafafa}
+    .log-row{position:absolute;left:0;right:0;height:26px;line-height:26px;padding:0 8px;
+             box-sizing:border-box;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;
+             font-family:Times New Roman;border-bottom:1px solid #eef0f2}
+    .log-row .stage{color:#6b7280;font-size:0.8rem;margin-right:6px}
+    .log-viewport.expanded{height:auto;overflow:visible}
+    .log-viewport.expanded .log-row{position:static;height:auto;white-space:normal}
+    .log-text{font-family:Times New Roman;white-space:pre-wrap;word-break:break-word;
+              background:#fafafa;border:1px solid #e9ecef;border-radius:6px;padding:8px;margin:0}
+    .lv40{background:#fdecec}
+    .lv30{background:#fff7e0}
+    .lv25{background:#effaf1}
+
+    .timeline{margin-top:16px}
+    .tl-row{display:flex;align-items:center;gap:8px;height:20px;font-size:0.85rem}
+    .tl-label{width:240px;flex:none;white-space:nowrap;overflow:hidden;text-overflow:ellipsis}
+    .tl-track{position:relative;flex:1;height:12px;background:#f3f4f6;border-radius:3px}
+    .tl-bar{position:absolute;top:0;bottom:0;min-width:1px;border-radius:3px;background:var(--brand)}
+    .tl-step .tl-bar{background:#4a90c2}
+    .tl-webdriver .tl-bar{background:#d9a441}
+    .tl-error .tl-bar{background:#c0392b}
+    .tl-dur{width:70px;flex:none;text-align:right;color:#555}
+
+    @media print {.top-right-actions, .log-tools{display:none!important}
+                  .log-viewport{height:auto;overflow:visible}}
+</style>
+"""
+
+_VIEWER_JS = r"""
+<script>
+(function () {
+  var ROW_H = 26, OVERSCAN = 30;
+  var slot = document.getElementById('failures-slot'), failures = document.getElementById('failures');
+  if (slot && failures) slot.appendChild(failures);
+
+  var box = document.getElementById('log-viewport'), spacer = document.getElementById('log-spacer');
+  var levelSel = document.getElementById('log-level'), stageSel = document.getElementById('log-stage');
+  var search = document.getElementById('log-search'), count = document.getElementById('log-count');
+  var all = [], view = [], pending = false, expanded = false;
+
+  function esc(s) {
+    return String(s).replace(/[&<>"]/g, function (c) {
+      return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+    });
+  }
+  function inflate(b64) {
+    var bin = atob(b64), bytes = new Uint8Array(bin.length);
+    for (var i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+    var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return new Response(stream).text().then(JSON.parse);
+  }
+  function rowHtml(r, i) {
+    var text = '[' + r[1] + '] ' + r[5];
+    return '<div class="log-row lv' + r[2] + '"' + (i === null ? '' : ' style="top:' + (i * ROW_H) + 'px"')
+           + ' title="' + esc(text) + '">' + (r[3] ? '<span class="stage">' + esc(r[3]) + '</span>' : '')
+           + esc(text) + '</div>';
+  }
+  function render() {
+    pending = false;
+    if (expanded) return;
+    var first = Math.max(0, Math.floor(box.scrollTop / ROW_H) - OVERSCAN);
+    var last = Math.min(view.length, Math.ceil((box.scrollTop + box.clientHeight) / ROW_H) + OVERSCAN);
+    var out = [];
+    for (var i = first; i < last; i++) out.push(rowHtml(view[i], i));
+    spacer.innerHTML = out.join('');
+  }
+  // print / PDF: every row of the current filter in normal flow, not just the ones in view
+  function expand() {
+    expanded = true;
+    box.classList.add('expanded');
+    spacer.style.height = 'auto';
+    spacer.innerHTML = view.map(function (r) { return rowHtml(r, null); }).join('');
+  }
+  function collapse() {
+    if (!expanded) return;
+    expanded = false;
+    box.classList.remove('expanded');
+    spacer.style.height = (view.length * ROW_H) + 'px';
+    render();
+  }
+  function plainText(reason) {
+    var text = document.getElementById('log-text');
+    if (!text) { count.textContent = reason + '; see the JSONL log file.'; return; }
+    text.hidden = false;
+    box.style.display = 'none';
+    document.querySelector('.log-tools').style.display = 'none';
+  }
+  function schedule() {
+    if (!pending) { pending = true; requestAnimationFrame(render); }
+  }
+  function apply() {
+    var minLevel = +levelSel.value, stage = stageSel.value, q = search.value.toLowerCase();
+    view = all.filter(function (r) {
+      return r[2] >= minLevel && (!stage || r[3] === stage) && (!q || r[5].toLowerCase().indexOf(q) !== -1);
+    });
+    count.textContent = view.length + ' of ' + all.length + ' records';
+    if (expanded) { expand(); return; }
+    spacer.style.height = (view.length * ROW_H) + 'px';
+    schedule();
+  }
+
+  if (!window.DecompressionStream) {
+    plainText('This browser cannot unpack the embedded log');
+    return;
+  }
+  var chunks = Array.prototype.map.call(document.querySelectorAll('script.log-chunk'),
+                                        function (s) { return inflate(s.textContent.trim()); });
+  Promise.all(chunks).then(function (parts) {
+    var stages = {};
+    parts.forEach(function (part) {
+      for (var i = 0; i < part.length; i++) { all.push(part[i]); if (part[i][3]) stages[part[i][3]] = 1; }
+    });
+    Object.keys(stages).forEach(function (s) {
+      var o = document.createElement('option'); o.value = s; o.textContent = s; stageSel.appendChild(o);
+    });
+    apply();
+  }).catch(function (e) { plainText('Could not read the embedded log: ' + e); });
+
+  window.reportLog = {expand: expand, collapse: collapse};
+  window.addEventListener('beforeprint', expand);
+  window.addEventListener('afterprint', collapse);
+  box.addEventListener('scroll', schedule);
+  levelSel.addEventListener('change', apply);
+  stageSel.addEventListener('change', apply);
+  search.addEventListener('input', apply);
+})();
+</script>
+"""
+
+_PDF_JS = """
+<script src="https://cdnjs.cloudflare.com/ajax/libs/html2pdf.js/0.9.3/html2pdf.bundle.min.js"></script>
+<script>
+document.getElementById('download-pdf').addEventListener('click', function(){
+    var btn=this;
+    btn.disabled=true;
+    var el=document.getElementById('report-content');
+    var log=window.reportLog;
+    if(log) log.expand();
+    html2pdf().from(el).set({
+        margin:0.35,
+        filename:'export_report.pdf',
+        html2canvas:{scale:2},
+        jsPDF:{unit:'in',format:'a4',orientation:'portrait'}
+    }).save().then(()=>{btn.disabled=false;if(log) log.collapse();})
+    .catch(()=>{btn.disabled=false;if(log) log.collapse();window.print();});
+});
+</script>
+"""
+
+
+def _pack(rows: list) -> str:
+    raw = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.b64encode(gzip.compress(raw, compresslevel=6, mtime=0)).decode("ascii")
+
+
+class ReportWriter:
+    """
+    Appends an HTML validation report to `path` as the run goes:
+    begin() writes the header, add_section() an HTML fragment, flush_log() the
+    log records logged since the last flush, finish() the failure summary (from
+    RunLog.failures) and the lazy log viewer. Every write is flushed, so a
+    report cut short by a crash still opens.
+    """
+
+    def __init__(self, path: Path, title: str = "Export Validation Log",
+                 heading: str = "Export Dashboard Validation Log") -> None:
+        self.path = Path(path)
+        self.title = title
+        self.heading = heading
+        self.written = 0  # log records embedded so far
+        self.finished = False
+        self._last_seq = 0
+        self._f: Optional[IO[str]] = None
+
+    def _write(self, text: str) -> None:
+        self._f.write(text)
+        self._f.flush()
+
+    def begin(self, meta: dict[str, str]) -> "ReportWriter":
+        """Create the file and write the page head, action buttons and `meta` line."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.path.open("w", encoding="utf-8")
+        meta = dict(meta, Generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        meta_html = " &nbsp; | &nbsp; ".join(
+            f"<strong>{html.escape(k)}:</strong> {html.escape(str(v))}" for k, v in meta.items())
+        self._write(
+            "<!doctype html><html><head><meta charset='utf-8'>"
+            f"<title>{html.escape(self.title)}</title>{_STYLE}</head><body>\n"
+            "<div class='page-wrap'>\n"
+            "<div class='top-right-actions'>"
+            "<button id='download-pdf' class='btn-download'>⬇️ Download PDF</button>"
+            "<button class='btn-download btn-secondary' onclick='window.print()'>🖨️ Print</button>"
+            "</div>\n"
+            "<div class='card' id='report-content'>\n"
+            f"<h1>{html.escape(self.heading)}</h1>\n"
+            f"<div class='meta'>{meta_html}</div><hr>\n"
+            "<div id='failures-slot'></div><hr>\n"
+        )
+        return self
+
+    def add_section(self, fragment: str) -> None:
+        """Append an HTML fragment (written as is) below the sections added before."""
+        self._write(fragment + "\n")
+
+    def flush_log(self, run_log: RunLog) -> int:
+        """Embed the records logged since the previous flush as one compressed chunk."""
+        pending = []
+        for record in reversed(run_log.records):
+            if record.seq <= self._last_seq:
+                break
+            pending.append(record)
+        if not pending:
+            return 0
+        pending.reverse()
+        rows = [[r.seq, format_ts(r.ts), r.level, r.stage, r.elapsed_ms, r.message] for r in pending]
+        self._write(f"<script type='application/json' class='log-chunk'>{_pack(rows)}</script>\n")
+        self._last_seq = pending[-1].seq
+        self.written += len(pending)
+        return len(pending)
+
+    def _failure_summary(self, run_log: RunLog) -> str:
+        total = sum(n for level, n in run_log.counts.items() if level >= ERROR)
+        if not total:
+            return ("<div id='failures' style='margin:12px 0 18px 0;'>"
+                    "<h2 style='color:#15803d;'>✅ No Failed Cases Detected</h2></div>")
+        shown = list(run_log.failures)[-MAX_FAILURE_LINES:]
+        parts = ["<div id='failures' style='margin:12px 0 18px 0;'>",
+                 f"<h2 style='color:#b91c1c;'>❌ Failed Cases Summary ({total})</h2>",
+                 "<div class='failures'>"]
+        parts.extend(f"<div style='margin-bottom:6px;'>• {html.escape(r.text)}</div>" for r in shown)
+        if total > len(shown):
+            parts.append(f"<div>… {total - len(shown)} more; filter the log below by ERROR.</div>")
+        parts.append("</div></div>")
+        return "".join(parts)
+
+    def finish(self, run_log: RunLog) -> Path:
+        """
+        Write the remaining log records, the failure summary, the viewer and the
+        buffered records as plain text (hidden; for browsers that can't unpack
+        the chunks); close the file.
+        """
+        self.flush_log(run_log)
+        missing = sum(run_log.counts.values()) - self.written
+        notice = ""
+        if missing > 0:
+            notice = (f"<div class='entry'>Notice: {missing} log records are not in this report "
+                      f"(full log: {html.escape(str(run_log.jsonl_path or 'not written'))}).</div>")
+        self._write(
+            self._failure_summary(run_log) + "\n"
+            "<h2 style='margin-top:18px;'>Log</h2>" + notice +
+            "<div class='log-tools'>"
+            "<select id='log-level'><option value='0'>All levels</option><option value='20'>INFO+</option>"
+            "<option value='25'>SUCCESS+</option><option value='30'>WARNING+</option>"
+            "<option value='40'>ERROR</option></select>"
+            "<select id='log-stage'><option value=''>All stages</option></select>"
+            "<input id='log-search' type='search' placeholder='Filter text'>"
+            "<span id='log-count' class='log-count'>Loading log…</span></div>"
+            "<div id='log-viewport' class='log-viewport'><div id='log-spacer' style='position:relative'></div></div>\n"
+            "<pre id='log-text' class='log-text' hidden>"
+            + html.escape("\n".join(r.text for r in run_log.records)) + "</pre>\n"
+            "</div></div>\n" + _VIEWER_JS + _PDF_JS + "</body></html>\n"
+        )
+        self.close()
+        self.finished = True
+        return self.path
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
@@ -0,0 +1,279 @@
+from __future__ import annotations
+import atexit
+import itertools
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Optional
+
+# ─── Levels ────────────────────────────────────────────────────
+DEBUG = 10
+INFO = 20
+SUCCESS = 25
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", SUCCESS: "SUCCESS", WARNING: "WARNING", ERROR: "ERROR"}
+LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+
+MAX_RECORDS = 20000   # records kept in memory per run (oldest dropped first)
+MAX_FAILURES = 5000   # ERROR records kept for the failure summary
+
+# config.ini:
+#   [logging]
+#   console_level = INFO   ; DEBUG|INFO|SUCCESS|WARNING|ERROR
+#   jsonl_max_mb = 20      ; a JSONL log is rotated (<name>.1, <name>.2, ...) once it reaches this size; 0: never
+#   jsonl_backups = 5      ; rotated JSONL files kept, the oldest is deleted
+JSONL_MAX_MB = 20
+JSONL_BACKUPS = 5
+
+_console_level = INFO  # process-wide default
+_jsonl_max_bytes = int(JSONL_MAX_MB * 1024 * 1024)
+_jsonl_backups = JSONL_BACKUPS
+
+
+def infer_level(message: str) -> int:
+    """Level from the markers the log messages already use (❌, ⚠️, ✅, Notice, DEBUG)."""
+    if "❌" in message:
+        return ERROR
+    if "⚠️" in message or message.startswith("Warning"):
+        return WARNING
+    if "✅" in message:
+        return SUCCESS
+    if message.startswith("DEBUG"):
+        return DEBUG
+    return INFO
+
+
+def parse_level(value: str, default: int = INFO) -> int:
+    value = (value or "").strip().upper()
+    if value.isdigit():
+        return int(value)
+    return LEVELS_BY_NAME.get(value, default)
+
+
+def set_console_level(level: int) -> None:
+    """Minimum level printed to the console by run logs without their own console_level."""
+    global _console_level
+    _console_level = level
+
+
+def set_jsonl_rotation(max_mb: float, backups: int) -> None:
+    """Size at which JSONL logs are rotated (0: never) and how many rotated files are kept."""
+    global _jsonl_max_bytes, _jsonl_backups
+    _jsonl_max_bytes = max(0, int(max_mb * 1024 * 1024))
+    _jsonl_backups = max(0, backups)
+
+
+def apply_logging_config(config: Any) -> None:
+    """The [logging] settings of a ConfigParser (see the config.ini block above)."""
+    set_console_level(parse_level(config.get("logging", "console_level", fallback="INFO")))
+    set_jsonl_rotation(config.getfloat("logging", "jsonl_max_mb", fallback=JSONL_MAX_MB),
+                       config.getint("logging", "jsonl_backups", fallback=JSONL_BACKUPS))
+
+
+def rotate_file(path: Path, backups: int) -> None:
+    """<path> becomes <path>.1, <path>.1 becomes <path>.2 ...; files past `backups` are deleted."""
+    if backups <= 0:
+        path.unlink(missing_ok=True)
+        return
+    path.with_name(f"{path.name}.{backups}").unlink(missing_ok=True)
+    for i in range(backups - 1, 0, -1):
+        older = path.with_name(f"{path.name}.{i}")
+        if older.exists():
+            older.replace(path.with_name(f"{path.name}.{i + 1}"))
+    if path.exists():
+        path.replace(path.with_name(f"{path.name}.1"))
+
+
+_ts_cache: tuple[int, str] = (-1, "")
+
+
+def format_ts(ts: float) -> str:
+    """'%Y-%m-%d %H:%M:%S' of an epoch time; strftime runs once per second, not per record."""
+    global _ts_cache
+    second = int(ts)
+    cached_second, text = _ts_cache
+    if second != cached_second:
+        text = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+        _ts_cache = (second, text)
+    return text
+
+
+@dataclass
+class LogRecord:
+    __slots__ = ("seq", "ts", "level", "message", "stage", "run_id", "customer", "elapsed_ms")
+    seq: int
+    ts: float
+    level: int
+    message: str
+    stage: str
+    run_id: str
+    customer: str
+    elapsed_ms: int
+
+    @property
+    def level_name(self) -> str:
+        return LEVEL_NAMES.get(self.level, str(self.level))
+
+    @property
+    def text(self) -> str:
+        """The classic '[timestamp] message' line."""
+        return f"[{format_ts(self.ts)}] {self.message}"
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d["level"] = self.level_name
+        return d
+
+
+# ─── Background JSONL writer ───────────────────────────────────
+class JsonlWriter:
+    """
+    One daemon thread appending JSON lines for every run log that asked for a
+    file. Callers only enqueue; files are flushed whenever the queue runs dry.
+    A file that would grow past the [logging] jsonl_max_mb limit is rotated first.
+    """
+
+    _CLOSE = object()
+
+    def __init__(self) -> None:
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._files: dict[Path, IO[str]] = {}
+        self._sizes: dict[Path, int] = {}  # bytes in each open file
+        self._thread = threading.Thread(target=self._run, name="run-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, path: Path, record: LogRecord) -> None:
+        self._queue.put((path, record))
+
+    def close(self, path: Optional[Path]) -> threading.Event:
+        """Close `path` (None: every open file) once everything queued before is written."""
+        done = threading.Event()
+        self._queue.put((path, (self._CLOSE, done)))
+        return done
+
+    def _run(self) -> None:
+        while True:
+            path, item = self._queue.get()
+            try:
+                if isinstance(item, tuple) and item[0] is self._CLOSE:
+                    for closing in ([path] if path is not None else list(self._files)):
+                        f = self._files.pop(closing, None)
+                        self._sizes.pop(closing, None)
+                        if f is not None:
+                            f.close()
+                    item[1].set()
+                    continue
+                line = json.dumps(item.to_dict(), ensure_ascii=False) + "\n"
+                size = len(line.encode("utf-8"))
+                f = self._files.get(path)
+                if f is None:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    f = self._files[path] = path.open("a", encoding="utf-8")
+                    self._sizes[path] = f.tell()
+                if self._sizes[path] and 0 < _jsonl_max_bytes < self._sizes[path] + size:
+                    f.close()
+                    rotate_file(path, _jsonl_backups)
+                    f = self._files[path] = path.open("a", encoding="utf-8")
+                    self._sizes[path] = 0
+                f.write(line)
+                self._sizes[path] += size
+                if self._queue.empty():
+                    for open_file in self._files.values():
+                        open_file.flush()
+            except Exception:
+                pass  # logging must never take the run down
+
+    def flush_all(self, timeout: float = 5.0) -> None:
+        self.close(None).wait(timeout)
+
+
+_writer: Optional[JsonlWriter] = None
+_writer_lock = threading.Lock()
+
+
+def _shared_writer() -> JsonlWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = JsonlWriter()
+            atexit.register(_writer.flush_all)
+        return _writer
+
+
+# ─── Per-run log ───────────────────────────────────────────────
+class RunLog:
+    """
+    Structured log of one run: records (level, stage, run id, customer, elapsed ms)
+    in a bounded buffer, an index of ERROR records for the failure summary,
+    console output filtered by `console_level` and an optional JSONL file
+    written by the background writer.
+    """
+
+    def __init__(self,
+                 customer: str = "",
+                 label: str = "",
+                 run_id: Optional[str] = None,
+                 jsonl_path: Optional[Path] = None,
+                 console_level: Optional[int] = None,
+                 max_records: int = MAX_RECORDS) -> None:
+        self.run_id = run_id or uuid.uuid4().hex[:8]
+        self.customer = customer
+        self.label = label
+        self.jsonl_path = Path(jsonl_path) if jsonl_path is not None else None
+        self.console_level = console_level
+        self.stage = ""
+        self.records: deque[LogRecord] = deque(maxlen=max_records)
+        self.failures: deque[LogRecord] = deque(maxlen=MAX_FAILURES)
+        self.counts: dict[int, int] = {}
+        self.started = time.time()
+        self._seq = itertools.count(1)
+
+    @property
+    def dropped(self) -> int:
+        """Records that fell out of the bounded buffer (still in the JSONL file, if any)."""
+        return sum(self.counts.values()) - len(self.records)
+
+    def set_stage(self, stage: str) -> None:
+        self.stage = stage
+
+    def emit(self, message: str, level: Optional[int] = None, stage: Optional[str] = None) -> LogRecord:
+        now = time.time()
+        record = LogRecord(
+            seq=next(self._seq),
+            ts=now,
+            level=infer_level(message) if level is None else level,
+            message=message,
+            stage=self.stage if stage is None else stage,
+            run_id=self.run_id,
+            customer=self.customer,
+            elapsed_ms=int((now - self.started) * 1000),
+        )
+        self.records.append(record)
+        self.counts[record.level] = self.counts.get(record.level, 0) + 1
+        if record.level >= ERROR:
+            self.failures.append(record)
+        if self.jsonl_path is not None:
+            _shared_writer().write(self.jsonl_path, record)
+        if record.level >= (_console_level if self.console_level is None else self.console_level):
+            text = record.text
+            print(f"[{self.label}] {text}" if self.label else text)
+        return record
+
+    def entries(self) -> list[str]:
+        """Buffered records as '[timestamp] message' lines."""
+        return [r.text for r in self.records]
+
+    def failure_entries(self) -> list[str]:
+        return [r.text for r in self.failures]
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Wait until every record of this run is on disk."""
+        if self.jsonl_path is not None and _writer is not None:
+            _writer.close(self.jsonl_path).wait(timeout)
@@ -0,0 +1,299 @@
+from __future__ import annotations
+import base64
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from configparser import ConfigParser
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+from .http_session import BrowserHttpSession
+
+# ─── Configuration ─────────────────────────────────────────────
+# config.ini:
+#   [session_cache]
+#   enabled = false              ; opt in; runs then end without the logout_url visit,
+#                                ; so the saved session stays valid on the server
+#   dir = session_cache          ; one encrypted file per (env, customer, user)
+#   max_age_hours = 8            ; older sessions are not even tried
+#
+# After a full login the browser's cookies and localStorage are saved,
+# encrypted with Windows DPAPI (bound to the Windows user) or, elsewhere, with
+# Fernet when the cryptography package is installed. The Fernet key comes from
+# COZEVA_SESSION_KEY or the OS keyring (keyring package, a real backend only);
+# it is never written to disk. Without either the cache stays off; nothing is
+# ever written in clear text.
+DEFAULT_DIR = Path("session_cache")
+DEFAULT_MAX_AGE_HOURS = 8.0
+KEY_ENV = "COZEVA_SESSION_KEY"
+KEYRING_SERVICE = "cozeva-session-cache"
+KEYRING_ENTRY = "fernet-key"
+LOGIN_MARKERS = (b'id="edit-pass"', b"id='edit-pass'", b'id="reason_textbox"')
+
+# Runs before any page script of the next document: put the saved localStorage back.
+_LOCAL_STORAGE_JS = r"""
+(function (origin, items) {
+  if (location.origin !== origin) { return; }
+  try {
+    for (var k in items) { if (localStorage.getItem(k) === null) { localStorage.setItem(k, items[k]); } }
+  } catch (e) {}
+})(%s, %s);
+"""
+
+
+# ─── Encryption ────────────────────────────────────────────────
+class _DpapiCipher:
+    """CryptProtectData / CryptUnprotectData for the current Windows user."""
+    name = "DPAPI"
+
+    def __init__(self) -> None:
+        import ctypes
+        from ctypes import wintypes
+
+        class Blob(ctypes.Structure):
+            _fields_ = [("cbData", wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+        self._ctypes = ctypes
+        self._blob = Blob
+        self._crypt32 = ctypes.windll.crypt32
+        self._kernel32 = ctypes.windll.kernel32
+
+    def _call(self, fn, data: bytes) -> bytes:
+        ctypes = self._ctypes
+        buf = ctypes.create_string_buffer(data, len(data))
+        blob_in = self._blob(len(data), ctypes.cast(buf, ctypes.POINTER(ctypes.c_char)))
+        blob_out = self._blob()
+        if not fn(ctypes.byref(blob_in), None, None, None, None, 0x1, ctypes.byref(blob_out)):  # UI_FORBIDDEN
+            raise OSError(f"DPAPI call failed ({ctypes.GetLastError()})")
+        try:
+            return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+        finally:
+            self._kernel32.LocalFree(blob_out.pbData)
+
+    def encrypt(self, data: bytes) -> bytes:
+        return self._call(self._crypt32.CryptProtectData, data)
+
+    def decrypt(self, data: bytes) -> bytes:
+        return self._call(self._crypt32.CryptUnprotectData, data)
+
+
+def _keyring_key() -> str:
+    """The Fernet key kept in the OS keyring, created on first use; raises without a secure backend."""
+    import keyring
+    from cryptography.fernet import Fernet
+
+    backend = keyring.get_keyring()
+    if getattr(backend, "priority", 0) < 1:  # the "fail" backend or a plain-text file
+        raise RuntimeError(f"no secure keyring backend ({type(backend).__name__})")
+    key = keyring.get_password(KEYRING_SERVICE, KEYRING_ENTRY)
+    if not key:
+        key = Fernet.generate_key().decode("ascii")
+        keyring.set_password(KEYRING_SERVICE, KEYRING_ENTRY, key)
+    return key
+
+
+class _FernetCipher:
+    name = "Fernet"
+
+    def __init__(self) -> None:
+        from cryptography.fernet import Fernet
+
+        self._fernet = Fernet((os.environ.get(KEY_ENV) or _keyring_key()).encode("ascii"))
+
+    def encrypt(self, data: bytes) -> bytes:
+        return self._fernet.encrypt(data)
+
+    def decrypt(self, data: bytes) -> bytes:
+        return self._fernet.decrypt(data)
+
+
+def default_cipher(directory: Path):
+    """DPAPI on Windows, else Fernet with a key from the environment or the OS keyring, else None (cache off)."""
+    try:
+        (directory / ".key").unlink(missing_ok=True)  # key file left next to the sessions by earlier versions
+    except OSError:
+        pass
+    if sys.platform == "win32":
+        try:
+            return _DpapiCipher()
+        except Exception:
+            pass
+    try:
+        return _FernetCipher()
+    except Exception:
+        return None
+
+
+# ─── Saved state ───────────────────────────────────────────────
+@dataclass
+class SavedSession:
+    env: str
+    customer: str
+    landing_url: str
+    user: str = ""
+    cookies: list[dict] = field(default_factory=list)
+    local_storage: dict[str, str] = field(default_factory=dict)
+    user_agent: Optional[str] = None
+    saved_at: float = 0.0
+
+    @property
+    def origin(self) -> str:
+        parts = urlsplit(self.landing_url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def age_s(self) -> float:
+        return time.time() - self.saved_at
+
+    def live_cookies(self) -> list[dict]:
+        now = time.time()
+        return [c for c in self.cookies if not c.get("expiry") or c["expiry"] > now]
+
+
+def capture_session(driver, env: str, customer: str, landing_url: str, user: str = "") -> SavedSession:
+    """Cookies and localStorage of the logged-in browser (on the landing page)."""
+    try:
+        local_storage = driver.execute_script(
+            "var o = {}; for (var i = 0; i < localStorage.length; i++) {"
+            " var k = localStorage.key(i); o[k] = localStorage.getItem(k); } return o;") or {}
+    except Exception:
+        local_storage = {}
+    try:
+        user_agent = driver.execute_script("return navigator.userAgent;")
+    except Exception:
+        user_agent = None
+    return SavedSession(env=env, customer=customer, landing_url=landing_url, user=user, cookies=driver.get_cookies(),
+                        local_storage=dict(local_storage), user_agent=user_agent, saved_at=time.time())
+
+
+def session_is_valid(state: SavedSession) -> bool:
+    """
+    One GET of the landing page with the saved cookies, redirects not followed:
+    a 200 that is not the login form means the server still knows the session.
+    """
+    cookies = state.live_cookies()
+    if not cookies:
+        return False
+    http = BrowserHttpSession({c["name"]: c["value"] for c in cookies}, user_agent=state.user_agent, maxsize=1)
+    try:
+        resp = http.get(state.landing_url)
+        if resp.status != 200:
+            return False
+        return not any(marker in resp.data for marker in LOGIN_MARKERS)
+    except Exception:
+        return False
+    finally:
+        http.close()
+
+
+def _cdp_cookie(c: dict) -> dict:
+    out = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if k in c}
+    if c.get("expiry"):
+        out["expires"] = c["expiry"]
+    return out
+
+
+def restore_session(driver, state: SavedSession) -> None:
+    """Load the saved cookies and localStorage into `driver`, then open the landing page."""
+    cookies = state.live_cookies()
+    script_id = None
+    try:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": [_cdp_cookie(c) for c in cookies]})
+        if state.local_storage:
+            source = _LOCAL_STORAGE_JS % (json.dumps(state.origin), json.dumps(state.local_storage))
+            script_id = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                               {"source": source}).get("identifier")
+        driver.get(state.landing_url)
+    except Exception:
+        # no CDP: cookies can only be set for the page's own domain
+        driver.get(state.origin + "/")
+        for c in cookies:
+            try:
+                driver.add_cookie({k: v for k, v in c.items() if k != "sameSite" or v in ("Strict", "Lax", "None")})
+            except Exception:
+                pass
+        if state.local_storage:
+            driver.execute_script(_LOCAL_STORAGE_JS % (json.dumps(state.origin), json.dumps(state.local_storage)))
+        driver.get(state.landing_url)
+    finally:
+        if script_id:
+            try:
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+            except Exception:
+                pass
+
+
+# ─── Store ─────────────────────────────────────────────────────
+class SessionCache:
+    """Encrypted per-(env, customer, user) login state on disk."""
+
+    def __init__(self, directory: Path = DEFAULT_DIR,
+                 max_age_s: float = DEFAULT_MAX_AGE_HOURS * 3600,
+                 cipher=None,
+                 enabled: bool = True) -> None:
+        self.directory = Path(directory)
+        self.max_age_s = max_age_s
+        self.cipher = (cipher or default_cipher(self.directory)) if enabled else None
+
+    @classmethod
+    def from_config(cls, config: ConfigParser) -> "SessionCache":
+        try:
+            hours = config.getfloat("session_cache", "max_age_hours", fallback=DEFAULT_MAX_AGE_HOURS)
+        except ValueError:
+            hours = DEFAULT_MAX_AGE_HOURS
+        return cls(
+            directory=Path(config.get("session_cache", "dir", fallback=str(DEFAULT_DIR))),
+            max_age_s=max(0.0, hours) * 3600,
+            enabled=config.getboolean("session_cache", "enabled", fallback=False),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.cipher is not None
+
+    def path_for(self, env: str, customer: str, user: str = "") -> Path:
+        key = hashlib.sha1(f"{env.upper()}\x1f{customer}\x1f{user.lower()}".encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{key}.session"
+
+    def load(self, env: str, customer: str, user: str = "") -> Optional[SavedSession]:
+        """The saved state, or None when missing, unreadable, of another user or older than max_age."""
+        if not self.enabled:
+            return None
+        path = self.path_for(env, customer, user)
+        try:
+            raw = self.cipher.decrypt(base64.b64decode(path.read_bytes()))
+            state = SavedSession(**json.loads(raw.decode("utf-8")))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.discard(env, customer, user)  # other Windows user/key, or damaged
+            return None
+        if state.age_s() > self.max_age_s or state.user.lower() != user.lower():
+            self.discard(env, customer, user)
+            return None
+        return state
+
+    def save(self, state: SavedSession) -> bool:
+        if not self.enabled:
+            return False
+        path = self.path_for(state.env, state.customer, state.user)
+        try:
+            blob = base64.b64encode(self.cipher.encrypt(json.dumps(asdict(state)).encode("utf-8")))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+            return True
+        except Exception:
+            return False
+
+    def discard(self, env: str, customer: str, user: str = "") -> None:
+        try:
+            self.path_for(env, customer, user).unlink()
+        except OSError:
+            pass
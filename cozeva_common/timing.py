@@ -0,0 +1,251 @@
+from __future__ import annotations
+import html
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+# ─── Run timeline ──────────────────────────────────────────────
+# Where a run's time goes: one "stage" span per set_stage() (stages follow each
+# other), "step" spans for sub-steps such as Chrome startup, and a "webdriver"
+# span for every WebDriver command (instrument_driver wraps driver.execute, so
+# element calls and waits are included). Saved as JSON next to the report and
+# drawn as a waterfall in it.
+
+MAX_SPANS = 20000        # detailed spans kept per run; commands are still totalled after that
+SLOW_COMMAND_MS = 250.0  # WebDriver commands at least this long get their own waterfall row
+MAX_WATERFALL_ROWS = 400
+
+
+@dataclass
+class Span:
+    id: int
+    parent: int          # id of the enclosing span, -1 for stages
+    name: str
+    kind: str            # "stage" | "step" | "webdriver"
+    start_ms: float      # since the timeline started
+    dur_ms: float = -1.0  # -1 while open
+    thread: str = ""
+    error: bool = False
+
+    @property
+    def end_ms(self) -> float:
+        return self.start_ms + max(self.dur_ms, 0.0)
+
+
+class Timeline:
+    """Spans of one run; safe to use from several threads (each keeps its own nesting)."""
+
+    def __init__(self, label: str = "") -> None:
+        self.label = label
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.spans: list[Span] = []
+        self.dropped = 0
+        self._stage: Optional[Span] = None
+        # (stage, command) -> [calls, total ms, errors]
+        self.command_totals: dict[tuple[str, str], list] = {}
+
+    def now_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000.0
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add(self, name: str, kind: str, start_ms: float, parent: int) -> Optional[Span]:
+        with self._lock:
+            if len(self.spans) >= MAX_SPANS:
+                self.dropped += 1
+                return None
+            span = Span(len(self.spans), parent, name, kind, start_ms, thread=threading.current_thread().name)
+            self.spans.append(span)
+            return span
+
+    def _parent_id(self) -> int:
+        stack = self._stack()
+        if stack:
+            return stack[-1].id
+        stage = self._stage
+        return stage.id if stage is not None else -1
+
+    def stage(self, name: str) -> None:
+        """End the current stage span and start `name` (a stage entered again gets a new span)."""
+        now = self.now_ms()
+        with self._lock:
+            previous = self._stage
+            if previous is not None and previous.dur_ms < 0:
+                previous.dur_ms = now - previous.start_ms
+        self._stage = self._add(name, "stage", now, -1)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "step") -> Iterator[Optional[Span]]:
+        """Time the block as a child of the innermost open span (or the current stage)."""
+        span = self._add(name, kind, self.now_ms(), self._parent_id())
+        stack = self._stack()
+        if span is not None:
+            stack.append(span)
+        try:
+            yield span
+        except BaseException:
+            if span is not None:
+                span.error = True
+            raise
+        finally:
+            if span is not None:
+                span.dur_ms = self.now_ms() - span.start_ms
+                if stack and stack[-1] is span:
+                    stack.pop()
+
+    def add_command(self, command: str, start_ms: float, dur_ms: float, error: bool = False) -> None:
+        stage = self._stage.name if self._stage is not None else ""
+        span = self._add(command, "webdriver", start_ms, self._parent_id())
+        with self._lock:
+            totals = self.command_totals.setdefault((stage, command), [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += dur_ms
+            totals[2] += int(error)
+        if span is not None:
+            span.dur_ms = dur_ms
+            span.error = error
+
+    def close(self) -> None:
+        """End the open stage (the run is over)."""
+        now = self.now_ms()
+        with self._lock:
+            if self._stage is not None and self._stage.dur_ms < 0:
+                self._stage.dur_ms = now - self._stage.start_ms
+
+    @property
+    def total_ms(self) -> float:
+        return max((s.end_ms for s in self.spans), default=0.0)
+
+    def stage_totals(self) -> dict[str, float]:
+        out: dict[str, float] = {}
+        for s in self.spans:
+            if s.kind == "stage":
+                out[s.name] = out.get(s.name, 0.0) + max(s.dur_ms, 0.0)
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "label": self.label,
+            "started_at": self.started_at,
+            "total_ms": round(self.total_ms, 1),
+            "stages": {k: round(v, 1) for k, v in self.stage_totals().items()},
+            "commands": [
+                {"stage": stage, "command": command, "calls": t[0], "total_ms": round(t[1], 1), "errors": t[2]}
+                for (stage, command), t in sorted(self.command_totals.items(), key=lambda kv: -kv[1][1])
+            ],
+            "dropped_spans": self.dropped,
+            "spans": [asdict(s) for s in self.spans],
+        }
+
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+
+def instrument_driver(driver, timeline_for: Callable[[], Optional[Timeline]]) -> None:
+    """
+    Record every WebDriver command of `driver` in the timeline `timeline_for()`
+    returns at call time (pooled drivers serve several runs).
+    """
+    if getattr(driver, "_timeline_instrumented", False):
+        return
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        timeline = timeline_for()
+        if timeline is None:
+            return execute(driver_command, params)
+        start = timeline.now_ms()
+        error = False
+        try:
+            return execute(driver_command, params)
+        except Exception:
+            error = True
+            raise
+        finally:
+            timeline.add_command(driver_command, start, timeline.now_ms() - start, error)
+
+    driver.execute = timed_execute
+    driver._timeline_instrumented = True
+
+
+# ─── Report section ────────────────────────────────────────────
+def _fmt_ms(ms: float) -> str:
+    return f"{ms / 1000:.2f}s" if ms >= 1000 else f"{ms:.0f}ms"
+
+
+def render_waterfall(timeline: Timeline) -> str:
+    """HTML fragment: stages, steps and slow WebDriver commands on one time axis, then command totals."""
+    total = timeline.total_ms or 1.0
+    children: dict[int, list[Span]] = {}
+    for s in timeline.spans:
+        children.setdefault(s.parent, []).append(s)
+
+    rows: list[str] = []
+    hidden = 0
+
+    def visit(span: Span, depth: int) -> None:
+        nonlocal hidden
+        shown = span.kind != "webdriver" or span.dur_ms >= SLOW_COMMAND_MS or span.error
+        if shown:
+            if len(rows) >= MAX_WATERFALL_ROWS:
+                hidden += 1
+            else:
+                dur = max(span.dur_ms, 0.0)
+                left = span.start_ms / total * 100
+                width = dur / total * 100
+                classes = f"tl-row tl-{span.kind}" + (" tl-error" if span.error else "")
+                rows.append(
+                    f"<div class='{classes}' title='{html.escape(span.name)} "
+                    f"@ {_fmt_ms(span.start_ms)} ({html.escape(span.thread)})'>"
+                    f"<span class='tl-label' style='padding-left:{depth * 14}px'>{html.escape(span.name)}</span>"
+                    f"<span class='tl-track'><span class='tl-bar' "
+                    f"style='left:{left:.2f}%;width:{width:.2f}%'></span></span>"
+                    f"<span class='tl-dur'>{_fmt_ms(dur)}</span></div>"
+                )
+        for child in children.get(span.id, []):
+            visit(child, depth + 1 if shown else depth)
+
+    for root in children.get(-1, []):
+        visit(root, 0)
+
+    totals = sorted(timeline.command_totals.items(), key=lambda kv: -kv[1][1])
+    command_rows = "".join(
+        f"<tr><td>{html.escape(stage)}</td><td>{html.escape(command)}</td><td>{t[0]}</td>"
+        f"<td>{_fmt_ms(t[1])}</td><td>{_fmt_ms(t[1] / t[0])}</td><td>{t[2]}</td></tr>"
+        for (stage, command), t in totals[:30]
+    )
+    notes = []
+    if hidden:
+        notes.append(f"{hidden} more rows not drawn")
+    if timeline.dropped:
+        notes.append(f"{timeline.dropped} spans beyond {MAX_SPANS} only counted in the totals")
+    wd_calls = sum(t[0] for t in timeline.command_totals.values())
+    wd_ms = sum(t[1] for t in timeline.command_totals.values())
+    return (
+        "<section class='timeline'>"
+        "<h2 style='margin:14px 0 8px 0;font-size:1.05rem;color:#1f5f0f;'>Timing</h2>"
+        f"<div class='meta'>Total {_fmt_ms(timeline.total_ms)}; {wd_calls} WebDriver commands, "
+        f"{_fmt_ms(wd_ms)}. WebDriver rows shown from {SLOW_COMMAND_MS:.0f}ms."
+        + (" " + "; ".join(notes) + "." if notes else "") + "</div>"
+        + "".join(rows)
+        + ("<table class='sample'><thead><tr><th>Stage</th><th>WebDriver command</th><th>Calls</th>"
+           f"<th>Total</th><th>Avg</th><th>Errors</th></tr></thead><tbody>{command_rows}</tbody></table>"
+           if command_rows else "")
+        + "</section>"
+    )